@@ -0,0 +1,74 @@
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+
+# Добавляем корень репозитория в sys.path, чтобы можно было импортировать пакет `src`
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+import numpy as np
+from src.analytics import training
+from src.database.columns import WORKOUT_DTYPE
+
+
+def make_columns(days: int, exercises: int, per_day: int, sets: int, seed: int = 0) -> np.ndarray:
+    """
+    Build a synthetic workout history in the layout of `Database.to_columns()`.
+
+    :param days: number of training days
+    :param exercises: number of distinct exercises
+    :param per_day: exercises per training day
+    :param sets: per-set rows of every exercise execution
+    :param seed: random seed
+    """
+    rng = np.random.default_rng(seed)
+    rows = days * per_day * sets
+    columns = np.zeros(rows, dtype=WORKOUT_DTYPE)
+    columns['date'] = np.repeat(date(2015, 1, 1).toordinal() + np.arange(days), per_day * sets)
+    columns['exercise_id'] = np.repeat(rng.integers(1, exercises + 1, days * per_day), sets)
+    columns['sets'] = 1
+    columns['weight'] = rng.integers(20, 200, rows)
+    columns['repetitions'] = rng.integers(1, 15, rows)
+    columns['speed'] = np.nan
+    columns['units'] = 1
+    columns['feeling'] = np.repeat(rng.integers(0, 6, days * per_day), sets)
+    return columns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure the analytics rollups on a synthetic history')
+    parser.add_argument('--days', type=int, default=3650, help='training days')
+    parser.add_argument('--exercises', type=int, default=300, help='distinct exercises')
+    parser.add_argument('--per-day', type=int, default=8, help='exercises per training day')
+    parser.add_argument('--sets', type=int, default=4, help='sets per exercise execution')
+    args = parser.parse_args()
+
+    columns = make_columns(args.days, args.exercises, args.per_day, args.sets)
+    muscle_groups = {exercise_id: f'group {exercise_id % 12}' for exercise_id in range(1, args.exercises + 1)}
+    print(f'{len(columns)} rows, seconds')
+
+    total = 0.0
+    for name, run in [
+        ('tonnage (week)', lambda: training.tonnage(columns, 'week')),
+        ('tonnage (month)', lambda: training.tonnage(columns, 'month')),
+        ('tonnage by muscle group', lambda: training.tonnage_by_muscle_group(columns, muscle_groups, 'week')),
+        ('session frequency', lambda: training.session_frequency(columns, 'week')),
+        ('set distribution', lambda: training.set_distribution(columns)),
+        ('rep distribution', lambda: training.rep_distribution(columns)),
+        ('feeling/load correlation', lambda: training.feeling_load_correlation(columns)),
+    ]:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        print(f'{name:<28}{elapsed:>10.4f}')
+    print(f'{"total":<28}{total:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import random
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+
+# (name, alias, target muscle group, base weight in kg or base speed in kph)
+STRENGTH_EXERCISES = [
+    ('Bench Press', 'bp', 'Chest', 60),
+    ('Incline Dumbbell Press', 'idp', 'Chest', 24),
+    ('Squat', 'sq', 'Legs', 80),
+    ('Leg Press', 'lp', 'Legs', 120),
+    ('Leg Curl', 'lc', 'Legs', 35),
+    ('Deadlift', 'dl', 'Back', 100),
+    ('Pull Up', 'pu', 'Back', 0),
+    ('Seated Row', 'sr', 'Back', 50),
+    ('Overhead Press', 'ohp', 'Shoulders', 40),
+    ('Lateral Raise', 'lr', 'Shoulders', 8),
+    ('Biceps Curl', 'bc', 'Arms', 14),
+    ('Triceps Pushdown', 'tp', 'Arms', 25),
+]
+CARDIO_EXERCISES = [
+    ('Treadmill', 'tm', 'Cardio', 9.0),
+    ('Bike', 'bk', 'Cardio', 22.0),
+    ('Rowing Machine', 'rm', 'Cardio', 12.0),
+]
+# Training days of the split, each a list of exercise indexes into STRENGTH_EXERCISES
+SPLIT = [[0, 1, 8, 9, 11], [2, 3, 4, 7], [5, 6, 7, 10, 0], [2, 3, 8, 9, 10]]
+
+
+def exercise_names(athletes: int) -> list[tuple[str, str, str]]:
+    """
+    Return the exercises of all athletes. Every athlete has own copies of the
+    exercises, because a day may hold only one execution of each exercise.
+
+    :return: list of (name, alias, target muscle group)
+    """
+    return [
+        (_name(name, athlete, athletes), _name(alias, athlete, athletes), group)
+        for athlete in range(athletes)
+        for name, alias, group, _ in STRENGTH_EXERCISES + CARDIO_EXERCISES
+    ]
+
+
+def _name(name: str, athlete: int, athletes: int) -> str:
+    """
+    Name of an exercise copy of an athlete.
+    """
+    return name if athletes == 1 else f'{name} #{athlete + 1}'
+
+
+def _strength(rng: random.Random, base: float, progress: float) -> dict:
+    """
+    Build one strength execution: warm-up ramps and drops in most of the days, straight sets in the rest.
+    """
+    sets = rng.randint(3, 5)
+    top = max(round((base + progress) / 2.5) * 2.5, 0)
+    repetitions = rng.choice([5, 6, 8, 10, 12])
+    if rng.random() < 0.4:
+        return {'sets': sets, 'weight': top, 'repetitions': repetitions}
+    weights = [max(top - 2.5 * (sets - 1 - i) * rng.randint(0, 2), 0) for i in range(sets)]
+    return {
+        'sets': sets,
+        'weight': weights,
+        'repetitions': [max(repetitions + rng.randint(-2, 1) - i // 2, 1) for i in range(sets)],
+    }
+
+
+def _cardio(rng: random.Random, base: float) -> dict:
+    """
+    Build one cardio execution: steady pace or intervals.
+    """
+    if rng.random() < 0.6:
+        return {'sets': 1, 'time': rng.randint(10, 45) * 60, 'speed': round(base * rng.uniform(0.9, 1.1), 1)}
+    sets = rng.randint(2, 6)
+    return {
+        'sets': sets,
+        'time': [rng.choice([60, 120, 180, 300]) for _ in range(sets)],
+        'speed': [round(base * (1.25 if i % 2 else 0.85), 1) for i in range(sets)],
+    }
+
+
+def iter_records(total_sets: int, athletes: int = 1, start: date = date(2015, 1, 1), seed: int = 0) -> Iterator[dict]:
+    """
+    Lazily generate a realistic workout history, the same for the same arguments.
+
+    Athletes train 3-5 days a week on a 4-day split with a cardio finisher on some days,
+    slowly get stronger, log in kg or lbs and sometimes leave feeling empty.
+    Records are ordered by date and refer to exercises by name or alias.
+
+    :param total_sets: generate until the records hold this many sets
+    :param athletes: number of athletes, see `exercise_names`
+    :param start: date of the first training day
+    :param seed: random seed
+    :return: iterator of `add_workout` keyword arguments
+    """
+    rng = random.Random(seed)
+    lbs = [rng.random() < 0.2 for _ in range(athletes)]
+    strength = [rng.uniform(0.6, 1.4) for _ in range(athletes)]
+    sessions = [0] * athletes
+    sets = 0
+    day = start
+    while sets < total_sets:
+        # Order numbers are unique within a day, so athletes of one day continue the numbering
+        order_number = 0
+        for athlete in range(athletes):
+            if rng.random() > 4 / 7:
+                continue
+            split_day = SPLIT[sessions[athlete] % len(SPLIT)]
+            # Weights grow by about 10% a year, in the units of the athlete
+            progress = 0.1 * (day - start).days / 365
+            executions = [(STRENGTH_EXERCISES[i], False) for i in split_day]
+            if rng.random() < 0.3:
+                executions.append((rng.choice(CARDIO_EXERCISES), True))
+            for (name, alias, _, base), cardio in executions:
+                order_number += 1
+                if cardio:
+                    record = _cardio(rng, base / 1.609 if lbs[athlete] else base)
+                    record['units'] = 'mph' if lbs[athlete] else 'kph'
+                else:
+                    weight = base * strength[athlete] * (2.2 if lbs[athlete] else 1)
+                    record = _strength(rng, weight, weight * progress)
+                    record['units'] = 'lbs' if lbs[athlete] else 'kg'
+                record['workout_date'] = day
+                record['exercise_name'] = _name(alias if rng.random() < 0.2 else name, athlete, athletes)
+                record['order_number'] = order_number
+                record['feeling'] = rng.randint(1, 5) if rng.random() < 0.8 else None
+                sets += record['sets']
+                yield record
+            sessions[athlete] += 1
+        day += timedelta(days=1)
@@ -0,0 +1,154 @@
+import sqlite3
+import struct
+from collections.abc import Callable, Iterable, Iterator
+from src.database.tables.table import Table
+from src.database.tables.workouts import Workout
+
+
+# struct formats of the packed per-set values: little-endian doubles and 32-bit integers
+_FLOATS = 'd'
+_INTEGERS = 'i'
+
+
+def pack_values(values: float | list[float] | None, kind: str) -> bytes | None:
+    """
+    Pack one value or per-set values into a BLOB.
+
+    :param values: value, list of values or None
+    :param kind: struct format of one value, 'd' or 'i'
+    """
+    if values is None:
+        return None
+    if not isinstance(values, list):
+        values = [values]
+    return struct.pack(f'<{len(values)}{kind}', *values)
+
+
+def unpack_values(blob: bytes | None, kind: str) -> list | None:
+    """
+    Unpack a BLOB written by `pack_values` into a list of values.
+    """
+    if blob is None:
+        return None
+    return list(struct.unpack(f'<{len(blob) // struct.calcsize(kind)}{kind}', blob))
+
+
+class PackedWorkoutsTable(Table):
+    """
+    `PackedWorkouts` table: prototype of a compact alternative to `Workouts` with one row
+    per exercise execution. Per-set weights, repetitions, times and speeds are packed into BLOBs.
+
+    Only `storage_benchmark.py` uses it: `Database` reads, triggers and aggregates
+    are defined on `Workouts` rows.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
+        """
+        Initialize the `PackedWorkouts` table wrapper.
+
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
+        """
+        super().__init__('PackedWorkouts', cursor)
+
+    def create(self) -> None:
+        """
+        Create `PackedWorkouts` table.
+        """
+        self._cursor.execute("""--sql
+            CREATE TABLE IF NOT EXISTS PackedWorkouts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                schedule_id INTEGER NOT NULL UNIQUE,
+                feeling INTEGER CHECK(feeling BETWEEN 1 AND 5),
+                sets INTEGER CHECK(sets > 0),
+                per_set INTEGER NOT NULL CHECK(per_set IN (0, 1)),
+                weights BLOB,
+                repetitions BLOB,
+                times BLOB,
+                speeds BLOB,
+                units TEXT CHECK(units IN ('kg', 'lbs', 'kph', 'mph') OR units IS NULL),
+                CHECK(
+                    (weights IS NOT NULL AND repetitions IS NOT NULL)
+                    OR
+                    (times IS NOT NULL AND speeds IS NOT NULL)
+                ),
+                FOREIGN KEY (schedule_id) REFERENCES Schedule(id)
+            );
+        """)
+
+    @staticmethod
+    def encode(workout: Workout) -> tuple:
+        """
+        Convert a workout into a `PackedWorkouts` row.
+
+        :return: (schedule_id, feeling, sets, per_set, weights, repetitions, times, speeds, units) tuple
+        """
+        per_set = any(isinstance(values, list) for values in (workout.weight, workout.repetitions, workout.time, workout.speed))
+        weight, repetitions = workout.weight, workout.repetitions
+        if per_set and workout.weight is not None:
+            # A scalar next to a list stands for the same value in every set
+            weight = weight if isinstance(weight, list) else [weight] * workout.sets
+            repetitions = repetitions if isinstance(repetitions, list) else [repetitions] * workout.sets
+        return (workout.schedule_id, workout.feeling, workout.sets, int(per_set),
+                pack_values(weight, _FLOATS), pack_values(repetitions, _INTEGERS),
+                pack_values(workout.time, _INTEGERS), pack_values(workout.speed, _FLOATS), workout.units)
+
+    @staticmethod
+    def decode(row: tuple) -> Workout:
+        """
+        Convert a row written by `encode` back into a workout.
+
+        :param row: (schedule_id, feeling, sets, per_set, weights, repetitions, times, speeds, units) tuple
+        """
+        schedule_id, feeling, sets, per_set, weights, repetitions, times, speeds, units = row
+        values = [unpack_values(weights, _FLOATS), unpack_values(repetitions, _INTEGERS),
+                  unpack_values(times, _INTEGERS), unpack_values(speeds, _FLOATS)]
+        if not per_set:
+            values = [None if value is None else value[0] for value in values]
+        weight, repetitions, time, speed = values
+        return Workout(schedule_id, sets, weight, repetitions, time, speed, units, feeling)
+
+    def add_workout(self, workout: Workout) -> None:
+        """
+        Add a workout to the table as a single row.
+
+        :param workout: workout model
+        """
+        self.add_workouts([workout])
+
+    def add_workouts(self, workouts: Iterable[Workout]) -> None:
+        """
+        Add many workouts at once.
+        """
+        self._cursor.executemany("""--sql
+            INSERT INTO PackedWorkouts
+            (schedule_id, feeling, sets, per_set, weights, repetitions, times, speeds, units)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, map(self.encode, workouts))
+
+    def get_workout(self, schedule_id: int) -> Workout | None:
+        """
+        Return the workout of a schedule record or None.
+        """
+        self._cursor.execute("""--sql
+            SELECT schedule_id, feeling, sets, per_set, weights, repetitions, times, speeds, units
+            FROM PackedWorkouts
+            WHERE schedule_id = ?;
+        """, (schedule_id,))
+        row = self._cursor.fetchone()
+        return self.decode(row) if row else None
+
+    def iter_set_rows(self) -> Iterator[tuple]:
+        """
+        Lazily iterate over all workouts in the `Workouts` row layout, ordered by schedule id.
+
+        :return: iterator of (schedule_id, feeling, local_order, sets, weight,
+                 repetitions, time, speed, units) tuples
+        """
+        cursor = self._cursor.connection.cursor()
+        cursor.execute("""--sql
+            SELECT schedule_id, feeling, sets, per_set, weights, repetitions, times, speeds, units
+            FROM PackedWorkouts
+            ORDER BY schedule_id;
+        """)
+        for row in cursor:
+            yield from self.decode(row).to_rows()
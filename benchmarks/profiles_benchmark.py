@@ -0,0 +1,99 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+# Добавляем корень репозитория в sys.path, чтобы можно было импортировать пакет `src`
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+from src.database.database import Database
+from src.database.profiles import PROFILES
+
+
+EXERCISES = ['Bench Press', 'Squat', 'Deadlift', 'Seated Row', 'Leg Curl']
+
+
+def make_records(days: int, seed: int = 0) -> list[dict]:
+    """
+    Build the same workout history for every profile.
+
+    :param days: number of workout days
+    :param seed: random seed
+    :return: list of `add_workout` keyword arguments
+    """
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    records = []
+    for day in range(days):
+        for order_number, exercise_name in enumerate(EXERCISES):
+            sets = rng.randint(2, 5)
+            records.append({
+                'workout_date': start + timedelta(days=day),
+                'exercise_name': exercise_name,
+                'order_number': order_number,
+                'sets': sets,
+                'weight': [rng.randint(20, 120) for _ in range(sets)],
+                'repetitions': [rng.randint(5, 12) for _ in range(sets)],
+                'units': 'kg',
+                'feeling': rng.randint(1, 5),
+            })
+    return records
+
+
+def run_profile(profile: str, records: list[dict], single: int, queries: int) -> dict[str, float]:
+    """
+    Measure ingest and query throughput of one profile on a fresh database.
+
+    :return: operations per second for each measured operation
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        db_file = ':memory:' if profile == 'in-memory' else os.path.join(directory, 'gym.db')
+        db = Database(db_file, profile)
+        for exercise_name in EXERCISES:
+            db.add_exercise(exercise_name)
+
+        results = {}
+        start = time.perf_counter()
+        for record in records[:single]:
+            db.add_workout(**record)
+        results['add_workout'] = single / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        db.add_workouts_bulk(records[single:])
+        results['add_workouts_bulk'] = (len(records) - single) / (time.perf_counter() - start)
+
+        rng = random.Random(1)
+        start = time.perf_counter()
+        for _ in range(queries):
+            record = rng.choice(records)
+            db.find_workout(record['workout_date'], record['exercise_name'])
+            db.get_workouts_by_date(record['workout_date'])
+        results['queries'] = 2 * queries / (time.perf_counter() - start)
+        db.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare ingest and query throughput of SQLite profiles')
+    parser.add_argument('--days', type=int, default=2000, help='workout days in the dataset')
+    parser.add_argument('--single', type=int, default=500, help='records added one by one with add_workout')
+    parser.add_argument('--queries', type=int, default=5000, help='find_workout/get_workouts_by_date pairs')
+    args = parser.parse_args()
+
+    records = make_records(args.days)
+    print(f'{len(records)} records, ops/s')
+    print(f'{"profile":<22}{"add_workout":>14}{"bulk":>14}{"queries":>14}')
+    for profile in PROFILES:
+        results = run_profile(profile, records, args.single, args.queries)
+        print(f'{profile:<22}{results["add_workout"]:>14.0f}{results["add_workouts_bulk"]:>14.0f}{results["queries"]:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from itertools import islice
+
+
+# Добавляем корень репозитория в sys.path, чтобы можно было импортировать пакет `src`
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+from benchmarks.generator import exercise_names, iter_records
+from src.analytics import shards
+from src.database.sharding import ShardedDatabase
+
+
+def make_members(directory: str, members: int, sets: int) -> list[str]:
+    """
+    Write a generated history of every member into own database file.
+
+    :return: database files
+    """
+    with ShardedDatabase(directory, 'fast-ingest', max_open=1) as db:
+        for member in range(members):
+            for exercise_name, alias, group in exercise_names(1):
+                db.add_exercise(member, exercise_name, alias, group)
+            records = iter_records(sets, seed=member)
+            while chunk := list(islice(records, 10000)):
+                db.add_workouts_bulk(member, chunk)
+        return db.shard_files()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure cross-member reports with a growing number of processes')
+    parser.add_argument('--members', type=int, default=64, help='member databases')
+    parser.add_argument('--sets', type=int, default=20000, help='sets in the history of every member')
+    parser.add_argument('--workers', type=int, nargs='+', help='worker processes to try, powers of two up to the CPUs by default')
+    args = parser.parse_args()
+    workers = args.workers or [2 ** i for i in range((os.cpu_count() or 1).bit_length())]
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_members(directory, args.members, args.sets)
+        print(f'{args.members} members x {args.sets} sets, seconds')
+        print(f'{"workers":<10}{"tonnage":>12}{"active":>12}{"busiest":>12}{"speedup":>10}')
+        first = None
+        for count in workers:
+            elapsed = []
+            for run in [
+                lambda: shards.tonnage_by_muscle_group(paths, workers=count),
+                lambda: shards.active_members(paths, date(2016, 1, 1), workers=count),
+                lambda: shards.busiest_days(paths, workers=count),
+            ]:
+                start = time.perf_counter()
+                run()
+                elapsed.append(time.perf_counter() - start)
+            first = first or sum(elapsed)
+            print(f'{count:<10}{elapsed[0]:>12.3f}{elapsed[1]:>12.3f}{elapsed[2]:>12.3f}{first / sum(elapsed):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+
+# Добавляем корень репозитория в sys.path, чтобы можно было импортировать пакет `src`
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+from benchmarks.packed_workouts import PackedWorkoutsTable
+from src.database.tables.schedule import ScheduleTable
+from src.database.tables.workouts import Workout, WorkoutsTable
+
+
+def make_workouts(executions: int, sets: int, seed: int = 0) -> list[Workout]:
+    """
+    Build strength workouts with per-set weights and repetitions.
+    """
+    rng = random.Random(seed)
+    return [
+        Workout(schedule_id, sets, [rng.randint(20, 120) for _ in range(sets)], [rng.randint(5, 12) for _ in range(sets)],
+                units='kg', feeling=rng.randint(1, 5))
+        for schedule_id in range(1, executions + 1)
+    ]
+
+
+def run_layout(table_class, workouts: list[Workout], directory: str) -> dict[str, float]:
+    """
+    Measure insert and history-read time and the file size of one layout.
+    """
+    path = os.path.join(directory, f'{table_class.__name__}.db')
+    connection = sqlite3.connect(path)
+    # Both layouts refer to `Schedule` records
+    ScheduleTable(connection.cursor()).create()
+    table = table_class(connection.cursor())
+    table.create()
+
+    start = time.perf_counter()
+    if table_class is PackedWorkoutsTable:
+        table.add_workouts(workouts)
+    else:
+        table.add_workout_rows([row for workout in workouts for row in workout.to_rows()])
+    connection.commit()
+    results = {'insert': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    if table_class is PackedWorkoutsTable:
+        for _ in table.iter_set_rows():
+            pass
+    else:
+        for _ in connection.execute("""--sql
+            SELECT schedule_id, feeling, local_order, sets, weight, repetitions, time, speed, units
+            FROM Workouts
+            ORDER BY schedule_id, local_order;
+        """):
+            pass
+    results['read'] = time.perf_counter() - start
+    connection.close()
+    results['size'] = os.path.getsize(path) / 2 ** 20
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare one-row-per-set and packed workout storage')
+    parser.add_argument('--executions', type=int, default=100000, help='exercise executions')
+    parser.add_argument('--sets', type=int, default=4, help='sets per execution')
+    args = parser.parse_args()
+
+    workouts = make_workouts(args.executions, args.sets)
+    print(f'{args.executions} executions x {args.sets} sets')
+    print(f'{"layout":<22}{"size, MiB":>12}{"insert, s":>12}{"read, s":>12}')
+    with tempfile.TemporaryDirectory() as directory:
+        for table_class in (WorkoutsTable, PackedWorkoutsTable):
+            results = run_layout(table_class, workouts, directory)
+            print(f'{table_class.__name__:<22}{results["size"]:>12.1f}{results["insert"]:>12.3f}{results["read"]:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from itertools import islice
+
+
+# Добавляем корень репозитория в sys.path, чтобы можно было импортировать пакет `src`
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+from benchmarks.generator import exercise_names, iter_records
+from src.database.database import Database
+from src.database.profiles import DEFAULT_PROFILE, PROFILES
+
+
+# Scale name -> number of sets in the history
+SCALES = {'1k': 1000, '100k': 100000, '10m': 10000000}
+# Records written per add_workouts_bulk call while loading
+LOAD_CHUNK = 10000
+# Slowdown against the baseline reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def parse_scale(scale: str) -> int:
+    """
+    Return the number of sets of a scale name or a plain number.
+    """
+    return SCALES[scale] if scale in SCALES else int(scale)
+
+
+def sample_records(total_sets: int, athletes: int, seed: int, single: int, size: int) -> tuple[int, list[dict], list[dict]]:
+    """
+    Pick the records measured one by one, deterministically and without keeping the history in memory.
+
+    :return: number of records, the last `single` records and `size` records sampled uniformly from the rest
+    """
+    rng = random.Random(seed)
+    records = iter_records(total_sets, athletes, seed=seed)
+    tail, sample = [], []
+    count = 0
+    for index, record in enumerate(records):
+        count += 1
+        tail.append(record)
+        if len(tail) <= single:
+            continue
+        record = tail.pop(0)
+        # Reservoir sampling over the loaded records
+        if len(sample) < size:
+            sample.append(record)
+        elif (slot := rng.randrange(index - single + 1)) < size:
+            sample[slot] = record
+    return count, tail, sample
+
+
+def timed(name: str, results: dict, calls, count=None) -> None:
+    """
+    Run every call and store the operation count, the number of calls, the total and mean time
+    of an operation and the 95th percentile time of a call, in milliseconds.
+    Only the calls are timed, so `calls` may be a generator preparing the next call.
+
+    :param calls: iterable of zero-argument callables
+    :param count: callable returning the operations done by all calls, the number of calls if None
+    """
+    durations = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    total = sum(durations)
+    count = len(durations) if count is None else count()
+    results[name] = {
+        'count': count,
+        'calls': len(durations),
+        'total_ms': total * 1000,
+        'mean_ms': total * 1000 / count if count else 0.0,
+        'p95_ms': durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000 if durations else 0.0,
+    }
+
+
+def run_scale(total_sets: int, args: argparse.Namespace) -> dict:
+    """
+    Build a database of the given size and time the core operations on it.
+
+    :return: operation name -> timings, see `timed`
+    """
+    count, tail, sample = sample_records(total_sets, args.athletes, args.seed, args.single, args.queries)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, 'gym.db'), args.profile)
+        names = {}
+        for exercise_name, alias, group in exercise_names(args.athletes):
+            db.add_exercise(exercise_name, alias, group)
+            names[alias] = names[exercise_name] = exercise_name
+
+        # Everything but the tail goes in by chunks, the tail is added one record at a time
+        records = islice(iter_records(total_sets, args.athletes, seed=args.seed), count - len(tail))
+        loaded = 0
+        rejected = []
+
+        def load_chunks():
+            nonlocal loaded
+            while chunk := list(islice(records, LOAD_CHUNK)):
+                loaded += sum(record['sets'] for record in chunk)
+                yield lambda: rejected.extend(db.add_workouts_bulk(chunk))
+
+        timed('add_workouts_bulk (per set)', results, load_chunks(), lambda: loaded)
+        if rejected:
+            raise RuntimeError(f'Generated records were rejected: {rejected[:5]}')
+        timed('add_workout', results, [lambda record=record: db.add_workout(**record) for record in tail])
+
+        # find_workout takes exercise names only
+        timed('find_workout', results,
+              [lambda r=record: db.find_workout(r['workout_date'], names[r['exercise_name']]) for record in sample])
+        timed('get_workouts_by_date', results, [lambda r=record: db.get_workouts_by_date(r['workout_date']) for record in sample])
+        timed('get_all_dates', results, [db.get_all_dates] * args.repeat)
+        # Data fetched by plot_weights
+        strength = [record for record in sample if record.get('weight') is not None]
+        timed('get_weight_progress', results, [lambda r=record: db.get_weight_progress(r['exercise_name']) for record in strength[:args.repeat]])
+
+        deleted = sample[:args.repeat]
+        timed('delete_workout', results, [lambda r=record: db.delete_workout(r['workout_date'], r['exercise_name']) for record in deleted])
+        dates = sorted({record['workout_date'] for record in sample[args.repeat:]} - {record['workout_date'] for record in deleted})
+        timed('delete_workout_by_date', results, [lambda day=day: db.delete_workout_by_date(day) for day in dates[:args.repeat]])
+        db.close()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[tuple[str, str, float]]:
+    """
+    Find operations whose mean time grew by more than `tolerance` against the baseline.
+
+    :return: list of (scale, operation, current mean / baseline mean)
+    """
+    regressions = []
+    for scale, operations in results['scales'].items():
+        for operation, timings in operations.items():
+            before = baseline.get('scales', {}).get(scale, {}).get(operation)
+            if before and before['mean_ms'] > 0 and timings['mean_ms'] > before['mean_ms'] * (1 + tolerance):
+                regressions.append((scale, operation, timings['mean_ms'] / before['mean_ms']))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Time the core database operations on generated histories')
+    parser.add_argument('--scales', nargs='+', default=list(SCALES), help=f'sets in the history: {", ".join(SCALES)} or a number')
+    parser.add_argument('--athletes', type=int, default=10, help='athletes in the generated history')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the generator')
+    parser.add_argument('--profile', choices=PROFILES, default=DEFAULT_PROFILE, help='connection settings profile')
+    parser.add_argument('--single', type=int, default=200, help='records added one by one with add_workout')
+    parser.add_argument('--queries', type=int, default=1000, help='find_workout/get_workouts_by_date calls')
+    parser.add_argument('--repeat', type=int, default=20, help='calls of the slower reads and of the deletes')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON file of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='allowed slowdown, 0.25 is 25%%')
+    args = parser.parse_args()
+
+    results = {
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'parameters': {'athletes': args.athletes, 'seed': args.seed, 'profile': args.profile},
+        'scales': {},
+    }
+    for scale in args.scales:
+        operations = results['scales'][scale] = run_scale(parse_scale(scale), args)
+        print(f'{scale} sets, ms')
+        print(f'{"operation":<30}{"count":>10}{"mean":>12}{"p95 call":>12}')
+        for operation, timings in operations.items():
+            print(f'{operation:<30}{timings["count"]:>10}{timings["mean_ms"]:>12.4f}{timings["p95_ms"]:>12.4f}')
+        print()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for scale, operation, ratio in regressions:
+            print(f'REGRESSION {scale}: {operation} is {ratio:.2f}x slower than the baseline')
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions beyond {args.tolerance:.0%}')
+
+
+if __name__ == '__main__':
+    main()
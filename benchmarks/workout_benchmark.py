@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+
+# Добавляем корень репозитория в sys.path, чтобы можно было импортировать пакет `src`
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+from src.database.tables.workouts import Workout
+
+
+def validated_sets(workout: Workout) -> list[Workout]:
+    """
+    Per-set expansion through the full constructor, as `convert2list` used to do it.
+    """
+    return [
+        Workout(workout.schedule_id, workout.sets, weight, workout.repetitions[i], units=workout.units,
+                feeling=workout.feeling, local_order=i)
+        for i, weight in enumerate(workout.weight)
+    ]
+
+
+def measure(name: str, run, workouts: list[Workout]) -> None:
+    """
+    Print the time of expanding all workouts and the memory held by the result.
+    """
+    start = time.perf_counter()
+    [run(workout) for workout in workouts]
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = [run(workout) for workout in workouts]
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f'{name:<34}{elapsed:>10.3f}{held / 2 ** 20:>12.1f}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure per-set expansion of workouts')
+    parser.add_argument('--workouts', type=int, default=50000, help='workouts with per-set values')
+    parser.add_argument('--sets', type=int, default=4, help='sets per workout')
+    args = parser.parse_args()
+
+    workouts = [
+        Workout(i, args.sets, [40 + j for j in range(args.sets)], [10 - j for j in range(args.sets)], units='kg', feeling=3)
+        for i in range(args.workouts)
+    ]
+    print(f'{args.workouts} workouts x {args.sets} sets')
+    print(f'{"expansion":<34}{"seconds":>10}{"MiB held":>12}')
+    measure('constructor per set (before)', validated_sets, workouts)
+    measure('convert2list', Workout.convert2list, workouts)
+    measure('to_rows', Workout.to_rows, workouts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+import os
+import sqlite3
+from collections import Counter
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from itertools import repeat
+from urllib.parse import quote
+
+
+# Weight of a `Workouts` row in kg and the number of sets it stands for
+_WEIGHT_KG = "CASE WHEN W.units = 'lbs' THEN W.weight * 0.45359237 ELSE W.weight END"
+_ROW_SETS = 'CASE WHEN W.local_order = -1 THEN W.sets ELSE 1 END'
+
+
+def connect_read_only(path: str) -> sqlite3.Connection:
+    """
+    Open a database file read-only: the file is never created or written.
+
+    :raises sqlite3.OperationalError: if the file does not exist
+    """
+    connection = sqlite3.connect(f'file:{quote(os.path.abspath(path))}?mode=ro', uri=True)
+    connection.execute('PRAGMA query_only = ON;')
+    return connection
+
+
+def _map_file(map_shard: Callable[[sqlite3.Connection], object], path: str):
+    """
+    Run a map function of a job on one database file, in a worker process.
+    """
+    connection = connect_read_only(path)
+    try:
+        return map_shard(connection)
+    finally:
+        connection.close()
+
+
+def merge_counts(partials: Iterable[dict]) -> Counter:
+    """
+    Sum the values of the partial results by key.
+    """
+    total = Counter()
+    for counts in partials:
+        total.update(counts)
+    return total
+
+
+def map_reduce(paths: Iterable[str],
+               map_shard: Callable[[sqlite3.Connection], object],
+               reduce: Callable[[Iterable], object] = merge_counts,
+               workers: int = None):
+    """
+    Run a job over many database files in worker processes.
+
+    Every worker opens its file read-only and computes a partial result with `map_shard`,
+    so only the partial results are sent back. They are merged by `reduce` as they arrive.
+    `map_shard` must be picklable: a module-level function or a `functools.partial` of it.
+
+    :param paths: database files
+    :param map_shard: function of a read-only connection returning a partial result
+    :param reduce: function of the iterable of partial results returning the result
+    :param workers: worker processes, the number of CPUs if None
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(min(workers, max(len(paths), 1))) as pool:
+        # Several small files per task keep the pool busy without a round trip per file
+        chunksize = max(1, len(paths) // (workers * 4))
+        return reduce(pool.map(_map_file, repeat(map_shard), paths, chunksize=chunksize))
+
+
+def _date_filter(start: date | None, end: date | None) -> tuple[str, tuple]:
+    """
+    Return the condition on `S.date` of an optional inclusive range and its parameters.
+    """
+    conditions, parameters = ['1'], []
+    if start is not None:
+        conditions.append('S.date >= ?')
+        parameters.append(start)
+    if end is not None:
+        conditions.append('S.date <= ?')
+        parameters.append(end)
+    return ' AND '.join(conditions), tuple(parameters)
+
+
+def shard_tonnage(connection: sqlite3.Connection, start: date = None, end: date = None) -> dict[str | None, float]:
+    """
+    Sum lifted weight in kg per target muscle group of one member.
+    """
+    where, parameters = _date_filter(start, end)
+    rows = connection.execute(f"""--sql
+        SELECT E.target_muscle_group, SUM({_ROW_SETS} * W.repetitions * {_WEIGHT_KG})
+        FROM Schedule S
+        JOIN Workouts W ON W.schedule_id = S.id
+        JOIN Exercises E ON E.id = S.exercise_id
+        WHERE W.weight IS NOT NULL AND {where}
+        GROUP BY E.target_muscle_group;
+    """, parameters)
+    return dict(rows.fetchall())
+
+
+def shard_is_active(connection: sqlite3.Connection, since: date) -> dict[str, int]:
+    """
+    Count one member as active if there are workouts since the given date.
+    """
+    row = connection.execute('SELECT EXISTS (SELECT 1 FROM Schedule WHERE date >= ?);', (since,)).fetchone()
+    return {'active': row[0], 'members': 1}
+
+
+def shard_training_days(connection: sqlite3.Connection, start: date = None, end: date = None) -> dict[str, int]:
+    """
+    Return the training days of one member, each counted once.
+    """
+    where, parameters = _date_filter(start, end)
+    rows = connection.execute(f'SELECT DISTINCT S.date FROM Schedule S WHERE {where};', parameters)
+    return {day: 1 for day, in rows}
+
+
+def tonnage_by_muscle_group(paths: Iterable[str], start: date = None, end: date = None, workers: int = None) -> dict[str | None, float]:
+    """
+    Sum lifted weight in kg per target muscle group over all members.
+
+    :param paths: database files of the members
+    :param start: first date inclusive, unbounded if None
+    :param end: last date inclusive, unbounded if None
+    :param workers: worker processes, the number of CPUs if None
+    :return: target muscle group (None for exercises without one) -> tonnage
+    """
+    return dict(map_reduce(paths, partial(shard_tonnage, start=start, end=end), workers=workers))
+
+
+def active_members(paths: Iterable[str], since: date, workers: int = None) -> tuple[int, int]:
+    """
+    Count members with workouts since the given date.
+
+    :param paths: database files of the members
+    :return: active members and all members
+    """
+    counts = map_reduce(paths, partial(shard_is_active, since=since), workers=workers)
+    return counts['active'], counts['members']
+
+
+def busiest_days(paths: Iterable[str], limit: int = 10, start: date = None, end: date = None, workers: int = None) -> list[tuple[date, int]]:
+    """
+    Find the days most members trained on.
+
+    :param paths: database files of the members
+    :param limit: number of days returned
+    :param start: first date inclusive, unbounded if None
+    :param end: last date inclusive, unbounded if None
+    :return: list of (date, members), most members first, then by date
+    """
+    counts = map_reduce(paths, partial(shard_training_days, start=start, end=end), workers=workers)
+    days = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [(date.fromisoformat(day), members) for day, members in days]
@@ -0,0 +1,143 @@
+import numpy as np
+
+
+# Periods of the rollups
+PERIODS = ('week', 'month')
+
+# date.toordinal() of 1970-01-01, the epoch of numpy.datetime64
+_EPOCH_ORDINAL = 719163
+
+# Code of pounds in `database.columns.UNIT_CODES` and kilograms in a pound
+LBS_CODE = 2
+LBS_TO_KG = 0.45359237
+
+
+def period_starts(ordinals: np.ndarray, period: str = 'week') -> np.ndarray:
+    """
+    Return the first day of the week (Monday) or month of every date.
+
+    :param ordinals: dates as `date.toordinal()`
+    :param period: 'week' or 'month'
+    :return: datetime64[D] array
+    :raises: ValueError if the period is unknown
+    """
+    days = (np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype('datetime64[D]')
+    if period == 'week':
+        # Ordinal 1 (0001-01-01) is a Monday
+        return days - ((np.asarray(ordinals) - 1) % 7).astype('timedelta64[D]')
+    if period == 'month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f'Unknown period "{period}", expected one of: {", ".join(PERIODS)}')
+
+
+def group_by(*keys: np.ndarray) -> tuple[list[np.ndarray], np.ndarray]:
+    """
+    Group rows by several key columns.
+
+    :param keys: key arrays of the same length
+    :return: unique key combinations (one array per key, sorted lexicographically)
+             and the group index of every row
+    """
+    combined = np.zeros(len(keys[0]), dtype=np.int64)
+    for key in keys:
+        unique, inverse = np.unique(key, return_inverse=True)
+        combined = combined * len(unique) + inverse.reshape(-1)
+    _, first, inverse = np.unique(combined, return_index=True, return_inverse=True)
+    return [np.asarray(key)[first] for key in keys], inverse.reshape(-1)
+
+
+def volumes(columns: np.ndarray) -> np.ndarray:
+    """
+    Return sets × repetitions × weight in kg of every row, 0 for cardio.
+
+    :param columns: array of `database.columns.WORKOUT_DTYPE`
+    """
+    weight = np.nan_to_num(columns['weight']) * np.where(columns['units'] == LBS_CODE, LBS_TO_KG, 1)
+    return columns['sets'] * columns['repetitions'] * weight
+
+
+def tonnage(columns: np.ndarray, period: str = 'week') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sum lifted weight in kg per exercise and period.
+
+    :param columns: array of `database.columns.WORKOUT_DTYPE`
+    :param period: 'week' or 'month'
+    :return: period starts, exercise ids and tonnage, ordered by period and exercise
+    """
+    (starts, exercise_ids), inverse = group_by(period_starts(columns['date'], period), columns['exercise_id'])
+    return starts, exercise_ids, np.bincount(inverse, weights=volumes(columns), minlength=len(starts))
+
+
+def tonnage_by_muscle_group(columns: np.ndarray,
+                            muscle_groups: dict[int, str],
+                            period: str = 'week') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sum lifted weight in kg per target muscle group and period.
+
+    :param columns: array of `database.columns.WORKOUT_DTYPE`
+    :param muscle_groups: target muscle group by exercise id, e.g. from `Database.get_all_exercises()`;
+                          exercises without a group count as ''
+    :param period: 'week' or 'month'
+    :return: period starts, muscle groups and tonnage, ordered by period and group
+    """
+    muscle_groups = {exercise_id: group or '' for exercise_id, group in muscle_groups.items()}
+    names = np.array(sorted(set(muscle_groups.values()) | {''}))
+    lookup = np.zeros(max([*muscle_groups, int(columns['exercise_id'].max(initial=0))]) + 1, dtype=np.int64)
+    for exercise_id, group in muscle_groups.items():
+        lookup[exercise_id] = np.searchsorted(names, group)
+    (starts, groups), inverse = group_by(period_starts(columns['date'], period), lookup[columns['exercise_id']])
+    return starts, names[groups], np.bincount(inverse, weights=volumes(columns), minlength=len(starts))
+
+
+def session_frequency(columns: np.ndarray, period: str = 'week') -> tuple[np.ndarray, np.ndarray]:
+    """
+    Count training days per period.
+
+    :param columns: array of `database.columns.WORKOUT_DTYPE`
+    :param period: 'week' or 'month'
+    :return: period starts and number of training days, ordered by period
+    """
+    days = np.unique(columns['date'])
+    starts, counts = np.unique(period_starts(days, period), return_counts=True)
+    return starts, counts
+
+
+def set_distribution(columns: np.ndarray) -> np.ndarray:
+    """
+    Count exercise executions by their number of sets.
+
+    :param columns: array of `database.columns.WORKOUT_DTYPE`
+    :return: array where item `n` is the number of executions with `n` sets
+    """
+    _, inverse = group_by(columns['date'], columns['exercise_id'])
+    sets = np.bincount(inverse, weights=columns['sets']).astype(np.int64)
+    return np.bincount(sets)
+
+
+def rep_distribution(columns: np.ndarray) -> np.ndarray:
+    """
+    Count strength sets by their number of repetitions.
+
+    :param columns: array of `database.columns.WORKOUT_DTYPE`
+    :return: array where item `n` is the number of sets with `n` repetitions
+    """
+    strength = columns[columns['repetitions'] > 0]
+    return np.bincount(strength['repetitions'], weights=strength['sets']).astype(np.int64)
+
+
+def feeling_load_correlation(columns: np.ndarray) -> float:
+    """
+    Pearson correlation between the feeling score of an exercise execution and its tonnage.
+    Executions without a feeling score are skipped.
+
+    :param columns: array of `database.columns.WORKOUT_DTYPE`
+    :return: correlation coefficient, NaN if there are fewer than two distinct points
+    """
+    rated = columns[columns['feeling'] > 0]
+    _, inverse = group_by(rated['date'], rated['exercise_id'])
+    load = np.bincount(inverse, weights=volumes(rated))
+    # All rows of an execution share its feeling score
+    feeling = np.bincount(inverse, weights=rated['feeling']) / np.bincount(inverse)
+    if len(load) < 2 or np.ptp(load) == 0 or np.ptp(feeling) == 0:
+        return float('nan')
+    return float(np.corrcoef(feeling, load)[0, 1])
@@ -0,0 +1,220 @@
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from .database import Database
+from .profiles import DEFAULT_PROFILE
+
+
+# Writes accepted before callers of write methods start waiting
+DEFAULT_MAX_PENDING_WRITES = 64
+
+
+def _resolve(future: asyncio.Future, result=None, exception: BaseException = None) -> None:
+    """
+    Complete a future unless its caller has given up on it or it is already complete.
+    """
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+class AsyncDatabase:
+    """
+    Coroutine facade over `Database` for asyncio applications.
+
+    The database is created and written on one dedicated thread, so the
+    connection is never touched by another thread. Reads issued during the
+    same event loop iteration are sent to the database as one batch, and
+    writes wait for a free slot when `max_pending_writes` are already queued.
+    """
+
+    def __init__(self,
+                 db_file: str,
+                 profile: str = DEFAULT_PROFILE,
+                 readers: int = 0,
+                 max_pending_writes: int = DEFAULT_MAX_PENDING_WRITES) -> None:
+        """
+        Start the database threads and open the database in the background.
+
+        :param db_file: path to SQLite database file
+        :param profile: connection settings profile, one of `profiles.PROFILES`
+        :param readers: with readers > 0 reads run on that many threads of a
+                        thread-safe `Database`, otherwise on the writer thread
+        :param max_pending_writes: bound of the write queue
+        """
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix='database-writer')
+        self._reader = ThreadPoolExecutor(readers, thread_name_prefix='database-reader') if readers else self._writer
+        self._database: Future[Database] = self._writer.submit(Database, db_file, profile, readers)
+        self._write_slots = asyncio.Semaphore(max_pending_writes)
+        # Reads waiting for the next batch: (method name, args, kwargs, future)
+        self._pending_reads: list[tuple] | None = None
+
+    async def __aenter__(self) -> 'AsyncDatabase':
+        await asyncio.wrap_future(self._database)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _read(self, method: str, *args, **kwargs):
+        """
+        Queue a read for the batch of the current event loop iteration and wait for its result.
+        """
+        loop = asyncio.get_running_loop()
+        if self._pending_reads is None:
+            self._pending_reads = []
+            loop.call_soon(self._flush_reads, loop)
+        future = loop.create_future()
+        self._pending_reads.append((method, args, kwargs, future))
+        return await future
+
+    def _flush_reads(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Send the queued reads to a database thread.
+        """
+        batch, self._pending_reads = self._pending_reads, None
+        self._reader.submit(self._run_reads, loop, batch)
+
+    def _run_reads(self, loop: asyncio.AbstractEventLoop, batch: list[tuple]) -> None:
+        """
+        Run a batch of reads on one cursor (one pooled connection in thread-safe mode).
+        """
+        try:
+            database = self._database.result()
+            with database._reading():
+                for method, args, kwargs, future in batch:
+                    if future.cancelled():
+                        continue
+                    try:
+                        result = getattr(database, method)(*args, **kwargs)
+                    except Exception as e:
+                        loop.call_soon_threadsafe(_resolve, future, None, e)
+                    else:
+                        loop.call_soon_threadsafe(_resolve, future, result)
+        except Exception as e:
+            # The database failed to open or to give a cursor: fail the reads not answered yet
+            for *_, future in batch:
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+
+    async def _write(self, method: str, *args, **kwargs):
+        """
+        Run a write on the writer thread, waiting first while the write queue is full.
+        """
+        async with self._write_slots:
+            return await asyncio.wrap_future(self._writer.submit(self._run_write, method, args, kwargs))
+
+    def _run_write(self, method: str, args: tuple, kwargs: dict):
+        """
+        Call a `Database` method on the writer thread.
+        """
+        return getattr(self._database.result(), method)(*args, **kwargs)
+
+    def _close_database(self) -> None:
+        """
+        Close the database on the writer thread if it was opened.
+        """
+        if self._database.exception() is None:
+            self._database.result().close()
+
+    async def close(self) -> None:
+        """
+        Wait for queued writes, close the database and stop its threads.
+        """
+        try:
+            await asyncio.wrap_future(self._writer.submit(self._close_database))
+        finally:
+            self._writer.shutdown()
+            self._reader.shutdown()
+
+    async def add_exercise(self, exercise_name: str, alias: str = None, target_muscle_group: str = None) -> None:
+        """
+        Add an exercise, see `Database.add_exercise`.
+        """
+        await self._write('add_exercise', exercise_name, alias, target_muscle_group)
+
+    async def add_workout(self,
+                          workout_date: date,
+                          exercise_name: str,
+                          order_number: int,
+                          sets: int,
+                          weight: float | list[float] = None,
+                          repetitions: int | list[int] = None,
+                          time: int | list[int] = None,
+                          speed: float | list[float] = None,
+                          units: str = None,
+                          feeling: int = None) -> None:
+        """
+        Add a workout session, see `Database.add_workout`.
+        """
+        await self._write('add_workout', workout_date, exercise_name, order_number, sets,
+                          weight, repetitions, time, speed, units, feeling)
+
+    async def add_workouts_bulk(self, records: Iterable[dict]) -> list[tuple[int, str]]:
+        """
+        Add many workout sessions in a single transaction, see `Database.add_workouts_bulk`.
+        """
+        return await self._write('add_workouts_bulk', list(records))
+
+    async def delete_exercise(self, exercise_name: str) -> None:
+        """
+        Delete an exercise and all related records, see `Database.delete_exercise`.
+        """
+        await self._write('delete_exercise', exercise_name)
+
+    async def delete_workout(self, workout_date: date, exercise_name: str) -> None:
+        """
+        Delete workouts for the given date and exercise, see `Database.delete_workout`.
+        """
+        await self._write('delete_workout', workout_date, exercise_name)
+
+    async def delete_workout_by_date(self, workout_date: date) -> None:
+        """
+        Delete all workouts for the given date.
+        """
+        await self._write('delete_workout_by_date', workout_date)
+
+    async def delete_workouts_between(self, start: date, end: date) -> None:
+        """
+        Delete all workouts between the given dates inclusive.
+        """
+        await self._write('delete_workouts_between', start, end)
+
+    async def find_workout(self, workout_date: date, exercise_name: str) -> list[tuple]:
+        """
+        Find records by date and exercise, see `Database.find_workout`.
+        """
+        return await self._read('find_workout', workout_date, exercise_name)
+
+    async def get_workouts_by_date(self, workout_date: date) -> list[tuple]:
+        """
+        Return all workouts for the given date, see `Database.get_workouts_by_date`.
+        """
+        return await self._read('get_workouts_by_date', workout_date)
+
+    async def get_all_dates(self) -> list[date]:
+        """
+        Return all dates with workouts.
+        """
+        return await self._read('get_all_dates')
+
+    async def get_exercise_id(self, exercise_name: str, may_be_alias: bool = True) -> int | None:
+        """
+        Return exercise id by name or alias.
+        """
+        return await self._read('get_exercise_id', exercise_name, may_be_alias)
+
+    async def get_weight_progress(self, exercise_name: str) -> tuple[list[date], list[float], list[float], list[float]]:
+        """
+        Return per-day weight statistics of an exercise, see `Database.get_weight_progress`.
+        """
+        return await self._read('get_weight_progress', exercise_name)
+
+    async def get_personal_records(self, exercise_name: str) -> list[tuple]:
+        """
+        Return personal records of an exercise, see `Database.get_personal_records`.
+        """
+        return await self._read('get_personal_records', exercise_name)
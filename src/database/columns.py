@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+from collections.abc import Iterator
+from datetime import date
+import numpy as np
+from .tables.table import DEFAULT_CHUNK_SIZE
+
+
+# Codes of the `units` column, 0 when units are not set
+UNIT_CODES = {'kg': 1, 'lbs': 2, 'kph': 3, 'mph': 4}
+
+# One element per `Workouts` row. Missing weight and speed are NaN, missing
+# repetitions, time and feeling are 0 (never valid values in the table).
+# `sets` is the number of sets the row stands for: all of them for local_order = -1, otherwise one.
+WORKOUT_DTYPE = np.dtype([
+    ('date', np.int32),  # date.toordinal()
+    ('exercise_id', np.int32),
+    ('sets', np.int16),
+    ('weight', np.float64),
+    ('repetitions', np.int32),
+    ('time', np.int32),
+    ('speed', np.float64),
+    ('units', np.int8),
+    ('feeling', np.int8),
+])
+
+
+def _fetch_chunks(cursor: sqlite3.Cursor, chunk_size: int) -> Iterator[tuple]:
+    """
+    Yield rows of an executed query, fetching them in chunks.
+    """
+    while rows := cursor.fetchmany(chunk_size):
+        yield from rows
+
+
+def read_columns(cursor: sqlite3.Cursor,
+                 exercise_id: int = None,
+                 start: date = None,
+                 end: date = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Read workout sets into a structured array of `WORKOUT_DTYPE` ordered by date.
+    SQLite converts the values, so rows go straight from the cursor into the array.
+
+    :param cursor: SQLite cursor
+    :param exercise_id: only this exercise, all exercises if None
+    :param start: first date inclusive, unbounded if None
+    :param end: last date inclusive, unbounded if None
+    :param chunk_size: number of rows fetched at once
+    """
+    conditions, parameters = ['1'], []
+    if exercise_id is not None:
+        conditions.append('S.exercise_id = ?')
+        parameters.append(exercise_id)
+    if start is not None:
+        conditions.append('S.date >= ?')
+        parameters.append(start)
+    if end is not None:
+        conditions.append('S.date <= ?')
+        parameters.append(end)
+    units = ' '.join(f"WHEN '{name}' THEN {code}" for name, code in UNIT_CODES.items())
+    cursor.execute(f"""--sql
+        SELECT CAST(julianday(S.date) - 1721424.5 AS INTEGER),
+               S.exercise_id,
+               CASE WHEN W.local_order = -1 THEN W.sets ELSE 1 END,
+               W.weight,
+               COALESCE(W.repetitions, 0),
+               COALESCE(W.time, 0),
+               W.speed,
+               CASE W.units {units} ELSE 0 END,
+               COALESCE(W.feeling, 0)
+        FROM Schedule S
+        JOIN Workouts W ON W.schedule_id = S.id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY S.date, S.order_number, W.local_order;
+    """, parameters)
+    return np.fromiter(_fetch_chunks(cursor, chunk_size), dtype=WORKOUT_DTYPE)
+
+
+def get_data_stamp(cursor: sqlite3.Cursor) -> list[int]:
+    """
+    Return a stamp that changes whenever workouts are added or deleted:
+    the schema version counter, which grows when tables are re-created,
+    the AUTOINCREMENT high-water marks and row counts of `Schedule` and `Workouts`.
+    """
+    cursor.execute("""--sql
+        SELECT (SELECT schema_version FROM pragma_schema_version),
+               (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'Schedule'),
+               (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'Workouts'),
+               (SELECT COUNT(*) FROM Schedule),
+               (SELECT COUNT(*) FROM Workouts);
+    """)
+    return list(cursor.fetchone())
+
+
+def load_cached_columns(path: str, stamp: list[int]) -> np.ndarray | None:
+    """
+    Memory-map an array saved by `save_cached_columns` if it was saved with the same stamp.
+
+    :param path: `.npy` file path
+    :param stamp: current data stamp
+    :return: read-only array or None if there is no valid cache
+    """
+    try:
+        with open(path + '.json') as file:
+            if json.load(file) != stamp:
+                return None
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_columns(path: str, stamp: list[int], columns: np.ndarray) -> None:
+    """
+    Save an array with the data stamp it was read at.
+    The stamp is written last, so an interrupted save leaves no valid cache.
+
+    :param path: `.npy` file path
+    :param stamp: data stamp
+    :param columns: array to save
+    """
+    if os.path.exists(path + '.json'):
+        os.remove(path + '.json')
+    with open(path + '.tmp', 'wb') as file:
+        np.save(file, columns)
+    os.replace(path + '.tmp', path)
+    with open(path + '.json', 'w') as file:
+        json.dump(stamp, file)
@@ -1,61 +1,328 @@
+import functools
+import hashlib
+import os
+import queue
 import sqlite3
+import tempfile
+import threading
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
 from datetime import date, datetime
+from urllib.parse import quote
 from .tables.exercises import ExercisesTable
 from .tables.workouts import Workout, WorkoutsTable
 from .tables.schedule import ScheduleTable
+from .tables.daily_exercise_stats import DailyExerciseStatsTable
+from .tables.personal_records import PersonalRecordsTable
+from .tables.import_checkpoints import ImportCheckpointsTable
+from .tables.table import DEFAULT_CHUNK_SIZE, DEFAULT_PAGE_SIZE, Table, iter_rows
+from .columns import read_columns, get_data_stamp, load_cached_columns, save_cached_columns
+from .migrations import MIGRATIONS, get_schema_version, set_schema_version, migrate
+from .profiles import DEFAULT_PROFILE, apply_profile
+from .tracing import QueryTracer, TracingConnection
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.dates import DateFormatter
 
+
+# Pages copied per step of `Database.snapshot`
+DEFAULT_BACKUP_PAGES = 1024
+
+
+def _reads(method: Callable) -> Callable:
+    """
+    Run the method on its own cursor, taken from the reader pool when the database is thread-safe.
+    """
+    @functools.wraps(method)
+    def wrapper(self: 'Database', *args, **kwargs):
+        with self._reading():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _writes(method: Callable) -> Callable:
+    """
+    Run the method on its own cursor of the writer connection, one thread at a time.
+    """
+    @functools.wraps(method)
+    def wrapper(self: 'Database', *args, **kwargs):
+        with self._writing():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class Database:
     """
     SQLite wrapper to work with exercises, schedule and workouts tables.
     Provides CRUD operations and helper queries.
     """
 
-    def __init__(self, db_file: str) -> None:
+    def __init__(self, db_file: str, profile: str = DEFAULT_PROFILE, readers: int = 0, tracer: QueryTracer = None) -> None:
         """
-        Connect to the database and initialize table objects.
+        Connect to the database, initialize table objects and apply pending migrations.
 
-        :param db_file: path to SQLite database file
-        """
-        self._connection = sqlite3.connect(db_file)
-        self._cursor = self._connection.cursor()
-        self._exercises_table = ExercisesTable(self._cursor)
-        self._workouts_table = WorkoutsTable(self._cursor)
-        self._schedule_table = ScheduleTable(self._cursor)
+        With `readers` > 0 the object may be shared between threads: queries run on
+        a bounded pool of read-only connections and writes are serialized on
+        a single writer connection. Use a WAL profile so readers don't block the writer.
 
+        :param db_file: path to SQLite database file
+        :param profile: connection settings profile, one of `profiles.PROFILES`
+        :param readers: number of pooled read-only connections, 0 for single-thread use
+        :param tracer: collect statistics of every executed statement, see `stats()`;
+                       without a tracer plain sqlite3 connections are used
+        """
+        if readers and db_file == ':memory:':
+            raise ValueError('A thread-safe database needs a database file')
+        self._tracer = tracer
+        self._connection = self._connect(db_file, check_same_thread=not readers)
+        apply_profile(self._connection, profile)
+        self._main_cursor = self._connection.cursor()
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._readers = None
+        self._temporary_file = None
+        self._exercises_table = ExercisesTable(lambda: self._cursor)
+        self._workouts_table = WorkoutsTable(lambda: self._cursor)
+        self._schedule_table = ScheduleTable(lambda: self._cursor)
+        self._daily_stats_table = DailyExerciseStatsTable(lambda: self._cursor)
+        self._records_table = PersonalRecordsTable(lambda: self._cursor)
+        self._checkpoints_table = ImportCheckpointsTable(lambda: self._cursor)
+        self._tables = {table.table_name: table for table in (self._exercises_table, self._workouts_table, self._schedule_table)}
+        self._transaction_depth = 0
+        self.migrate()
+
+        self._profile = profile
+        # Names the `to_columns` cache files of this database: one cache directory may serve many files
+        identity = uuid.uuid4().hex if db_file == ':memory:' else os.path.abspath(db_file)
+        self._cache_key = hashlib.sha1(identity.encode()).hexdigest()[:16]
+        self._reader_uri = f'file:{quote(os.path.abspath(db_file))}?mode=ro'
+        if readers:
+            self._readers = queue.Queue()
+            for _ in range(readers):
+                self._readers.put(self._connect_reader())
+
+    def _connect(self, database: str, **kwargs) -> sqlite3.Connection:
+        """
+        Open a connection, traced if the database has a tracer.
+        """
+        if self._tracer is None:
+            return sqlite3.connect(database, **kwargs)
+        connection = sqlite3.connect(database, factory=TracingConnection, **kwargs)
+        connection.tracer = self._tracer
+        return connection
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection to the database file.
+        """
+        connection = self._connect(self._reader_uri, uri=True, check_same_thread=False)
+        apply_profile(connection, self._profile, read_only=True)
+        return connection
+
+    @property
+    def _cursor(self) -> sqlite3.Cursor:
+        """
+        Cursor of the operation running in the current thread.
+        """
+        return getattr(self._local, 'cursor', None) or self._main_cursor
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Bind the current thread to a new cursor for the block. In thread-safe mode
+        the cursor belongs to a pooled read-only connection.
+        A thread that already runs an operation keeps its cursor.
+        """
+        if getattr(self._local, 'cursor', None) is not None:
+            yield self._local.cursor
+            return
+        connection = self._connection if self._readers is None else self._readers.get()
+        self._local.cursor = connection.cursor()
+        try:
+            yield self._local.cursor
+        finally:
+            self._local.last_cursor = self._local.cursor
+            self._local.cursor = None
+            if self._readers is not None:
+                self._readers.put(connection)
+
+    @contextmanager
+    def _writing(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Bind the current thread to a new cursor of the writer connection for the block.
+        In thread-safe mode only one thread at a time may hold the writer.
+        """
+        if getattr(self._local, 'writing', False):
+            yield self._local.cursor
+            return
+        with self._write_lock if self._readers is not None else nullcontext():
+            previous = getattr(self._local, 'cursor', None)
+            self._local.cursor = self._connection.cursor()
+            self._local.writing = True
+            try:
+                yield self._local.cursor
+            finally:
+                self._local.writing = False
+                self._local.last_cursor = self._local.cursor
+                self._local.cursor = previous
+
+    def _iteration_cursor(self) -> sqlite3.Cursor:
+        """
+        Return a dedicated cursor for a lazily consumed query and remember it for `get_columns`.
+        In thread-safe mode it belongs to its own read-only connection, so an
+        unfinished iteration never holds a pooled reader or the writer.
+        """
+        if self._readers is None or getattr(self._local, 'writing', False):
+            cursor = self._connection.cursor()
+        else:
+            cursor = self._connect_reader().cursor()
+        self._local.last_cursor = cursor
+        return cursor
+
+    @_writes
     def clear(self) -> None:
         """
         Clear all tables completely.
         """
-        self._exercises_table.clear()
-        self._workouts_table.clear()
-        self._schedule_table.clear()
-        self.commit()
+        with self.transaction():
+            self._exercises_table.clear()
+            self._workouts_table.clear()
+            self._schedule_table.clear()
+            self._daily_stats_table.clear()
+            self._records_table.clear()
+            self._checkpoints_table.clear()
 
+    @_writes
     def create(self) -> None:
         """
-        Re-create tables `Exercises`, `Workouts`, `Schedule`.
+        Re-create tables `Exercises`, `Workouts`, `Schedule`, `DailyExerciseStats`, `PersonalRecords`, `ImportCheckpoints`.
+        """
+        with self.transaction():
+            self._exercises_table.drop()
+            self._workouts_table.drop()
+            self._schedule_table.drop()
+            self._daily_stats_table.drop()
+            self._records_table.drop()
+            self._checkpoints_table.drop()
+            set_schema_version(self._cursor, 0)
+            self.migrate()
+
+    @_writes
+    def migrate(self) -> int:
+        """
+        Apply pending schema migrations in one transaction.
+        For an up-to-date database this costs a single pragma read.
+
+        :return: number of applied migrations
         """
-        self._exercises_table.drop()
-        self._workouts_table.drop()
-        self._schedule_table.drop()
-        self._exercises_table.create()
-        self._workouts_table.create()
-        self._schedule_table.create()
-        self.commit()
+        if get_schema_version(self._cursor) == len(MIGRATIONS):
+            return 0
+        with self.transaction():
+            return migrate(self._cursor)
 
+    @_writes
     def commit(self) -> None:
         """
         Commit current transaction.
-        """
-        self._connection.commit()
+        Inside `transaction()` the commit is deferred until the outermost block exits.
+        """
+        if self._transaction_depth == 0:
+            self._connection.commit()
+            self._exercises_table.transaction_finished()
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator['Database']:
+        """
+        Run the enclosed operations as one unit of work.
+
+        The outermost block commits once on exit and rolls everything back on error.
+        Nested blocks are backed by savepoints, so an error inside one of them
+        rolls back only that block.
+
+        :param immediate: if True and no transaction is open yet, take the write lock
+                          on entry, so other connections can't write until the block exits
+        :return: context manager yielding the database itself
+        """
+        with self._writing():
+            if immediate and not self._connection.in_transaction:
+                self._cursor.execute('BEGIN IMMEDIATE;')
+            savepoint = f'transaction_{self._transaction_depth}'
+            self._cursor.execute(f'SAVEPOINT {savepoint};')
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self._connection.rollback()
+                    self._exercises_table.transaction_finished()
+                else:
+                    self._cursor.execute(f'ROLLBACK TO {savepoint};')
+                    self._cursor.execute(f'RELEASE {savepoint};')
+                # Cached exercise ids may refer to rolled back changes
+                self._exercises_table.invalidate_cache()
+                raise
+            self._transaction_depth -= 1
+            self._cursor.execute(f'RELEASE {savepoint};')
+            self.commit()
+
+    batch = transaction
 
     def close(self) -> None:
         """
-        Close the database connection.
+        Close the database connection and the reader pool.
         """
+        if self._readers is not None:
+            while not self._readers.empty():
+                self._readers.get().close()
         self._connection.close()
+        if self._temporary_file is not None:
+            os.remove(self._temporary_file)
+            self._temporary_file = None
+
+    def snapshot(self,
+                 in_memory: bool = True,
+                 pages: int = DEFAULT_BACKUP_PAGES,
+                 progress: Callable[[int, int, int], object] = None) -> 'Database':
+        """
+        Copy the database with the SQLite backup API into a read-only database.
+
+        The copy is taken `pages` pages at a time, so writes to this database
+        are not blocked for the whole copy; the result is a consistent point-in-time state.
+        Analytics and charts can then run on the copy without competing with writes.
+
+        :param in_memory: copy into memory, otherwise into a temporary file removed on `close()`
+        :param pages: pages copied per step, -1 to copy everything at once
+        :param progress: called after every step with (status, remaining pages, total pages)
+        :return: read-only database, close it when done
+        """
+        if in_memory:
+            copy = Database(':memory:', 'in-memory')
+        else:
+            descriptor, path = tempfile.mkstemp(suffix='.db')
+            os.close(descriptor)
+            copy = Database(path, 'read-heavy-analytics')
+            copy._temporary_file = path
+        try:
+            with self._reading() as cursor:
+                cursor.connection.backup(copy._connection, pages=pages, progress=progress)
+            copy._exercises_table.invalidate_cache()
+            copy._connection.execute('PRAGMA query_only = ON;')
+        except BaseException:
+            copy.close()
+            raise
+        return copy
+
+    def stats(self, limit: int = 20) -> str:
+        """
+        Return a text report of the slowest statements and the slow-query log.
+
+        :param limit: number of statements in the report
+        """
+        if self._tracer is None:
+            return 'Query tracing is disabled'
+        return self._tracer.report(limit)
 
     def get_columns(self) -> list[str]:
         """
@@ -63,10 +330,12 @@ class Database:
 
         :return: list of column names
         """
-        if hasattr(self._cursor, 'description'):
-            return [desc[0] for desc in self._cursor.description]
+        cursor = getattr(self._local, 'last_cursor', None) or self._cursor
+        if cursor.description is not None:
+            return [desc[0] for desc in cursor.description]
         return []
 
+    @_writes
     def add_exercise(self, exercise_name: str, alias: str = None, target_muscle_group: str = None) -> None:
         """
         Add an exercise.
@@ -75,9 +344,10 @@ class Database:
         :param alias: alias
         :param target_muscle_group: target muscle group
         """
-        self._exercises_table.add_exercise(exercise_name, alias, target_muscle_group)
-        self.commit()
+        with self.transaction():
+            self._exercises_table.add_exercise(exercise_name, alias, target_muscle_group)
 
+    @_writes
     def add_workout(self,
                     workout_date: date, 
                     exercise_name: str, 
@@ -106,12 +376,72 @@ class Database:
         exercise_id = self._exercises_table.get_exercise_id(exercise_name, may_be_alias=True)
         if exercise_id is None:
             raise ValueError(f'There is no "{exercise_name}" exercise')
-        
-        schedule_id = self._schedule_table.add_schedule_record(workout_date, exercise_id, order_number)
-        workout = Workout(schedule_id, sets, weight, repetitions, time, speed, units, feeling)
-        self._workouts_table.add_workout(workout)
-        self.commit()
 
+        with self.transaction():
+            schedule_id = self._schedule_table.add_schedule_record(workout_date, exercise_id, order_number)
+            workout = Workout(schedule_id, sets, weight, repetitions, time, speed, units, feeling)
+            self._workouts_table.add_workout(workout)
+            self._records_table.update_from_schedule(schedule_id, schedule_id)
+
+    @_writes
+    def add_workouts_bulk(self, records: Iterable[dict]) -> list[tuple[int, str]]:
+        """
+        Add many workout sessions in a single transaction.
+
+        Every record is a mapping with the same keys as `add_workout` arguments.
+        Records that fail validation or violate table constraints are skipped
+        and reported, the rest of the batch is still written.
+
+        :param records: iterable of workout records
+        :return: list of (record index, error message) for rejected records
+        """
+        exercise_ids = self._exercises_table.get_exercise_ids()
+        errors = []
+        prepared = []
+        for index, record in enumerate(records):
+            try:
+                exercise_name = record['exercise_name']
+                exercise_id = exercise_ids.get(exercise_name)
+                if exercise_id is None:
+                    raise ValueError(f'There is no "{exercise_name}" exercise')
+                # The schedule id is assigned once the write lock is held
+                workout = Workout(None, record['sets'], record.get('weight'), record.get('repetitions'),
+                                  record.get('time'), record.get('speed'), record.get('units'), record.get('feeling'))
+                schedule_row = (record['workout_date'], exercise_id, record['order_number'])
+            except KeyError as e:
+                errors.append((index, f'Missing field {e}'))
+                continue
+            except (ValueError, TypeError) as e:
+                errors.append((index, str(e)))
+                continue
+            prepared.append((index, schedule_row, workout))
+
+        with self.transaction(immediate=True):
+            # Read inside the transaction: no other connection can insert until it ends
+            first_schedule_id = schedule_id = self._schedule_table.get_last_id()
+            numbered = []
+            for index, schedule_row, workout in prepared:
+                schedule_id += 1
+                workout.schedule_id = schedule_id
+                numbered.append((index, (schedule_id, *schedule_row), workout.to_rows()))
+            try:
+                with self.transaction():
+                    self._schedule_table.add_schedule_records([schedule_row for _, schedule_row, _ in numbered])
+                    self._workouts_table.add_workout_rows([row for _, _, rows in numbered for row in rows])
+            except sqlite3.IntegrityError:
+                # Some records conflict: redo the batch record by record to find them
+                for index, schedule_row, rows in numbered:
+                    try:
+                        with self.transaction():
+                            self._schedule_table.add_schedule_records([schedule_row])
+                            self._workouts_table.add_workout_rows(rows)
+                    except sqlite3.IntegrityError as e:
+                        errors.append((index, str(e)))
+                errors.sort()
+            self._records_table.update_from_schedule(first_schedule_id + 1, schedule_id)
+        return errors
+
+    @_reads
     def find_workout(self, workout_date: date, exercise_name: str) -> tuple | None:
         """
         Find records by date and exercise.
@@ -130,6 +460,7 @@ class Database:
         """, (workout_date, exercise_id))
         return self._cursor.fetchall()
 
+    @_reads
     def get_all_exercises(self) -> list[list[str]]:
         """
         Return all rows from `Exercises`.
@@ -138,18 +469,132 @@ class Database:
         """
         return self._exercises_table.get_all_data()
     
+    @_reads
     def get_all_schedule(self) -> list[list[str]]:
         """
         Return all rows from `Schedule`.
         """
         return self._schedule_table.get_all_data()
 
+    @_reads
     def get_all_workouts(self) -> list[list[str]]:
         """
         Return all rows from `Workouts`.
         """
         return self._workouts_table.get_all_data()
 
+    def _get_table(self, table_name: str) -> Table:
+        """
+        Return the wrapper of a table by its name.
+
+        :raises: ValueError if there is no such table
+        """
+        if table_name not in self._tables:
+            raise ValueError(f'There is no "{table_name}" table')
+        return self._tables[table_name]
+
+    @_reads
+    def get_page(self, table_name: str, after_id: int = None, before_id: int = None, limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Return a page of table rows ordered by id. Pages are addressed by the
+        ids of their neighbours, so every page costs the same regardless of table size.
+
+        :param table_name: `Exercises`, `Schedule` or `Workouts`
+        :param after_id: return the page following this id (the first page if both ids are None)
+        :param before_id: return the page preceding this id
+        :param limit: page size
+        :return: list of tuples
+        """
+        table = self._get_table(table_name)
+        if before_id is not None:
+            return table.get_page_before(before_id, limit)
+        return table.get_page(after_id, limit)
+
+    @_reads
+    def get_first_id_from_date(self, table_name: str, from_date: date) -> int | None:
+        """
+        Return id of the first `Schedule` or `Workouts` row dated on or after the given date.
+
+        :return: row id or None if there are no such rows
+        """
+        return self._get_table(table_name).get_first_id_from_date(from_date)
+
+    @_reads
+    def get_date_page(self,
+                      table_name: str,
+                      from_date: date = None,
+                      after_id: int = None,
+                      before_id: int = None,
+                      limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Return a page of `Schedule` or `Workouts` rows ordered by date, then id.
+        Unlike `get_page` rows of backfilled history come in date order.
+
+        :param table_name: `Schedule` or `Workouts`
+        :param from_date: return the first page from this date (from the start if all arguments are None)
+        :param after_id: return the page following the row with this id
+        :param before_id: return the page preceding the row with this id
+        :param limit: page size
+        :return: list of tuples
+        :raises: ValueError if rows of the table have no date
+        """
+        return self._get_table(table_name).get_date_page(from_date, after_id, before_id, limit)
+
+    def iter_all_exercises(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over all rows of `Exercises`, fetching `chunk_size` rows at once.
+        """
+        return self._exercises_table.iter_all_data(chunk_size, self._iteration_cursor())
+
+    def iter_all_schedule(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over all rows of `Schedule`, fetching `chunk_size` rows at once.
+        """
+        return self._schedule_table.iter_all_data(chunk_size, self._iteration_cursor())
+
+    def iter_all_workouts(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over all rows of `Workouts`, fetching `chunk_size` rows at once.
+        """
+        return self._workouts_table.iter_all_data(chunk_size, self._iteration_cursor())
+
+    @_reads
+    def to_columns(self,
+                   exercise_name: str = None,
+                   start: date = None,
+                   end: date = None,
+                   cache_dir: str = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        Return workout sets as a NumPy structured array, see `columns.WORKOUT_DTYPE`.
+
+        With `cache_dir` the array is saved there as `.npy` and memory-mapped
+        on later calls until workouts are added or deleted.
+
+        :param exercise_name: exercise name or alias, all exercises if None
+        :param start: first date inclusive, unbounded if None
+        :param end: last date inclusive, unbounded if None
+        :param cache_dir: directory of the `.npy` cache, no caching if None
+        :param chunk_size: number of rows fetched at once
+        :return: structured array ordered by date (read-only if loaded from the cache)
+        """
+        exercise_id = None
+        if exercise_name is not None:
+            exercise_id = self._exercises_table.get_exercise_id(exercise_name, may_be_alias=True)
+            if exercise_id is None:
+                raise ValueError(f'There is no "{exercise_name}" exercise')
+        if cache_dir is None:
+            return read_columns(self._cursor, exercise_id, start, end, chunk_size)
+
+        # The stamp is read first: rows added meanwhile only make the cache look stale
+        stamp = get_data_stamp(self._cursor)
+        path = os.path.join(cache_dir, f'workouts_{self._cache_key}_{exercise_id or "all"}_{start or ""}_{end or ""}.npy')
+        columns = load_cached_columns(path, stamp)
+        if columns is None:
+            columns = read_columns(self._cursor, exercise_id, start, end, chunk_size)
+            save_cached_columns(path, stamp, columns)
+        return columns
+
     def print_all_data(self) -> None:
         """
         Print contents of all tables with separators.
@@ -170,44 +615,123 @@ class Database:
         ):
             print(i)
 
+    @_reads
+    def get_weight_progress(self, exercise_name: str) -> tuple[list[date], list[float], list[float], list[float]]:
+        """
+        Return per-day weight statistics of an exercise ordered by date.
+
+        :param exercise_name: exercise name or alias
+        :return: dates, average weights, maximal weights and volumes (sets × repetitions × weight)
+        """
+        exercise_id = self._exercises_table.get_exercise_id(exercise_name, may_be_alias=True)
+        if exercise_id is None:
+            raise ValueError(f'There is no "{exercise_name}" exercise')
+
+        rows = [row for row in self._daily_stats_table.get_stats(exercise_id) if row[5] is not None]
+        return (
+            [date.fromisoformat(row[0]) for row in rows],
+            [row[5] for row in rows],
+            [row[4] for row in rows],
+            [row[3] for row in rows],
+        )
+
+    @_reads
+    def get_daily_stats(self, exercise_name: str, start: date = None, end: date = None) -> list[tuple]:
+        """
+        Return per-day aggregates of an exercise ordered by date.
+        Reads one precomputed row per day instead of every set.
+
+        :param exercise_name: exercise name or alias
+        :param start: first date inclusive, unbounded if None
+        :param end: last date inclusive, unbounded if None
+        :return: list of (date, sets, repetitions, volume, top weight, average weight, time)
+        """
+        exercise_id = self._exercises_table.get_exercise_id(exercise_name, may_be_alias=True)
+        if exercise_id is None:
+            raise ValueError(f'There is no "{exercise_name}" exercise')
+        return [(date.fromisoformat(row[0]), *row[1:]) for row in self._daily_stats_table.get_stats(exercise_id, start, end)]
+
+    @_writes
+    def rebuild_daily_stats(self) -> None:
+        """
+        Recompute `DailyExerciseStats` from `Schedule` and `Workouts`.
+        """
+        with self.transaction():
+            self._daily_stats_table.rebuild()
+
+    @_reads
+    def check_daily_stats(self) -> list[tuple[int, date]]:
+        """
+        Find days whose aggregates in `DailyExerciseStats` disagree with `Workouts`.
+
+        :return: list of (exercise id, date), empty if the aggregates are consistent
+        """
+        return [(exercise_id, date.fromisoformat(day)) for exercise_id, day in self._daily_stats_table.check()]
+
     def plot_weights(self, exercise_name: str):
         """
-        Plot average weight by date for the given exercise.
+        Plot average and maximal weight by date for the given exercise.
         """
-        self._cursor.execute("""--sql
-            SELECT S.date, W.weight
-            FROM Workouts W
-            JOIN Schedule S ON W.schedule_id = S.id
-            JOIN Exercises E ON S.exercise_id = E.id
-            WHERE E.name = ?
-        """, (exercise_name,))
-
-        date_weight = {}
-        for d, w in self._cursor.fetchall():
-            if d not in date_weight:
-                date_weight[d] = []
-            date_weight[d].append(w)
-
-        dates = []
-        weights = []
-        for date in date_weight:
-            dates.append(datetime.strptime(date, '%Y-%m-%d'))
-            w = date_weight[date]
-            weights.append(sum(w) / len(w))
+        dates, average_weights, max_weights, _ = self.get_weight_progress(exercise_name)
 
         plt.figure(figsize=(8, 5))
-        plt.plot(dates, weights, marker='o')
+        plt.plot(dates, average_weights, marker='o', label='Average')
+        plt.plot(dates, max_weights, marker='.', linestyle='--', label='Max')
 
         plt.gca().xaxis.set_major_formatter(DateFormatter('%Y-%m-%d'))
-        plt.xticks(dates)
+        if len(dates) <= 20:
+            plt.xticks(dates)
 
         plt.xlabel('Date')
         plt.ylabel('Weight')
         plt.title(f'{exercise_name} weight progression')
 
+        plt.legend()
         plt.grid(True)
         plt.show()
 
+    @_reads
+    def get_personal_records(self, exercise_name: str) -> list[tuple]:
+        """
+        Return personal records of an exercise: best weight for every repetition count (`weight`),
+        estimated one-repetition maximum (`epley`, `brzycki`) in kg and best speed (`speed`) in kph.
+
+        :param exercise_name: exercise name or alias
+        :return: list of (kind, repetitions, value, date), repetitions is 0 unless kind is `weight`
+        """
+        exercise_id = self._exercises_table.get_exercise_id(exercise_name, may_be_alias=True)
+        if exercise_id is None:
+            raise ValueError(f'There is no "{exercise_name}" exercise')
+        return [(*row[:3], date.fromisoformat(row[3])) for row in self._records_table.get_records(exercise_id)]
+
+    @_reads
+    def get_import_checkpoint(self, source: str) -> tuple | None:
+        """
+        Return how far the import of a file has got.
+
+        :param source: absolute path of the source file
+        :return: (byte offset, lines read, imported, rejected, finished) or None
+        """
+        return self._checkpoints_table.get_checkpoint(source)
+
+    @_writes
+    def save_import_checkpoint(self, source: str, offset: int, line: int, imported: int, rejected: int, finished: bool = False) -> None:
+        """
+        Remember how far the import of a file has got.
+        Call it in the transaction that writes the imported records.
+        """
+        with self.transaction():
+            self._checkpoints_table.save_checkpoint(source, offset, line, imported, rejected, finished)
+
+    @_writes
+    def delete_import_checkpoint(self, source: str) -> None:
+        """
+        Forget the import progress of a file, so it is imported from the start.
+        """
+        with self.transaction():
+            self._checkpoints_table.delete_checkpoint(source)
+
+    @_writes
     def delete_exercise(self, exercise_name: str) -> None:
         """
         Delete an exercise and all related schedule/workout records.
@@ -215,18 +739,19 @@ class Database:
         exercise_id = self._exercises_table.get_exercise_id(exercise_name, may_be_alias=True)
         if exercise_id is None:
             raise ValueError(f'There is no "{exercise_name}" exercise')
-        
-        # Delete related workouts first
-        for schedule_id in self._get_schedule_ids_by_exercise(exercise_id):
-            self._workouts_table.delete_workouts_by_schedule(schedule_id)
-        
-        # Delete schedule records
-        self._schedule_table.delete_schedule_by_exercise(exercise_id)
-        
-        # Delete the exercise
-        self._exercises_table.delete_by_id(exercise_id)
-        self.commit()
 
+        with self.transaction():
+            # Delete related workouts first
+            self._workouts_table.delete_workouts_by_exercise(exercise_id)
+
+            # Delete schedule records
+            self._schedule_table.delete_schedule_by_exercise(exercise_id)
+
+            # Delete the exercise
+            self._exercises_table.delete_by_id(exercise_id)
+            self._records_table.recompute([exercise_id])
+
+    @_writes
     def delete_workout(self, workout_date: date, exercise_name: str) -> None:
         """
         Delete workouts for the given date and exercise.
@@ -246,53 +771,73 @@ class Database:
             raise ValueError(f'No workout found for {exercise_name} on {workout_date}')
         
         schedule_id = schedule_record[0]
-        
-        # Delete workouts
-        self._workouts_table.delete_workouts_by_schedule(schedule_id)
-        
-        # Delete schedule record
-        self._schedule_table.delete_by_id(schedule_id)
-        self.commit()
 
+        with self.transaction():
+            # Delete workouts
+            self._workouts_table.delete_workouts_by_schedule(schedule_id)
+
+            # Delete schedule record
+            self._schedule_table.delete_by_id(schedule_id)
+            self._records_table.recompute([exercise_id])
+
+    @_writes
     def delete_workout_by_date(self, workout_date: date) -> None:
         """
         Delete all workouts for the given date.
-        """        
-        # Delete schedule records
-        schedule_ids_to_delete = self._schedule_table.delete_schedule_by_date(workout_date)
-        
-        # Delete workouts first
-        for schedule_id in schedule_ids_to_delete:
-            self._workouts_table.delete_workouts_by_schedule(schedule_id)
-
-        self.commit()
+        """
+        self.delete_workouts_between(workout_date, workout_date)
 
-    def _get_schedule_ids_by_exercise(self, exercise_id: int) -> list[int]:
+    @_writes
+    def delete_workouts_between(self, start: date, end: date) -> None:
         """
-        Return all schedule IDs for the exercise.
+        Delete all workouts between the given dates inclusive.
         """
-        self._cursor.execute("""--sql
-            SELECT id FROM Schedule
-            WHERE exercise_id = ?;
-        """, (exercise_id,))
-        return [row[0] for row in self._cursor.fetchall()]
-    
-    def get_exercise_id(self, exercise_name: str, may_be_alias: bool = True) -> int | None:
+        with self.transaction():
+            exercise_ids = self._schedule_table.get_exercise_ids_between(start, end)
+
+            # Delete workouts first
+            self._workouts_table.delete_workouts_between(start, end)
+
+            # Delete schedule records
+            self._schedule_table.delete_schedule_between(start, end)
+
+            # Only the exercises trained in the range may lose records
+            self._records_table.recompute(exercise_ids)
+
+    @_reads
+    def get_exercise_id(self, exercise_name: str, may_be_alias: bool = True, use_cache: bool = True) -> int | None:
         """
         Gets exercise ID by name.
         :param exercise_name: name of the exercise.
         :param may_be_alias: whether to search in aliases too.
+        :param use_cache: if False, bypass the cached ids and query the table.
         :return: exercise ID or None if not found.
         """
-        return self._exercises_table.get_exercise_id(exercise_name, may_be_alias)
+        return self._exercises_table.get_exercise_id(exercise_name, may_be_alias, use_cache)
 
+    @_reads
     def get_workouts_by_date(self, workout_date: date) -> list[tuple]:
         """
         Gets all workouts for the given date.
         :param workout_date: date of the workout.
         :return: list of workout records.
         """
-        self._cursor.execute("""--sql
+        return self._execute_workouts_by_date(self._cursor, workout_date).fetchall()
+
+    def iter_workouts_by_date(self, workout_date: date, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over all workouts for the given date.
+        :param workout_date: date of the workout.
+        :param chunk_size: number of rows fetched at once.
+        :return: iterator of workout records.
+        """
+        return iter_rows(self._execute_workouts_by_date(self._iteration_cursor(), workout_date), chunk_size)
+
+    def _execute_workouts_by_date(self, cursor: sqlite3.Cursor, workout_date: date) -> sqlite3.Cursor:
+        """
+        Run the workouts-by-date query on the given cursor.
+        """
+        cursor.execute("""--sql
             SELECT S.id, E.name, S.order_number, W.id, W.sets, W.weight, W.repetitions, W.time, W.speed, W.units, W.feeling
             FROM Schedule S
             JOIN Exercises E ON S.exercise_id = E.id
@@ -300,8 +845,9 @@ class Database:
             WHERE S.date = ?
             ORDER BY S.order_number;
         """, (workout_date,))
-        return self._cursor.fetchall()
+        return cursor
 
+    @_reads
     def get_all_dates(self) -> list[date]:
         """
         Gets all dates with workouts.
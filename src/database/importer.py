@@ -0,0 +1,248 @@
+import csv
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from typing import BinaryIO
+from .database import Database
+from .validation import validate_batch
+
+
+# Formats of the source files by extension
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+# Record fields, named as `Database.add_workout` arguments
+FIELDS = ('workout_date', 'exercise_name', 'order_number', 'sets', 'weight', 'repetitions', 'time', 'speed', 'units', 'feeling')
+# Separator of per-set values in a CSV cell, e.g. `40;45;50`
+LIST_SEPARATOR = ';'
+# Records written per transaction
+DEFAULT_CHUNK_SIZE = 10000
+# Lines parsed by a worker at once
+DEFAULT_BATCH_LINES = 2000
+# Rejected records whose messages are kept, the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+_REQUIRED = ('workout_date', 'exercise_name', 'order_number', 'sets')
+_INTEGERS = ('order_number', 'sets', 'feeling')
+_PER_SET = {'weight': float, 'repetitions': int, 'time': int, 'speed': float}
+
+
+def _per_set(value, convert: Callable):
+    """
+    Convert a value or a list of per-set values; a CSV cell holds the list as `40;45;50`.
+    """
+    if isinstance(value, str) and LIST_SEPARATOR in value:
+        value = value.split(LIST_SEPARATOR)
+    if isinstance(value, list):
+        return [convert(item) for item in value]
+    return convert(value)
+
+
+def parse_record(fields: dict) -> dict:
+    """
+    Convert the fields of a CSV row or a JSON object into `add_workout` arguments.
+    Missing and empty fields become None.
+
+    :raises ValueError: if a field is missing or has a wrong type or format
+    """
+    record = {name: None if fields.get(name) in (None, '') else fields[name] for name in FIELDS}
+    for name in _REQUIRED:
+        if record[name] is None:
+            raise ValueError(f'Missing field "{name}"')
+    record['workout_date'] = date.fromisoformat(str(record['workout_date']))
+    record['exercise_name'] = str(record['exercise_name'])
+    for name in _INTEGERS:
+        if record[name] is not None:
+            record[name] = int(record[name])
+    for name, convert in _PER_SET.items():
+        if record[name] is not None:
+            record[name] = _per_set(record[name], convert)
+    return record
+
+
+def parse_lines(source_format: str,
+                header: list[str] | None,
+                first_line: int,
+                lines: list[bytes]) -> tuple[list[tuple[int, dict]], list[tuple[int, str]]]:
+    """
+    Parse and validate a batch of lines, in a worker process.
+    Records get the checks of `Workout` through `validate_batch`.
+
+    :param source_format: 'csv' or 'jsonl'
+    :param header: CSV column names
+    :param first_line: number of the first line in the file, from 1
+    :param lines: raw lines
+    :return: valid records with their line numbers and (line number, error message) of the others
+    """
+    parsed, errors = [], []
+    for number, line in enumerate(lines, first_line):
+        try:
+            text = line.decode('utf-8')
+            if not text.strip():
+                continue
+            if source_format == 'csv':
+                values = next(csv.reader([text]))
+                if len(values) != len(header):
+                    raise ValueError(f'Expected {len(header)} values, got {len(values)}')
+                row = dict(zip(header, values))
+            else:
+                row = json.loads(text)
+                if not isinstance(row, dict):
+                    raise ValueError('Expected a JSON object')
+            parsed.append((number, parse_record(row)))
+        except (ValueError, TypeError) as e:
+            errors.append((number, str(e)))
+
+    if parsed:
+        columns = {name: [record[name] for _, record in parsed] for name in ('sets', *_PER_SET, 'units', 'feeling')}
+        invalid, messages = validate_batch(columns)
+        errors.extend((number, message) for (number, _), message in zip(parsed, messages) if message is not None)
+        errors.sort()
+        parsed = [item for item, bad in zip(parsed, invalid) if not bad]
+    return parsed, errors
+
+
+def _parse_now(*args) -> Future:
+    """
+    Parse a batch in this process, as a finished future.
+    """
+    future = Future()
+    future.set_result(parse_lines(*args))
+    return future
+
+
+def _read_batches(file: BinaryIO, line: int, batch_lines: int) -> Iterator[tuple[int, list[bytes], int]]:
+    """
+    Read a file in batches of lines from its current position.
+
+    :param line: number of lines before the current position
+    :return: iterator of (number of the first line, lines, offset after the batch)
+    """
+    while lines := list(islice(file, batch_lines)):
+        yield line + 1, lines, file.tell()
+        line += len(lines)
+
+
+class _ImportWriter:
+    """
+    Collects parsed records and writes them in chunks, each with the checkpoint of its end.
+    """
+
+    def __init__(self, db: Database, source: str, checkpoint: tuple, total: int, progress: Callable | None) -> None:
+        self.db = db
+        self.source = source
+        self.offset, self.line, self.imported, self.rejected, _ = checkpoint
+        self.total = total
+        self.progress = progress
+        self.errors: list[tuple[int, str]] = []
+        # Records read up to (offset, line), with their line numbers
+        self.pending: list[tuple[int, dict]] = []
+
+    def reject(self, errors: list[tuple[int, str]]) -> None:
+        """
+        Count rejected records and keep the first messages.
+        """
+        self.rejected += len(errors)
+        self.errors.extend(errors[:MAX_REPORTED_ERRORS - len(self.errors)])
+
+    def add(self, parsed: list[tuple[int, dict]], errors: list[tuple[int, str]], offset: int, line: int) -> None:
+        """
+        Add the result of a batch that ends at the given offset and line.
+        """
+        self.pending.extend(parsed)
+        self.reject(errors)
+        self.offset, self.line = offset, line
+
+    def write(self, finished: bool = False) -> None:
+        """
+        Write the pending records and the checkpoint in one transaction.
+        """
+        with self.db.transaction():
+            failed = self.db.add_workouts_bulk(record for _, record in self.pending)
+            imported = self.imported + len(self.pending) - len(failed)
+            self.db.save_import_checkpoint(self.source, self.offset, self.line, imported, self.rejected + len(failed), finished)
+        self.imported = imported
+        self.reject([(self.pending[index][0], message) for index, message in failed])
+        self.pending.clear()
+        if self.progress is not None:
+            self.progress(self.offset, self.total, self.imported, self.rejected)
+
+
+def import_file(db: Database,
+                path: str,
+                source_format: str = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                workers: int = None,
+                batch_lines: int = DEFAULT_BATCH_LINES,
+                restart: bool = False,
+                progress: Callable[[int, int, int, int], object] = None) -> tuple[int, int, list[tuple[int, str]]]:
+    """
+    Stream workouts from a CSV or JSONL file of any size into the database.
+
+    Lines are parsed and validated by worker processes and written by this process
+    with `add_workouts_bulk`, about `chunk_size` records per transaction. Exercise names
+    and aliases are resolved through the cached lookup of `add_workouts_bulk`.
+    Every transaction also saves a checkpoint of the file, so after an interruption
+    the next call continues after the last written chunk.
+
+    A CSV file has a header of `FIELDS` names, per-set values are separated by `;`.
+    A JSONL file has one object with `FIELDS` keys per line. Records never span lines.
+
+    :param db: database to write to
+    :param path: source file
+    :param source_format: 'csv' or 'jsonl', by the file extension if None
+    :param chunk_size: records written per transaction, rounded up to whole batches
+    :param workers: parsing processes, the number of CPUs if None, 0 to parse in this process
+    :param batch_lines: lines sent to a worker at once
+    :param restart: ignore the checkpoint and import the whole file again
+    :param progress: called after every transaction with (bytes read, file size, imported, rejected)
+    :return: records imported and rejected in all runs and the first `MAX_REPORTED_ERRORS`
+             (line number, error message) of this run
+    :raises ValueError: if the format is unknown
+    """
+    source_format = source_format or FORMATS.get(os.path.splitext(path)[1].lower())
+    if source_format not in FORMATS.values():
+        raise ValueError(f'Unknown import format of "{path}", expected one of: {", ".join(FORMATS)}')
+    source = os.path.abspath(path)
+    if restart:
+        db.delete_import_checkpoint(source)
+    checkpoint = db.get_import_checkpoint(source) or (0, 0, 0, 0, False)
+    if checkpoint[4]:
+        return checkpoint[2], checkpoint[3], []
+    writer = _ImportWriter(db, source, checkpoint, os.path.getsize(source), progress)
+
+    with open(source, 'rb') as file:
+        header = None
+        if source_format == 'csv':
+            header = next(csv.reader([file.readline().decode('utf-8')]), [])
+            if writer.offset == 0:
+                writer.offset, writer.line = file.tell(), 1
+        file.seek(writer.offset)
+
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        executor = ProcessPoolExecutor(workers) if workers else None
+        submit = executor.submit if executor else lambda _, *args: _parse_now(*args)
+        # Batches being parsed in file order. Two per worker keep the workers busy
+        # while the reader stays close to the writer.
+        parsing: deque[tuple[Future, int, int]] = deque()
+
+        def consume() -> None:
+            future, offset, line = parsing.popleft()
+            writer.add(*future.result(), offset, line)
+            if len(writer.pending) >= chunk_size:
+                writer.write()
+
+        try:
+            for first_line, lines, end in _read_batches(file, writer.line, batch_lines):
+                parsing.append((submit(parse_lines, source_format, header, first_line, lines), end, first_line + len(lines) - 1))
+                while len(parsing) > 2 * workers:
+                    consume()
+            while parsing:
+                consume()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        writer.write(finished=True)
+    return writer.imported, writer.rejected, sorted(writer.errors)
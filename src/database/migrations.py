@@ -0,0 +1,98 @@
+import sqlite3
+from collections.abc import Callable
+from .tables.exercises import ExercisesTable
+from .tables.workouts import WorkoutsTable
+from .tables.schedule import ScheduleTable
+from .tables.daily_exercise_stats import DailyExerciseStatsTable
+from .tables.personal_records import PersonalRecordsTable
+from .tables.import_checkpoints import ImportCheckpointsTable
+
+
+def create_base_tables(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 1: create tables `Exercises`, `Workouts`, `Schedule`.
+    """
+    ExercisesTable(cursor).create()
+    WorkoutsTable(cursor).create()
+    ScheduleTable(cursor).create()
+
+
+def create_schedule_exercise_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 2: index `Schedule` by exercise.
+
+    Lookups by date and joins by `schedule_id` are already served by the
+    UNIQUE(date, ...) and UNIQUE(schedule_id, local_order) indexes.
+    """
+    cursor.execute("""--sql
+        CREATE INDEX IF NOT EXISTS Schedule_exercise_id_date
+        ON Schedule (exercise_id, date);
+    """)
+
+
+def create_daily_exercise_stats(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 3: create `DailyExerciseStats` with its triggers and fill it from existing workouts.
+    """
+    stats_table = DailyExerciseStatsTable(cursor)
+    stats_table.create()
+    stats_table.rebuild()
+
+
+def create_personal_records(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 4: create `PersonalRecords` and compute them from existing workouts.
+    """
+    records_table = PersonalRecordsTable(cursor)
+    records_table.create()
+    records_table.rebuild()
+
+
+def create_import_checkpoints(cursor: sqlite3.Cursor) -> None:
+    """
+    Migration 5: create `ImportCheckpoints`.
+    """
+    ImportCheckpointsTable(cursor).create()
+
+
+# Ordered list of migrations, the schema version is the number of applied ones.
+# Every migration must be idempotent; never reorder or remove entries.
+MIGRATIONS: list[Callable[[sqlite3.Cursor], None]] = [
+    create_base_tables,
+    create_schedule_exercise_index,
+    create_daily_exercise_stats,
+    create_personal_records,
+    create_import_checkpoints,
+]
+
+
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    """
+    Return the schema version stored in the database header.
+    """
+    cursor.execute('PRAGMA user_version;')
+    return cursor.fetchone()[0]
+
+
+def set_schema_version(cursor: sqlite3.Cursor, version: int) -> None:
+    """
+    Store the schema version in the database header.
+    """
+    cursor.execute(f'PRAGMA user_version = {int(version)};')
+
+
+def migrate(cursor: sqlite3.Cursor) -> int:
+    """
+    Apply all pending migrations. Does not manage the transaction.
+
+    :param cursor: SQLite cursor
+    :return: number of applied migrations
+    :raises: ValueError if the database was created by a newer schema
+    """
+    version = get_schema_version(cursor)
+    if version > len(MIGRATIONS):
+        raise ValueError(f'Database schema version {version} is newer than supported {len(MIGRATIONS)}')
+    for migration in MIGRATIONS[version:]:
+        migration(cursor)
+    set_schema_version(cursor, len(MIGRATIONS))
+    return len(MIGRATIONS) - version
@@ -0,0 +1,62 @@
+import sqlite3
+
+
+# Connection settings applied right after connecting, see https://sqlite.org/pragma.html
+PROFILES: dict[str, dict[str, str | int]] = {
+    # Every committed workout survives a power loss
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -2000,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+    # Large re-runnable imports: no fsync, big page cache
+    'fast-ingest': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'mmap_size': 0,
+        'cache_size': -65536,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # Long analytic queries: memory-mapped reads, big page cache
+    'read-heavy-analytics': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,
+        'cache_size': -65536,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # ':memory:' databases, tests and throwaway copies
+    'in-memory': {
+        'journal_mode': 'MEMORY',
+        'synchronous': 'OFF',
+        'mmap_size': 0,
+        'cache_size': -16384,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 0,
+    },
+}
+
+DEFAULT_PROFILE = 'durable'
+
+
+def apply_profile(connection: sqlite3.Connection, profile: str, read_only: bool = False) -> None:
+    """
+    Apply the settings of a named profile to a connection.
+    Must be called outside of a transaction.
+
+    :param connection: SQLite connection
+    :param profile: profile name, one of `PROFILES`
+    :param read_only: the connection is read-only, keep the journal mode of the file
+    :raises: ValueError if the profile is unknown
+    """
+    if profile not in PROFILES:
+        raise ValueError(f'Unknown profile "{profile}", expected one of: {", ".join(PROFILES)}')
+    for pragma, value in PROFILES[profile].items():
+        if read_only and pragma == 'journal_mode':
+            continue
+        connection.execute(f'PRAGMA {pragma} = {value};')
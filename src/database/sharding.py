@@ -0,0 +1,359 @@
+import os
+import re
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date
+from .database import Database
+from .profiles import DEFAULT_PROFILE
+from .tables.table import DEFAULT_CHUNK_SIZE, DEFAULT_PAGE_SIZE
+from .tracing import QueryTracer
+
+
+# Shard databases kept open at once
+DEFAULT_MAX_OPEN_SHARDS = 32
+
+_USER_ID = re.compile(r'[A-Za-z0-9_-]+')
+_SHARD_FILE = re.compile(r'user_([A-Za-z0-9_-]+)\.db')
+
+
+def shard_file(directory: str, user_id: str | int) -> str:
+    """
+    Return the path of the database file of a user.
+
+    :param directory: directory of the shard files
+    :param user_id: user id of letters, digits, `_` and `-`
+    :raises ValueError: if the user id can't be a part of a file name
+    """
+    user_id = str(user_id)
+    if not _USER_ID.fullmatch(user_id):
+        raise ValueError(f'Invalid user id "{user_id}"')
+    return os.path.join(directory, f'user_{user_id}.db')
+
+
+class ShardedDatabase:
+    """
+    Router keeping the workouts of every user in a separate database file,
+    so writes of different users never wait for each other's file locks.
+
+    Methods are those of `Database` with the user id as the first argument.
+    Shard databases are opened on first use and the least recently used ones
+    are closed when more than `max_open` are open, which bounds the file handles.
+    Like `Database` in single-thread mode, the router is used from one thread.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 profile: str = DEFAULT_PROFILE,
+                 max_open: int = DEFAULT_MAX_OPEN_SHARDS,
+                 tracer: QueryTracer = None) -> None:
+        """
+        :param directory: directory of the shard files, created if missing
+        :param profile: connection settings profile of every shard, one of `profiles.PROFILES`
+        :param max_open: shard databases kept open at once
+        :param tracer: shared tracer of all shards, see `Database.stats()`
+        """
+        if max_open < 1:
+            raise ValueError('At least one shard must be open at a time')
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._profile = profile
+        self._max_open = max_open
+        self._tracer = tracer
+        # user id -> open database, least recently used first
+        self._open: OrderedDict[str, Database] = OrderedDict()
+        # Shards used by running operations or unfinished iterators are never closed
+        self._pinned: Counter[str] = Counter()
+
+    def __enter__(self) -> 'ShardedDatabase':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def users(self) -> list[str]:
+        """
+        Return the ids of all users with a database file.
+        """
+        return sorted(match[1] for name in os.listdir(self._directory) if (match := _SHARD_FILE.fullmatch(name)))
+
+    def shard_files(self) -> list[str]:
+        """
+        Return the database files of all users.
+        """
+        return [shard_file(self._directory, user_id) for user_id in self.users()]
+
+    def open_shards(self) -> list[str]:
+        """
+        Return the ids of users whose databases are open, least recently used first.
+        """
+        return list(self._open)
+
+    @contextmanager
+    def shard(self, user_id: str | int, create: bool = True) -> Iterator[Database]:
+        """
+        Open the database of a user for the block. It is not closed by the LRU policy while in use.
+
+        :param user_id: user id, see `shard_file`
+        :param create: create the database of a new user, otherwise raise
+        :raises ValueError: if the user has no database and `create` is False
+        """
+        user_id = str(user_id)
+        database = self._open.get(user_id)
+        if database is None:
+            path = shard_file(self._directory, user_id)
+            if not create and not os.path.exists(path):
+                raise ValueError(f'There is no "{user_id}" user')
+            database = self._open[user_id] = Database(path, self._profile, tracer=self._tracer)
+        self._open.move_to_end(user_id)
+        self._pinned[user_id] += 1
+        try:
+            self._evict()
+            yield database
+        finally:
+            self._pinned[user_id] -= 1
+            if not self._pinned[user_id]:
+                del self._pinned[user_id]
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Close the least recently used unpinned shards while too many are open.
+        """
+        for user_id in list(self._open):
+            if len(self._open) <= self._max_open:
+                break
+            if user_id not in self._pinned:
+                self._open.pop(user_id).close()
+
+    def close_shard(self, user_id: str | int) -> None:
+        """
+        Close the database of a user if it is open and unused.
+        """
+        user_id = str(user_id)
+        if user_id in self._pinned:
+            raise ValueError(f'Database of "{user_id}" user is in use')
+        database = self._open.pop(user_id, None)
+        if database is not None:
+            database.close()
+
+    def close(self) -> None:
+        """
+        Close all open shard databases.
+        """
+        while self._open:
+            self._open.popitem(last=False)[1].close()
+        self._pinned.clear()
+
+    def _call_or_create(self, user_id: str | int, method: str, *args, **kwargs):
+        """
+        Call a `Database` method on the shard of a user, creating it for a new user.
+        """
+        with self.shard(user_id) as database:
+            return getattr(database, method)(*args, **kwargs)
+
+    def _call(self, user_id: str | int, method: str, *args, **kwargs):
+        """
+        Call a `Database` method on the shard of an existing user.
+        """
+        with self.shard(user_id, create=False) as database:
+            return getattr(database, method)(*args, **kwargs)
+
+    def _iterate(self, user_id: str | int, method: str, *args, **kwargs) -> Iterator:
+        """
+        Iterate over a `Database` iterator with its shard pinned until the iterator is exhausted or closed.
+        """
+        with self.shard(user_id, create=False) as database:
+            yield from getattr(database, method)(*args, **kwargs)
+
+    def add_exercise(self, user_id: str | int, exercise_name: str, alias: str = None, target_muscle_group: str = None) -> None:
+        """
+        Add an exercise, see `Database.add_exercise`.
+        """
+        self._call_or_create(user_id, 'add_exercise', exercise_name, alias, target_muscle_group)
+
+    def add_workout(self,
+                    user_id: str | int,
+                    workout_date: date,
+                    exercise_name: str,
+                    order_number: int,
+                    sets: int,
+                    weight: float | list[float] = None,
+                    repetitions: int | list[int] = None,
+                    time: int | list[int] = None,
+                    speed: float | list[float] = None,
+                    units: str = None,
+                    feeling: int = None) -> None:
+        """
+        Add a workout session, see `Database.add_workout`.
+        """
+        self._call_or_create(user_id, 'add_workout', workout_date, exercise_name, order_number, sets,
+                             weight, repetitions, time, speed, units, feeling)
+
+    def add_workouts_bulk(self, user_id: str | int, records: Iterable[dict]) -> list[tuple[int, str]]:
+        """
+        Add many workout sessions in a single transaction, see `Database.add_workouts_bulk`.
+        """
+        return self._call_or_create(user_id, 'add_workouts_bulk', records)
+
+    def delete_exercise(self, user_id: str | int, exercise_name: str) -> None:
+        """
+        Delete an exercise and all related records, see `Database.delete_exercise`.
+        """
+        self._call(user_id, 'delete_exercise', exercise_name)
+
+    def delete_workout(self, user_id: str | int, workout_date: date, exercise_name: str) -> None:
+        """
+        Delete workouts for the given date and exercise, see `Database.delete_workout`.
+        """
+        self._call(user_id, 'delete_workout', workout_date, exercise_name)
+
+    def delete_workout_by_date(self, user_id: str | int, workout_date: date) -> None:
+        """
+        Delete all workouts of a user for the given date.
+        """
+        self._call(user_id, 'delete_workout_by_date', workout_date)
+
+    def delete_workouts_between(self, user_id: str | int, start: date, end: date) -> None:
+        """
+        Delete all workouts of a user between the given dates inclusive.
+        """
+        self._call(user_id, 'delete_workouts_between', start, end)
+
+    def find_workout(self, user_id: str | int, workout_date: date, exercise_name: str) -> list[tuple]:
+        """
+        Find records by date and exercise, see `Database.find_workout`.
+        """
+        return self._call(user_id, 'find_workout', workout_date, exercise_name)
+
+    def get_workouts_by_date(self, user_id: str | int, workout_date: date) -> list[tuple]:
+        """
+        Return all workouts of a user for the given date, see `Database.get_workouts_by_date`.
+        """
+        return self._call(user_id, 'get_workouts_by_date', workout_date)
+
+    def iter_workouts_by_date(self, user_id: str | int, workout_date: date, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over the workouts of a user for the given date, see `Database.iter_workouts_by_date`.
+        """
+        return self._iterate(user_id, 'iter_workouts_by_date', workout_date, chunk_size)
+
+    def get_all_dates(self, user_id: str | int) -> list[date]:
+        """
+        Return all dates with workouts of a user.
+        """
+        return self._call(user_id, 'get_all_dates')
+
+    def get_all_exercises(self, user_id: str | int) -> list[list[str]]:
+        """
+        Return all exercises of a user, see `Database.get_all_exercises`.
+        """
+        return self._call(user_id, 'get_all_exercises')
+
+    def get_all_schedule(self, user_id: str | int) -> list[list[str]]:
+        """
+        Return all schedule records of a user.
+        """
+        return self._call(user_id, 'get_all_schedule')
+
+    def get_all_workouts(self, user_id: str | int) -> list[list[str]]:
+        """
+        Return all workout records of a user.
+        """
+        return self._call(user_id, 'get_all_workouts')
+
+    def iter_all_exercises(self, user_id: str | int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over all exercises of a user.
+        """
+        return self._iterate(user_id, 'iter_all_exercises', chunk_size)
+
+    def iter_all_schedule(self, user_id: str | int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over all schedule records of a user.
+        """
+        return self._iterate(user_id, 'iter_all_schedule', chunk_size)
+
+    def iter_all_workouts(self, user_id: str | int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Lazily iterate over all workout records of a user.
+        """
+        return self._iterate(user_id, 'iter_all_workouts', chunk_size)
+
+    def get_page(self, user_id: str | int, table_name: str, after_id: int = None, before_id: int = None, limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Return a page of a table of a user, see `Database.get_page`.
+        """
+        return self._call(user_id, 'get_page', table_name, after_id, before_id, limit)
+
+    def get_first_id_from_date(self, user_id: str | int, table_name: str, from_date: date) -> int | None:
+        """
+        Return the first id of a table of a user from the given date, see `Database.get_first_id_from_date`.
+        """
+        return self._call(user_id, 'get_first_id_from_date', table_name, from_date)
+
+    def get_date_page(self,
+                      user_id: str | int,
+                      table_name: str,
+                      from_date: date = None,
+                      after_id: int = None,
+                      before_id: int = None,
+                      limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Return a page of a table of a user ordered by date, see `Database.get_date_page`.
+        """
+        return self._call(user_id, 'get_date_page', table_name, from_date, after_id, before_id, limit)
+
+    def get_exercise_id(self, user_id: str | int, exercise_name: str, may_be_alias: bool = True) -> int | None:
+        """
+        Return exercise id of a user by name or alias.
+        """
+        return self._call(user_id, 'get_exercise_id', exercise_name, may_be_alias)
+
+    def get_weight_progress(self, user_id: str | int, exercise_name: str) -> tuple[list[date], list[float], list[float], list[float]]:
+        """
+        Return per-day weight statistics of an exercise of a user, see `Database.get_weight_progress`.
+        """
+        return self._call(user_id, 'get_weight_progress', exercise_name)
+
+    def get_daily_stats(self, user_id: str | int, exercise_name: str, start: date = None, end: date = None) -> list[tuple]:
+        """
+        Return per-day aggregates of an exercise of a user, see `Database.get_daily_stats`.
+        """
+        return self._call(user_id, 'get_daily_stats', exercise_name, start, end)
+
+    def get_personal_records(self, user_id: str | int, exercise_name: str) -> list[tuple]:
+        """
+        Return personal records of an exercise of a user, see `Database.get_personal_records`.
+        """
+        return self._call(user_id, 'get_personal_records', exercise_name)
+
+    def to_columns(self,
+                   user_id: str | int,
+                   exercise_name: str = None,
+                   start: date = None,
+                   end: date = None,
+                   cache_dir: str = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Read the workouts of a user into NumPy columns, see `Database.to_columns`.
+        Every user has own subdirectory of `cache_dir`, as exercise ids of users overlap.
+        """
+        if cache_dir is not None:
+            cache_dir = shard_file(cache_dir, user_id)[:-len('.db')]
+            os.makedirs(cache_dir, exist_ok=True)
+        return self._call(user_id, 'to_columns', exercise_name, start, end, cache_dir, chunk_size)
+
+    def plot_weights(self, user_id: str | int, exercise_name: str) -> None:
+        """
+        Plot average and maximal weight by date for an exercise of a user.
+        """
+        self._call(user_id, 'plot_weights', exercise_name)
+
+    def stats(self, limit: int = 20) -> str:
+        """
+        Return a text report of the slowest statements of all shards, see `Database.stats`.
+        """
+        if self._tracer is None:
+            return 'Query tracing is disabled'
+        return self._tracer.report(limit)
@@ -0,0 +1,170 @@
+import sqlite3
+from collections.abc import Callable
+from datetime import date
+from .table import Table
+
+
+# Number of sets a `Workouts` row stands for: all of them for local_order = -1, otherwise one
+_ROW_SETS = 'CASE WHEN {0}.local_order = -1 THEN {0}.sets ELSE 1 END'
+
+# Daily aggregates of the executions of the schedule records selected by `{where}`.
+# There is at most one schedule record per exercise and date.
+_AGGREGATE_QUERY = f"""--sql
+    SELECT S.exercise_id,
+           S.date,
+           SUM({_ROW_SETS.format('W')}),
+           COALESCE(SUM({_ROW_SETS.format('W')} * W.repetitions), 0),
+           COALESCE(SUM({_ROW_SETS.format('W')} * W.repetitions * W.weight), 0),
+           MAX(W.weight),
+           COALESCE(SUM({_ROW_SETS.format('W')} * W.weight), 0),
+           COALESCE(SUM(CASE WHEN W.weight IS NOT NULL THEN {_ROW_SETS.format('W')} END), 0),
+           COALESCE(SUM({_ROW_SETS.format('W')} * W.time), 0)
+    FROM Schedule S
+    JOIN Workouts W ON W.schedule_id = S.id
+    WHERE {{where}}
+    GROUP BY S.id
+"""
+
+_COLUMNS = 'exercise_id, date, sets, repetitions, volume, top_weight, weight_sum, weight_sets, time'
+
+
+class DailyExerciseStatsTable(Table):
+    """
+    `DailyExerciseStats` table: per-day aggregates of every exercise.
+    Kept up to date by triggers on `Workouts` and `Schedule`.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
+        """
+        Initialize the `DailyExerciseStats` table wrapper.
+
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
+        """
+        super().__init__('DailyExerciseStats', cursor)
+
+    def create(self) -> None:
+        """
+        Create `DailyExerciseStats` table and the triggers maintaining it.
+        """
+        self._cursor.execute("""--sql
+            CREATE TABLE IF NOT EXISTS DailyExerciseStats (
+                exercise_id INTEGER NOT NULL,
+                date DATE NOT NULL,
+                sets INTEGER NOT NULL,
+                repetitions INTEGER NOT NULL,
+                volume REAL NOT NULL,
+                top_weight REAL,
+                weight_sum REAL NOT NULL,
+                weight_sets INTEGER NOT NULL,
+                time INTEGER NOT NULL,
+                PRIMARY KEY (exercise_id, date)
+            ) WITHOUT ROWID;
+        """)
+        self._cursor.execute(f"""--sql
+            CREATE TRIGGER IF NOT EXISTS Workouts_insert_DailyExerciseStats
+            AFTER INSERT ON Workouts
+            BEGIN
+                INSERT INTO DailyExerciseStats ({_COLUMNS})
+                SELECT S.exercise_id,
+                       S.date,
+                       N.sets,
+                       COALESCE(N.sets * NEW.repetitions, 0),
+                       COALESCE(N.sets * NEW.repetitions * NEW.weight, 0),
+                       NEW.weight,
+                       COALESCE(N.sets * NEW.weight, 0),
+                       CASE WHEN NEW.weight IS NOT NULL THEN N.sets ELSE 0 END,
+                       COALESCE(N.sets * NEW.time, 0)
+                FROM Schedule S, (SELECT {_ROW_SETS.format('NEW')} AS sets) N
+                WHERE S.id = NEW.schedule_id
+                ON CONFLICT (exercise_id, date) DO UPDATE SET
+                    sets = sets + excluded.sets,
+                    repetitions = repetitions + excluded.repetitions,
+                    volume = volume + excluded.volume,
+                    top_weight = CASE WHEN top_weight IS NULL OR excluded.top_weight > top_weight
+                                      THEN excluded.top_weight ELSE top_weight END,
+                    weight_sum = weight_sum + excluded.weight_sum,
+                    weight_sets = weight_sets + excluded.weight_sets,
+                    time = time + excluded.time;
+            END;
+        """)
+        # A maximum can't be decreased incrementally: recompute the affected day
+        self._cursor.execute(f"""--sql
+            CREATE TRIGGER IF NOT EXISTS Workouts_delete_DailyExerciseStats
+            AFTER DELETE ON Workouts
+            BEGIN
+                DELETE FROM DailyExerciseStats
+                WHERE (exercise_id, date) = (SELECT exercise_id, date FROM Schedule WHERE id = OLD.schedule_id);
+                INSERT INTO DailyExerciseStats ({_COLUMNS})
+                {_AGGREGATE_QUERY.format(where='S.id = OLD.schedule_id')};
+            END;
+        """)
+        self._cursor.execute("""--sql
+            CREATE TRIGGER IF NOT EXISTS Schedule_delete_DailyExerciseStats
+            AFTER DELETE ON Schedule
+            BEGIN
+                DELETE FROM DailyExerciseStats
+                WHERE exercise_id = OLD.exercise_id AND date = OLD.date;
+            END;
+        """)
+
+    def rebuild(self) -> None:
+        """
+        Recompute all aggregates from `Schedule` and `Workouts`.
+        """
+        self._cursor.execute('DELETE FROM DailyExerciseStats;')
+        self._cursor.execute(f"""
+            INSERT INTO DailyExerciseStats ({_COLUMNS})
+            {_AGGREGATE_QUERY.format(where='TRUE')};
+        """)
+
+    def check(self) -> list[tuple]:
+        """
+        Compare the aggregates with `Schedule` and `Workouts`.
+
+        :return: list of (exercise_id, date) whose aggregates are missing, stale or superfluous
+        """
+        self._cursor.execute(f"""--sql
+            WITH Expected ({_COLUMNS}) AS ({_AGGREGATE_QUERY.format(where='TRUE')})
+            SELECT E.exercise_id, E.date
+            FROM Expected E
+            LEFT JOIN DailyExerciseStats D ON D.exercise_id = E.exercise_id AND D.date = E.date
+            WHERE D.exercise_id IS NULL
+               OR D.sets != E.sets
+               OR D.repetitions != E.repetitions
+               OR ABS(D.volume - E.volume) > 1e-6
+               OR D.top_weight IS NOT E.top_weight
+               OR ABS(D.weight_sum - E.weight_sum) > 1e-6
+               OR D.weight_sets != E.weight_sets
+               OR D.time != E.time
+            UNION
+            SELECT D.exercise_id, D.date
+            FROM DailyExerciseStats D
+            LEFT JOIN Expected E ON D.exercise_id = E.exercise_id AND D.date = E.date
+            WHERE E.exercise_id IS NULL
+            ORDER BY 1, 2;
+        """)
+        return self._cursor.fetchall()
+
+    def get_stats(self, exercise_id: int, start: date = None, end: date = None) -> list[tuple]:
+        """
+        Return daily aggregates of an exercise ordered by date.
+
+        :param exercise_id: exercise id
+        :param start: first date inclusive, unbounded if None
+        :param end: last date inclusive, unbounded if None
+        :return: list of (date, sets, repetitions, volume, top_weight, average_weight, time)
+        """
+        conditions, parameters = ['exercise_id = ?'], [exercise_id]
+        if start is not None:
+            conditions.append('date >= ?')
+            parameters.append(start)
+        if end is not None:
+            conditions.append('date <= ?')
+            parameters.append(end)
+        self._cursor.execute(f"""--sql
+            SELECT date, sets, repetitions, volume, top_weight, weight_sum / NULLIF(weight_sets, 0), time
+            FROM DailyExerciseStats
+            WHERE {' AND '.join(conditions)}
+            ORDER BY date;
+        """, parameters)
+        return self._cursor.fetchall()
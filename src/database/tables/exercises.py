@@ -1,4 +1,6 @@
 import sqlite3
+import threading
+from collections.abc import Callable
 from .table import Table
 
 
@@ -7,13 +9,22 @@ class ExercisesTable(Table):
     `Exercises` table: exercises and their attributes (alias, muscle group).
     """
 
-    def __init__(self, cursor: sqlite3.Cursor) -> None:
+    def __init__(self, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
         """
         Initialize the `Exercises` table wrapper.
 
-        :param cursor: SQLite cursor
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
         """
         super().__init__('Exercises', cursor)
+        # (name -> id, alias -> id), loaded on the first lookup. The dictionaries are
+        # never changed in place: writers install updated copies under the lock.
+        self._ids = None
+        # Grows with every change, so a snapshot read before a change is not installed after it
+        self._generation = 0
+        # Connection with uncommitted changes of the table: snapshots read by other
+        # connections can't see them and are not cached until the transaction ends
+        self._writer = None
+        self._lock = threading.Lock()
 
     def create(self) -> None:
         """
@@ -27,6 +38,25 @@ class ExercisesTable(Table):
                 target_muscle_group TEXT
             );
         """)
+        self.invalidate_cache()
+
+    def drop(self) -> None:
+        """
+        Drop the table if it exists.
+        """
+        super().drop()
+        with self._lock:
+            self._changed()
+            self._ids = None
+
+    def clear(self) -> None:
+        """
+        Delete all rows from the table.
+        """
+        super().clear()
+        with self._lock:
+            self._changed()
+            self._ids = None
 
     def add_exercise(self, exercise_name: str, alias: str = None, target_muscle_group: str = None) -> None:
         """
@@ -40,15 +70,99 @@ class ExercisesTable(Table):
             INSERT INTO Exercises (name, alias, target_muscle_group)
             VALUES (?, ?, ?);
         """, (exercise_name, alias, target_muscle_group))
-        return self._cursor.lastrowid
-    
-    def get_exercise_id(self, exercise_name: str, may_be_alias: bool = False) -> int | None:
+        exercise_id = self._cursor.lastrowid
+        with self._lock:
+            self._changed()
+            if self._ids is not None:
+                ids_by_name, ids_by_alias = dict(self._ids[0]), dict(self._ids[1])
+                ids_by_name[exercise_name] = exercise_id
+                if alias is not None:
+                    ids_by_alias[alias] = exercise_id
+                self._ids = ids_by_name, ids_by_alias
+        return exercise_id
+
+    def delete_by_id(self, id):
+        """
+        Delete a row by its primary key.
+
+        :param id: row identifier
+        """
+        super().delete_by_id(id)
+        with self._lock:
+            self._changed()
+            if self._ids is not None:
+                self._ids = tuple({key: exercise_id for key, exercise_id in ids.items() if exercise_id != id}
+                                  for ids in self._ids)
+
+    def invalidate_cache(self) -> None:
+        """
+        Forget cached exercise ids, they are reloaded on the next lookup.
+        """
+        with self._lock:
+            self._generation += 1
+            self._ids = None
+
+    def _changed(self) -> None:
+        """
+        Record a change of the table made by the current connection. Call with the lock held.
+        """
+        self._generation += 1
+        self._writer = self._cursor.connection
+
+    def transaction_finished(self) -> None:
+        """
+        Tell the table that the outermost transaction was committed or rolled back:
+        ids being loaded by other connections may predate it and are not cached,
+        later loads see the committed rows and are cached again.
+        """
+        with self._lock:
+            self._generation += 1
+            self._writer = None
+
+    def _get_cached_ids(self) -> tuple[dict[str, int], dict[str, int]]:
+        """
+        Return ids of all exercises by name and by alias, loading them if needed.
+        """
+        with self._lock:
+            ids, generation = self._ids, self._generation
+        if ids is None:
+            self._cursor.execute("SELECT id, name, alias FROM Exercises;")
+            rows = self._cursor.fetchall()
+            ids = (
+                {name: exercise_id for exercise_id, name, _ in rows},
+                {alias: exercise_id for exercise_id, _, alias in rows if alias is not None},
+            )
+            with self._lock:
+                # Another thread changed the table meanwhile or has uncommitted changes
+                # this connection doesn't see: use the snapshot once, don't cache it
+                if self._generation == generation and self._writer in (None, self._cursor.connection):
+                    self._ids = ids
+        return ids
+
+    def get_exercise_id(self, exercise_name: str, may_be_alias: bool = False, use_cache: bool = True) -> int | None:
         """
         Return exercise id by name (or by alias if may_be_alias is True).
+
+        :param use_cache: if False, query the table instead of the cached ids
+        """
+        if not use_cache:
+            if may_be_alias:
+                self._cursor.execute("SELECT id FROM Exercises WHERE name = ? OR alias = ?;", (exercise_name, exercise_name))
+            else:
+                self._cursor.execute("SELECT id FROM Exercises WHERE name = ?;", (exercise_name,))
+            data = self._cursor.fetchone()
+            return data[0] if data else None
+
+        ids_by_name, ids_by_alias = self._get_cached_ids()
+        exercise_id = ids_by_name.get(exercise_name)
+        if exercise_id is None and may_be_alias:
+            exercise_id = ids_by_alias.get(exercise_name)
+        return exercise_id
+
+    def get_exercise_ids(self) -> dict[str, int]:
+        """
+        Return mapping of exercise names and aliases to exercise ids.
+        Names take precedence over aliases of other exercises.
         """
-        if may_be_alias:
-            self._cursor.execute("SELECT id FROM Exercises WHERE name = ? OR alias = ?;", (exercise_name, exercise_name))
-        else:
-            self._cursor.execute("SELECT id FROM Exercises WHERE name = ?;", (exercise_name,))
-        data = self._cursor.fetchone()
-        return data[0] if data else None
+        ids_by_name, ids_by_alias = self._get_cached_ids()
+        return {**ids_by_alias, **ids_by_name}
@@ -0,0 +1,77 @@
+import sqlite3
+from collections.abc import Callable
+from .table import Table
+
+
+class ImportCheckpointsTable(Table):
+    """
+    `ImportCheckpoints` table: how far the import of every source file has got,
+    so an interrupted import continues after the last committed chunk.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
+        """
+        Initialize the `ImportCheckpoints` table wrapper.
+
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
+        """
+        super().__init__('ImportCheckpoints', cursor)
+
+    def create(self) -> None:
+        """
+        Create `ImportCheckpoints` table.
+        """
+        self._cursor.execute("""--sql
+            CREATE TABLE IF NOT EXISTS ImportCheckpoints (
+                source TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL CHECK(offset >= 0),
+                line INTEGER NOT NULL CHECK(line >= 0),
+                imported INTEGER NOT NULL,
+                rejected INTEGER NOT NULL,
+                finished INTEGER NOT NULL CHECK(finished IN (0, 1)),
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID;
+        """)
+
+    def get_checkpoint(self, source: str) -> tuple | None:
+        """
+        Return the checkpoint of a source file or None.
+
+        :param source: absolute path of the source file
+        :return: (offset, line, imported, rejected, finished) tuple
+        """
+        self._cursor.execute("""--sql
+            SELECT offset, line, imported, rejected, finished
+            FROM ImportCheckpoints
+            WHERE source = ?;
+        """, (source,))
+        return self._cursor.fetchone()
+
+    def save_checkpoint(self, source: str, offset: int, line: int, imported: int, rejected: int, finished: bool) -> None:
+        """
+        Insert or replace the checkpoint of a source file.
+
+        :param source: absolute path of the source file
+        :param offset: byte offset of the first line not imported yet
+        :param line: number of lines read up to `offset`
+        :param imported: records imported so far
+        :param rejected: records rejected so far
+        :param finished: the whole file is imported
+        """
+        self._cursor.execute("""--sql
+            INSERT INTO ImportCheckpoints (source, offset, line, imported, rejected, finished)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source) DO UPDATE SET
+                offset = excluded.offset,
+                line = excluded.line,
+                imported = excluded.imported,
+                rejected = excluded.rejected,
+                finished = excluded.finished,
+                updated_at = CURRENT_TIMESTAMP;
+        """, (source, offset, line, imported, rejected, int(finished)))
+
+    def delete_checkpoint(self, source: str) -> None:
+        """
+        Forget the checkpoint of a source file.
+        """
+        self._cursor.execute('DELETE FROM ImportCheckpoints WHERE source = ?;', (source,))
@@ -0,0 +1,126 @@
+import json
+import sqlite3
+from collections.abc import Callable, Iterable
+from .table import Table
+
+
+# Weights in kg and speeds in kph, whatever units the set was recorded in
+_WEIGHT = "CASE WHEN W.units = 'lbs' THEN W.weight * 0.45359237 ELSE W.weight END"
+_SPEED = "CASE WHEN W.units = 'mph' THEN W.speed * 1.609344 ELSE W.speed END"
+
+# Record candidates of the sets selected by `{where}`: (exercise_id, kind, repetitions, value, date).
+# `repetitions` is 0 for kinds that are not tracked per repetition count.
+_CANDIDATES_QUERY = f"""--sql
+    SELECT S.exercise_id, 'weight', W.repetitions, {_WEIGHT}, S.date
+    FROM Schedule S JOIN Workouts W ON W.schedule_id = S.id
+    WHERE W.weight IS NOT NULL AND W.repetitions IS NOT NULL AND {{where}}
+    UNION ALL
+    SELECT S.exercise_id, 'epley', 0,
+           CASE WHEN W.repetitions = 1 THEN {_WEIGHT} ELSE {_WEIGHT} * (1 + W.repetitions / 30.0) END, S.date
+    FROM Schedule S JOIN Workouts W ON W.schedule_id = S.id
+    WHERE W.weight IS NOT NULL AND W.repetitions IS NOT NULL AND {{where}}
+    UNION ALL
+    SELECT S.exercise_id, 'brzycki', 0, {_WEIGHT} * 36.0 / (37 - W.repetitions), S.date
+    FROM Schedule S JOIN Workouts W ON W.schedule_id = S.id
+    WHERE W.weight IS NOT NULL AND W.repetitions < 37 AND {{where}}
+    UNION ALL
+    SELECT S.exercise_id, 'speed', 0, {_SPEED}, S.date
+    FROM Schedule S JOIN Workouts W ON W.schedule_id = S.id
+    WHERE W.speed IS NOT NULL AND {{where}}
+"""
+
+# The best candidate of every record; the bare `date` column comes from the row holding MAX(value).
+# An existing record is replaced only when it is beaten.
+_INSERT_RECORDS = f"""--sql
+    WITH Candidates (exercise_id, kind, repetitions, value, date) AS ({_CANDIDATES_QUERY})
+    INSERT INTO PersonalRecords (exercise_id, kind, repetitions, value, date)
+    SELECT exercise_id, kind, repetitions, MAX(value), date
+    FROM Candidates
+    GROUP BY exercise_id, kind, repetitions
+    ON CONFLICT (exercise_id, kind, repetitions) DO UPDATE SET
+        value = excluded.value,
+        date = excluded.date
+    WHERE excluded.value > value;
+"""
+
+
+class PersonalRecordsTable(Table):
+    """
+    `PersonalRecords` table: best results of every exercise.
+
+    Kinds of records:
+    - `weight`: best weight for every repetition count, kg
+    - `epley`, `brzycki`: best estimated one-repetition maximum, kg
+    - `speed`: best cardio speed, kph
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
+        """
+        Initialize the `PersonalRecords` table wrapper.
+
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
+        """
+        super().__init__('PersonalRecords', cursor)
+
+    def create(self) -> None:
+        """
+        Create `PersonalRecords` table.
+        """
+        self._cursor.execute("""--sql
+            CREATE TABLE IF NOT EXISTS PersonalRecords (
+                exercise_id INTEGER NOT NULL,
+                kind TEXT NOT NULL CHECK(kind IN ('weight', 'epley', 'brzycki', 'speed')),
+                repetitions INTEGER NOT NULL,
+                value REAL NOT NULL,
+                date DATE NOT NULL,
+                PRIMARY KEY (exercise_id, kind, repetitions)
+            ) WITHOUT ROWID;
+        """)
+
+    def update_from_schedule(self, first_schedule_id: int, last_schedule_id: int) -> None:
+        """
+        Improve the records with the sets of newly added schedule records.
+
+        :param first_schedule_id: first added schedule id
+        :param last_schedule_id: last added schedule id
+        """
+        where = 'S.id BETWEEN :first AND :last'
+        self._cursor.execute(_INSERT_RECORDS.format(where=where), {'first': first_schedule_id, 'last': last_schedule_id})
+
+    def recompute(self, exercise_ids: Iterable[int]) -> None:
+        """
+        Recompute the records of the given exercises from all their sets.
+        Runs two statements however many exercises are given.
+
+        :param exercise_ids: exercise ids
+        """
+        # The ids are passed as one JSON array, so the statements don't depend on their number
+        exercise_ids = json.dumps(list(exercise_ids))
+        self._cursor.execute("""--sql
+            DELETE FROM PersonalRecords
+            WHERE exercise_id IN (SELECT value FROM json_each(?));
+        """, (exercise_ids,))
+        where = 'S.exercise_id IN (SELECT value FROM json_each(:exercise_ids))'
+        self._cursor.execute(_INSERT_RECORDS.format(where=where), {'exercise_ids': exercise_ids})
+
+    def rebuild(self) -> None:
+        """
+        Recompute the records of all exercises.
+        """
+        self._cursor.execute('DELETE FROM PersonalRecords;')
+        self._cursor.execute(_INSERT_RECORDS.format(where='TRUE'))
+
+    def get_records(self, exercise_id: int) -> list[tuple]:
+        """
+        Return the records of an exercise.
+
+        :param exercise_id: exercise id
+        :return: list of (kind, repetitions, value, date) ordered by kind and repetitions
+        """
+        self._cursor.execute("""--sql
+            SELECT kind, repetitions, value, date
+            FROM PersonalRecords
+            WHERE exercise_id = ?
+            ORDER BY kind, repetitions;
+        """, (exercise_id,))
+        return self._cursor.fetchall()
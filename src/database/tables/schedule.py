@@ -1,6 +1,7 @@
 import sqlite3
+from collections.abc import Callable
 from datetime import date
-from .table import Table
+from .table import DEFAULT_PAGE_SIZE, Table
 
 
 class ScheduleTable(Table):
@@ -8,11 +9,11 @@ class ScheduleTable(Table):
     `Schedule` table: workout plan/ordering for a given date.
     """
 
-    def __init__(self, cursor: sqlite3.Cursor) -> None:
+    def __init__(self, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
         """
         Initialize the `Schedule` table wrapper.
 
-        :param cursor: SQLite cursor
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
         """
         super().__init__('Schedule', cursor)
 
@@ -47,24 +48,98 @@ class ScheduleTable(Table):
         """, (workout_date, exercise_id, order_number))
         return self._cursor.lastrowid
 
-    def delete_schedule_by_date(self, workout_date: date) -> list[int]:
+    def add_schedule_records(self, records: list[tuple]) -> None:
+        """
+        Add many schedule records with explicit ids.
+
+        :param records: list of (id, date, exercise_id, order_number) tuples
+        """
+        self._cursor.executemany("""--sql
+            INSERT INTO Schedule (id, date, exercise_id, order_number)
+            VALUES (?, ?, ?, ?);
+        """, records)
+
+    def get_first_id_from_date(self, from_date: date) -> int | None:
+        """
+        Return id of the first schedule record on or after the given date.
+        """
+        self._cursor.execute("""--sql
+            SELECT id FROM Schedule
+            WHERE date >= ?
+            ORDER BY date, id
+            LIMIT 1;
+        """, (from_date,))
+        data = self._cursor.fetchone()
+        return data[0] if data else None
+
+    def get_date_page(self,
+                      from_date: date = None,
+                      after_id: int = None,
+                      before_id: int = None,
+                      limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Get a page of schedule records ordered by date, then id.
+        Records backfilled later still come in date order.
+
+        :param from_date: return records dated on or after this date, from the start if None
+        :param after_id: return records following the record with this id
+        :param before_id: return records preceding the record with this id
+        :param limit: maximal number of rows
+        :return: list of tuples
+        """
+        if before_id is not None:
+            self._cursor.execute("""--sql
+                SELECT * FROM Schedule
+                WHERE (date, id) < (SELECT date, id FROM Schedule WHERE id = ?)
+                ORDER BY date DESC, id DESC
+                LIMIT ?;
+            """, (before_id, limit))
+            return self._cursor.fetchall()[::-1]
+        if after_id is not None:
+            self._cursor.execute("""--sql
+                SELECT * FROM Schedule
+                WHERE (date, id) > (SELECT date, id FROM Schedule WHERE id = ?)
+                ORDER BY date, id
+                LIMIT ?;
+            """, (after_id, limit))
+        else:
+            self._cursor.execute("""--sql
+                SELECT * FROM Schedule
+                WHERE date >= ?
+                ORDER BY date, id
+                LIMIT ?;
+            """, (from_date or '', limit))
+        return self._cursor.fetchall()
+
+    def delete_schedule_by_date(self, workout_date: date) -> None:
         """
         Delete all schedule records for the given date.
 
         :param workout_date: date to delete records for
-        :return: list of deleted schedule ids
         """
-        self._cursor.execute("""
-            SELECT id FROM Schedule
+        self._cursor.execute("""--sql
+            DELETE FROM Schedule
             WHERE date = ?;
         """, (workout_date,))
-        deleted_ids = [row[0] for row in self._cursor.fetchall()]
 
+    def get_exercise_ids_between(self, start: date, end: date) -> list[int]:
+        """
+        Return ids of the exercises scheduled between the given dates inclusive.
+        """
+        self._cursor.execute("""--sql
+            SELECT DISTINCT exercise_id FROM Schedule
+            WHERE date BETWEEN ? AND ?;
+        """, (start, end))
+        return [row[0] for row in self._cursor.fetchall()]
+
+    def delete_schedule_between(self, start: date, end: date) -> None:
+        """
+        Delete all schedule records between the given dates inclusive.
+        """
         self._cursor.execute("""--sql
             DELETE FROM Schedule
-            WHERE date = ?;
-        """, (workout_date,))
-        return deleted_ids
+            WHERE date BETWEEN ? AND ?;
+        """, (start, end))
 
     def delete_schedule_by_exercise(self, exercise_id: int) -> None:
         """
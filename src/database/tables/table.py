@@ -1,5 +1,28 @@
 import sqlite3
 from abc import ABC, abstractmethod
+from datetime import date
+from collections.abc import Callable, Iterator
+
+
+# Rows fetched from SQLite at once by the iterating readers
+DEFAULT_CHUNK_SIZE = 500
+# Rows on one page of a table browser
+DEFAULT_PAGE_SIZE = 20
+
+
+def iter_rows(cursor: sqlite3.Cursor, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Lazily yield rows of an executed query, fetching them in chunks.
+    The cursor is closed once the rows are exhausted.
+
+    :param cursor: cursor with an executed query
+    :param chunk_size: number of rows fetched at once
+    """
+    try:
+        while rows := cursor.fetchmany(chunk_size):
+            yield from rows
+    finally:
+        cursor.close()
 
 
 class Table(ABC):
@@ -8,16 +31,25 @@ class Table(ABC):
     Defines common interface and typical operations.
     """
 
-    def __init__(self, table_name: str, cursor: sqlite3.Cursor) -> None:
+    def __init__(self, table_name: str, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
         """
         Initialize the table wrapper.
 
         :param table_name: table name
-        :param cursor: SQLite cursor
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
         """
-        self._cursor = cursor
+        self._cursor_source = cursor
         self.table_name = table_name
 
+    @property
+    def _cursor(self) -> sqlite3.Cursor:
+        """
+        Cursor to run the current operation on.
+        """
+        if callable(self._cursor_source):
+            return self._cursor_source()
+        return self._cursor_source
+
     @abstractmethod
     def create(self) -> None:
         """
@@ -48,6 +80,16 @@ class Table(ABC):
             WHERE id = ?;
         """, (id,))
 
+    def get_last_id(self) -> int:
+        """
+        Return the largest id ever issued for the table.
+
+        :return: last issued id or 0 if nothing was inserted yet
+        """
+        self._cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?;', (self.table_name,))
+        data = self._cursor.fetchone()
+        return data[0] if data else 0
+
     def get_all_data(self) -> list[tuple]:
         """
         Get all rows from the table.
@@ -57,6 +99,77 @@ class Table(ABC):
         self._cursor.execute(f'SELECT * FROM {self.table_name};')
         return self._cursor.fetchall()
 
+    def iter_all_data(self, chunk_size: int = DEFAULT_CHUNK_SIZE, cursor: sqlite3.Cursor = None) -> Iterator[tuple]:
+        """
+        Lazily iterate over all rows of the table.
+        The query runs immediately, rows are fetched in chunks while iterating.
+
+        :param chunk_size: number of rows fetched at once
+        :param cursor: dedicated cursor for the query, a new cursor of the table connection by default
+        :return: iterator of tuples
+        """
+        if cursor is None:
+            cursor = self._cursor.connection.cursor()
+        cursor.execute(f'SELECT * FROM {self.table_name};')
+        return iter_rows(cursor, chunk_size)
+
+    def get_page(self, after_id: int = None, limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Get a page of rows ordered by id (keyset pagination).
+
+        :param after_id: return rows with a greater id, from the start if None
+        :param limit: maximal number of rows
+        :return: list of tuples
+        """
+        self._cursor.execute(f"""
+            SELECT * FROM {self.table_name}
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?;
+        """, (after_id if after_id is not None else 0, limit))
+        return self._cursor.fetchall()
+
+    def get_page_before(self, before_id: int, limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Get the page of rows that precedes the given id, ordered by id.
+
+        :param before_id: return rows with a smaller id
+        :param limit: maximal number of rows
+        :return: list of tuples
+        """
+        self._cursor.execute(f"""
+            SELECT * FROM {self.table_name}
+            WHERE id < ?
+            ORDER BY id DESC
+            LIMIT ?;
+        """, (before_id, limit))
+        return self._cursor.fetchall()[::-1]
+
+    def get_first_id_from_date(self, from_date: date) -> int | None:
+        """
+        Return id of the first row dated on or after the given date.
+
+        :raises: ValueError if rows of the table have no date
+        """
+        raise ValueError(f'`{self.table_name}` rows have no date')
+
+    def get_date_page(self,
+                      from_date: date = None,
+                      after_id: int = None,
+                      before_id: int = None,
+                      limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Get a page of rows ordered by date, then id (keyset pagination by (date, id)).
+
+        :param from_date: return rows dated on or after this date, from the start if None
+        :param after_id: return rows following the row with this id
+        :param before_id: return rows preceding the row with this id
+        :param limit: maximal number of rows
+        :return: list of tuples
+        :raises: ValueError if rows of the table have no date
+        """
+        raise ValueError(f'`{self.table_name}` rows have no date')
+
     def print_all_data(self) -> None:
         """
         Print all rows of the table.
@@ -1,6 +1,25 @@
 import sqlite3
+from collections.abc import Callable, Iterator
+from itertools import repeat
 from datetime import date
-from .table import Table
+from .table import DEFAULT_PAGE_SIZE, Table
+
+
+# Validation rules, shared with the batch validator in `database.validation`
+WEIGHT_UNITS = ('kg', 'lbs')
+SPEED_UNITS = ('kph', 'mph')
+MIN_FEELING, MAX_FEELING = 1, 5
+
+KIND_ERROR = 'Either weight and repetitions (for exercises with machines or additional equipment) or time and speed (for cardio exercises) must be provided.'
+FEELING_ERROR = 'Feeling rating must be from 1 to 5'
+WEIGHT_UNITS_ERROR = "Units must be 'kg' or 'lbs' for weights exercises"
+SPEED_UNITS_ERROR = "Units must be 'kph' or 'mph' for cardio exercises"
+WEIGHT_COUNT_ERROR = 'The number of weights must be equal to the number of sets'
+REPETITION_COUNT_ERROR = 'The number of repetitions must be equal to the number of sets'
+CARDIO_LISTS_ERROR = 'Either all time and speed must be lists or none of them must be lists'
+TIME_COUNT_ERROR = 'The number of times must be equal to the number of sets'
+SPEED_COUNT_ERROR = 'The number of speeds must be equal to the number of sets'
+CARDIO_SETS_ERROR = 'For cardio exercises, if sets > 1, the record must contain information about each of them'
 
 
 class Workout:
@@ -8,6 +27,9 @@ class Workout:
     Model for a single workout execution of one exercise.
     """
 
+    __slots__ = ('schedule_id', 'sets', 'weight', 'repetitions', 'time', 'speed', 'units', 'feeling', 'local_order',
+                 '_weight_or_speed', '_is_list')
+
     def __init__(self, 
                  schedule_id: str, 
                  sets: int, 
@@ -37,32 +59,32 @@ class Workout:
         elif time is not None and speed is not None:
             self._weight_or_speed = 1
         else:
-            raise ValueError('Either weight and repetitions (for exercises with machines or additional equipment) or time and speed (for cardio exercises) must be provided.')
+            raise ValueError(KIND_ERROR)
             
-        if feeling is not None and not 1 <= feeling <= 5:
-            raise ValueError("Feeling rating must be from 1 to 5")
+        if feeling is not None and not MIN_FEELING <= feeling <= MAX_FEELING:
+            raise ValueError(FEELING_ERROR)
         if units is not None:
-            if self._weight_or_speed == 0 and units not in ['kg', 'lbs']:
-                raise ValueError("Units must be 'kg' or 'lbs' for weights exercises")
-            if self._weight_or_speed == 1 and units not in ['kph', 'mph']:
-                raise ValueError("Units must be 'kph' or 'mph' for cardio exercises")
+            if self._weight_or_speed == 0 and units not in WEIGHT_UNITS:
+                raise ValueError(WEIGHT_UNITS_ERROR)
+            if self._weight_or_speed == 1 and units not in SPEED_UNITS:
+                raise ValueError(SPEED_UNITS_ERROR)
 
         if self._weight_or_speed == 0:
             if isinstance(weight, list) and len(weight) != sets:
-                raise ValueError('The number of weights must be equal to the number of sets')
+                raise ValueError(WEIGHT_COUNT_ERROR)
             if isinstance(repetitions, list) and len(repetitions) != sets:
-                raise ValueError('The number of repetitions must be equal to the number of sets')
+                raise ValueError(REPETITION_COUNT_ERROR)
             time = None
             speed = None
         else:
             if isinstance(time, list) ^ isinstance(speed, list):
-                raise ValueError('Either all time and speed must be lists or none of them must be lists')
+                raise ValueError(CARDIO_LISTS_ERROR)
             if isinstance(time, list) and len(time) != sets:
-                raise ValueError('The number of times must be equal to the number of sets')
+                raise ValueError(TIME_COUNT_ERROR)
             if isinstance(speed, list) and len(speed) != sets:
-                raise ValueError('The number of speeds must be equal to the number of sets')
+                raise ValueError(SPEED_COUNT_ERROR)
             if not isinstance(time, list) and local_order == -1 and sets > 1:
-                raise ValueError('For cardio exercises, if sets > 1, the record must contain information about each of them')
+                raise ValueError(CARDIO_SETS_ERROR)
             weight = None
             repetitions = None
 
@@ -86,21 +108,53 @@ class Workout:
         """
         if not self._is_list:
             return [self]
-        
-        ans = []
-        for i in range(self.sets):
-            ans.append(Workout(
-                schedule_id=self.schedule_id, 
-                sets=self.sets, 
-                weight=self.weight[i] if self._weight_or_speed == 0 and isinstance(self.weight, list) else self.weight, 
-                repetitions=self.repetitions[i] if self._weight_or_speed == 0 and isinstance(self.repetitions, list) else self.repetitions, 
-                time=self.time[i] if self._weight_or_speed == 1 else self.time, 
-                speed=self.speed[i] if self._weight_or_speed == 1 else self.speed, 
-                units=self.units, 
-                feeling=self.feeling,
-                local_order=i
-            ))
-        return ans
+        return [self._single_set(i, *values) for i, values in enumerate(self._iter_set_values())]
+
+    def _iter_set_values(self) -> Iterator[tuple]:
+        """
+        Yield (weight, repetitions, time, speed) of every set of a workout with per-set values.
+        """
+        if self._weight_or_speed == 0:
+            weights = self.weight if isinstance(self.weight, list) else repeat(self.weight, self.sets)
+            repetitions = self.repetitions if isinstance(self.repetitions, list) else repeat(self.repetitions, self.sets)
+            return zip(weights, repetitions, repeat(None), repeat(None))
+        return zip(repeat(None), repeat(None), self.time, self.speed)
+
+    def _single_set(self, local_order: int, weight: float, repetitions: int, time: int, speed: float) -> 'Workout':
+        """
+        Return one set of this workout. The values were validated with the
+        whole workout, so the constructor is bypassed.
+        """
+        workout = Workout.__new__(Workout)
+        workout.schedule_id = self.schedule_id
+        workout.sets = self.sets
+        workout.weight = weight
+        workout.repetitions = repetitions
+        workout.time = time
+        workout.speed = speed
+        workout.units = self.units
+        workout.feeling = self.feeling
+        workout.local_order = local_order
+        workout._weight_or_speed = self._weight_or_speed
+        workout._is_list = False
+        return workout
+
+    def to_rows(self) -> list[tuple]:
+        """
+        Convert workout into `Workouts` table rows, one per stored set.
+        Rows are built straight from the per-set values, without intermediate workouts.
+
+        :return: list of (schedule_id, feeling, local_order, sets, weight,
+                 repetitions, time, speed, units) tuples
+        """
+        if not self._is_list:
+            return [(self.schedule_id, self.feeling, self.local_order, self.sets, self.weight,
+                     self.repetitions, self.time, self.speed, self.units)]
+        schedule_id, feeling, sets, units = self.schedule_id, self.feeling, self.sets, self.units
+        return [
+            (schedule_id, feeling, i, sets, weight, repetitions, time, speed, units)
+            for i, (weight, repetitions, time, speed) in enumerate(self._iter_set_values())
+        ]
 
     def __str__(self) -> str:
         """
@@ -125,11 +179,11 @@ class WorkoutsTable(Table):
     `Workouts` table: stores concrete workout executions.
     """
 
-    def __init__(self, cursor: sqlite3.Cursor) -> None:
+    def __init__(self, cursor: sqlite3.Cursor | Callable[[], sqlite3.Cursor]) -> None:
         """
         Initialize the `Workouts` table wrapper.
 
-        :param cursor: SQLite cursor
+        :param cursor: SQLite cursor or a callable returning the cursor for each operation
         """
         super().__init__('Workouts', cursor)
 
@@ -165,14 +219,86 @@ class WorkoutsTable(Table):
 
         :param workout: workout model
         """
-        for w in workout.convert2list():
+        # execute() rather than executemany() keeps lastrowid up to date
+        for row in workout.to_rows():
             self._cursor.execute("""--sql
                 INSERT INTO Workouts
                 (schedule_id, feeling, local_order, sets, weight, repetitions, time, speed, units)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-            """, (w.schedule_id, w.feeling, w.local_order, w.sets, w.weight, w.repetitions, w.time, w.speed, w.units))
+            """, row)
         return self._cursor.lastrowid
     
+    def add_workout_rows(self, rows: list[tuple]) -> None:
+        """
+        Add many prepared workout rows at once.
+
+        :param rows: list of (schedule_id, feeling, local_order, sets, weight,
+                     repetitions, time, speed, units) tuples
+        """
+        self._cursor.executemany("""--sql
+            INSERT INTO Workouts
+            (schedule_id, feeling, local_order, sets, weight, repetitions, time, speed, units)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, rows)
+
+    def get_first_id_from_date(self, from_date: date) -> int | None:
+        """
+        Return id of the first workout scheduled on or after the given date.
+        """
+        self._cursor.execute("""--sql
+            SELECT W.id
+            FROM Schedule S
+            JOIN Workouts W ON W.schedule_id = S.id
+            WHERE S.date >= ?
+            ORDER BY S.date, W.id
+            LIMIT 1;
+        """, (from_date,))
+        data = self._cursor.fetchone()
+        return data[0] if data else None
+
+    def get_date_page(self,
+                      from_date: date = None,
+                      after_id: int = None,
+                      before_id: int = None,
+                      limit: int = DEFAULT_PAGE_SIZE) -> list[tuple]:
+        """
+        Get a page of workouts ordered by the date of their schedule record, then id.
+        Workouts backfilled later still come in date order.
+
+        :param from_date: return workouts scheduled on or after this date, from the start if None
+        :param after_id: return workouts following the workout with this id
+        :param before_id: return workouts preceding the workout with this id
+        :param limit: maximal number of rows
+        :return: list of tuples
+        """
+        key = "(SELECT S.date, W.id FROM Workouts W JOIN Schedule S ON S.id = W.schedule_id WHERE W.id = ?)"
+        if before_id is not None:
+            self._cursor.execute(f"""--sql
+                SELECT W.* FROM Schedule S
+                JOIN Workouts W ON W.schedule_id = S.id
+                WHERE (S.date, W.id) < {key}
+                ORDER BY S.date DESC, W.id DESC
+                LIMIT ?;
+            """, (before_id, limit))
+            return self._cursor.fetchall()[::-1]
+        if after_id is not None:
+            self._cursor.execute(f"""--sql
+                SELECT W.* FROM Schedule S
+                JOIN Workouts W ON W.schedule_id = S.id
+                WHERE (S.date, W.id) > {key}
+                ORDER BY S.date, W.id
+                LIMIT ?;
+            """, (after_id, limit))
+        else:
+            self._cursor.execute("""--sql
+                SELECT W.* FROM Schedule S
+                JOIN Workouts W ON W.schedule_id = S.id
+                WHERE S.date >= ?
+                ORDER BY S.date, W.id
+                LIMIT ?;
+            """, (from_date or '', limit))
+        return self._cursor.fetchall()
+
     def delete_workouts_by_schedule(self, schedule_id: int) -> None:
         """
         Delete all workouts for the given schedule record id.
@@ -181,3 +307,21 @@ class WorkoutsTable(Table):
             DELETE FROM Workouts
             WHERE schedule_id = ?;
         """, (schedule_id,))
+
+    def delete_workouts_by_exercise(self, exercise_id: int) -> None:
+        """
+        Delete all workouts of the given exercise.
+        """
+        self._cursor.execute("""--sql
+            DELETE FROM Workouts
+            WHERE schedule_id IN (SELECT id FROM Schedule WHERE exercise_id = ?);
+        """, (exercise_id,))
+
+    def delete_workouts_between(self, start: date, end: date) -> None:
+        """
+        Delete all workouts scheduled between the given dates inclusive.
+        """
+        self._cursor.execute("""--sql
+            DELETE FROM Workouts
+            WHERE schedule_id IN (SELECT id FROM Schedule WHERE date BETWEEN ? AND ?);
+        """, (start, end))
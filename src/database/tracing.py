@@ -0,0 +1,228 @@
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from tabulate import tabulate
+
+
+# Calls kept per statement for the latency percentiles
+DEFAULT_SAMPLE_SIZE = 10000
+# Statements slower than this are written to the slow-query log, seconds
+DEFAULT_SLOW_THRESHOLD = 0.1
+# Entries kept in the slow-query log
+DEFAULT_SLOW_LOG_SIZE = 100
+
+_COMMENT = re.compile(r'--[^\n]*')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalize a statement so that calls differing only in literals and spacing match:
+    comments are dropped, literals become `?` and lists of placeholders become `(...)`.
+    """
+    sql = _COMMENT.sub(' ', sql)
+    sql = _LITERAL.sub('?', sql)
+    sql = _LIST.sub('(...)', sql)
+    return _SPACE.sub(' ', sql).strip().rstrip(';')
+
+
+def parameters_shape(parameters) -> str:
+    """
+    Describe bound parameters by their types only, e.g. `(str, int, NoneType)`.
+    """
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{name}: {type(value).__name__}' for name, value in parameters.items()) + '}'
+    return '(' + ', '.join(type(value).__name__ for value in parameters) + ')'
+
+
+class _Call:
+    """
+    One execution of a statement: time spent in execute and fetch calls and rows returned.
+    """
+
+    __slots__ = ('duration', 'rows', 'logged')
+
+    def __init__(self, duration: float) -> None:
+        self.duration = duration
+        self.rows = 0
+        self.logged = False
+
+
+class QueryTracer:
+    """
+    Collects per-statement call counts, latencies and returned rows,
+    and logs the statements slower than a threshold.
+    """
+
+    def __init__(self,
+                 slow_threshold: float = DEFAULT_SLOW_THRESHOLD,
+                 sample_size: int = DEFAULT_SAMPLE_SIZE,
+                 slow_log_size: int = DEFAULT_SLOW_LOG_SIZE) -> None:
+        """
+        :param slow_threshold: statements taking at least this many seconds go to the slow-query log
+        :param sample_size: latest calls kept per statement for percentiles
+        :param slow_log_size: latest slow statements kept
+        """
+        self.slow_threshold = slow_threshold
+        self._sample_size = sample_size
+        self._lock = threading.Lock()
+        # fingerprint -> [calls, latest calls]
+        self._statements: dict[str, list] = {}
+        # (time, fingerprint, seconds, parameters shape)
+        self.slow_log: deque[tuple[float, str, float, str]] = deque(maxlen=slow_log_size)
+
+    def start(self, sql: str, parameters, duration: float, many: bool = False) -> tuple[_Call, str, str]:
+        """
+        Record a finished execute call.
+
+        :return: the call with its fingerprint and parameters shape, to add fetch time later
+        """
+        key = fingerprint(sql)
+        parameters = list(parameters) if many else parameters
+        shape = parameters_shape(parameters[0] if many and parameters else parameters)
+        if many:
+            shape = f'{len(parameters)} x {shape}'
+        call = _Call(duration)
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                statement = self._statements[key] = [0, deque(maxlen=self._sample_size)]
+            statement[0] += 1
+            statement[1].append(call)
+        self.check_slow(call, key, shape)
+        return call, key, shape
+
+    def check_slow(self, call: _Call, key: str, shape: str) -> None:
+        """
+        Log the call once it has taken at least the slow threshold.
+        """
+        if not call.logged and call.duration >= self.slow_threshold:
+            call.logged = True
+            with self._lock:
+                self.slow_log.append((time.time(), key, call.duration, shape))
+
+    def summary(self) -> list[dict]:
+        """
+        Return statistics of every statement ordered by total time, slowest first.
+        Totals, percentiles and rows are over the latest `sample_size` calls.
+
+        :return: list of dicts with keys statement, calls, total, p50, p99, rows
+        """
+        with self._lock:
+            statements = [(key, calls, list(sample)) for key, (calls, sample) in self._statements.items()]
+        result = []
+        for key, calls, sample in statements:
+            durations = sorted(call.duration for call in sample)
+            result.append({
+                'statement': key,
+                'calls': calls,
+                'total': sum(durations),
+                'p50': durations[(len(durations) - 1) // 2],
+                'p99': durations[min(len(durations) - 1, int(len(durations) * 0.99))],
+                'rows': sum(call.rows for call in sample),
+            })
+        return sorted(result, key=lambda row: row['total'], reverse=True)
+
+    def report(self, limit: int = 20) -> str:
+        """
+        Format the slowest statements and the slow-query log as text tables.
+        """
+        rows = [
+            [row['statement'][:80], row['calls'], f'{row["total"] * 1000:.1f}', f'{row["p50"] * 1000:.3f}',
+             f'{row["p99"] * 1000:.3f}', row['rows']]
+            for row in self.summary()[:limit]
+        ]
+        text = tabulate(rows, headers=['statement', 'calls', 'total, ms', 'p50, ms', 'p99, ms', 'rows'])
+        with self._lock:
+            slow = list(self.slow_log)
+        if slow:
+            slow_rows = [[time.strftime('%H:%M:%S', time.localtime(at)), key[:80], f'{seconds * 1000:.1f}', shape]
+                         for at, key, seconds, shape in slow]
+            text += f'\n\nSlow queries (>= {self.slow_threshold * 1000:g} ms):\n'
+            text += tabulate(slow_rows, headers=['time', 'statement', 'ms', 'parameters'])
+        return text
+
+    def reset(self) -> None:
+        """
+        Forget all collected statistics.
+        """
+        with self._lock:
+            self._statements.clear()
+            self.slow_log.clear()
+
+
+class TracingCursor(sqlite3.Cursor):
+    """
+    Cursor reporting its statements, their duration and fetched rows to the connection's tracer.
+    """
+
+    _call = None
+
+    def execute(self, sql: str, parameters=(), /):
+        start = time.perf_counter()
+        result = super().execute(sql, parameters)
+        self._call, self._key, self._shape = self.connection.tracer.start(sql, parameters, time.perf_counter() - start)
+        return result
+
+    def executemany(self, sql: str, parameters, /):
+        parameters = list(parameters)
+        start = time.perf_counter()
+        result = super().executemany(sql, parameters)
+        self._call, self._key, self._shape = self.connection.tracer.start(sql, parameters, time.perf_counter() - start, many=True)
+        return result
+
+    def _fetched(self, start: float, rows: int) -> None:
+        """
+        Add a fetch call to the current statement.
+        """
+        if self._call is not None:
+            self._call.duration += time.perf_counter() - start
+            self._call.rows += rows
+            self.connection.tracer.check_slow(self._call, self._key, self._shape)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None)
+        return row
+
+    def fetchmany(self, size: int = None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        self._fetched(start, 1)
+        return row
+
+
+class TracingConnection(sqlite3.Connection):
+    """
+    Connection whose cursors are traced by `tracer`. Pass as `factory` to `sqlite3.connect`
+    and set `tracer` right after connecting.
+    """
+
+    tracer: QueryTracer = None
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    # The shortcuts of sqlite3.Connection create plain cursors
+    def execute(self, sql: str, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters, /):
+        return self.cursor().executemany(sql, parameters)
@@ -0,0 +1,80 @@
+from collections.abc import Mapping, Sequence
+import numpy as np
+from .tables.workouts import (
+    WEIGHT_UNITS, SPEED_UNITS, MIN_FEELING, MAX_FEELING,
+    KIND_ERROR, FEELING_ERROR, WEIGHT_UNITS_ERROR, SPEED_UNITS_ERROR, WEIGHT_COUNT_ERROR, REPETITION_COUNT_ERROR,
+    CARDIO_LISTS_ERROR, TIME_COUNT_ERROR, SPEED_COUNT_ERROR, CARDIO_SETS_ERROR,
+)
+
+
+# Columns of a batch, named as `Workout` arguments
+BATCH_COLUMNS = ('sets', 'weight', 'repetitions', 'time', 'speed', 'units', 'feeling', 'local_order')
+
+
+def _describe(column: Sequence | np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return which values of a column are missing and the length of every list value (-1 for scalars).
+    Numeric arrays are inspected without touching their items (NaN is missing).
+    """
+    if isinstance(column, np.ndarray) and column.dtype != object:
+        missing = np.isnan(column) if column.dtype.kind == 'f' else np.zeros(size, dtype=bool)
+        return missing, np.full(size, -1)
+    missing = np.fromiter((value is None for value in column), dtype=bool, count=size)
+    lengths = np.fromiter((len(value) if isinstance(value, list) else -1 for value in column), dtype=np.int64, count=size)
+    return missing, lengths
+
+
+def _numbers(column: Sequence | np.ndarray) -> np.ndarray:
+    """
+    Return a numeric column as floats, None becomes NaN.
+    """
+    return np.asarray(column, dtype=np.float64)
+
+
+def validate_batch(batch: Mapping[str, Sequence | np.ndarray]) -> tuple[np.ndarray, list[str | None]]:
+    """
+    Validate a column-oriented batch of workout records with the rules of `Workout`.
+
+    Every column of `BATCH_COLUMNS` is a sequence or a NumPy array with one value per record;
+    `sets` is required, other missing columns are all None (`local_order` defaults to -1).
+    Values of `weight`, `repetitions`, `time` and `speed` may be lists, as for `Workout`.
+
+    :param batch: mapping of column name to values
+    :return: mask of invalid records and the error message of every record (None if valid),
+             the same message `Workout` would raise
+    """
+    size = len(batch['sets'])
+    sets = _numbers(batch['sets'])
+    none = [None] * size
+    weight_missing, weight_lengths = _describe(batch.get('weight', none), size)
+    repetitions_missing, repetitions_lengths = _describe(batch.get('repetitions', none), size)
+    time_missing, time_lengths = _describe(batch.get('time', none), size)
+    speed_missing, speed_lengths = _describe(batch.get('speed', none), size)
+    units_missing, _ = _describe(batch.get('units', none), size)
+    units = np.asarray(batch.get('units', none), dtype=object)
+    feeling = _numbers(batch.get('feeling', none))
+    local_order = _numbers(batch['local_order']) if 'local_order' in batch else np.full(size, -1.0)
+
+    strength = ~weight_missing & ~repetitions_missing
+    cardio = ~strength & ~time_missing & ~speed_missing
+    time_is_list, speed_is_list = time_lengths >= 0, speed_lengths >= 0
+
+    # In the order `Workout` checks them: the first failed rule gives the message
+    rules = [
+        (~strength & ~cardio, KIND_ERROR),
+        (~np.isnan(feeling) & ((feeling < MIN_FEELING) | (feeling > MAX_FEELING)), FEELING_ERROR),
+        (strength & ~units_missing & ~np.isin(units, WEIGHT_UNITS), WEIGHT_UNITS_ERROR),
+        (cardio & ~units_missing & ~np.isin(units, SPEED_UNITS), SPEED_UNITS_ERROR),
+        (strength & (weight_lengths >= 0) & (weight_lengths != sets), WEIGHT_COUNT_ERROR),
+        (strength & (repetitions_lengths >= 0) & (repetitions_lengths != sets), REPETITION_COUNT_ERROR),
+        (cardio & (time_is_list ^ speed_is_list), CARDIO_LISTS_ERROR),
+        (cardio & time_is_list & (time_lengths != sets), TIME_COUNT_ERROR),
+        (cardio & speed_is_list & (speed_lengths != sets), SPEED_COUNT_ERROR),
+        (cardio & ~time_is_list & (local_order == -1) & (sets > 1), CARDIO_SETS_ERROR),
+    ]
+    errors = np.full(size, None, dtype=object)
+    invalid = np.zeros(size, dtype=bool)
+    for mask, message in reversed(rules):
+        errors[mask] = message
+        invalid |= mask
+    return invalid, errors.tolist()
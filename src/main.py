@@ -1,4 +1,10 @@
+import argparse
+from contextlib import closing
 from database.database import Database
+from database.importer import DEFAULT_CHUNK_SIZE, import_file
+from database.profiles import DEFAULT_PROFILE, PROFILES
+from database.sharding import ShardedDatabase
+from database.tracing import DEFAULT_SLOW_THRESHOLD, QueryTracer
 from menu import Interface
 
 
@@ -6,10 +12,53 @@ def main() -> None:
     """
     Application entrypoint: initialize DB, run the interactive menu, close DB.
     """
-    db = Database('src/database/gym_tracker.db')
+    parser = argparse.ArgumentParser(description='Gym workouts tracker')
+    parser.add_argument('--profile', choices=PROFILES, default=DEFAULT_PROFILE, help='SQLite connection profile')
+    parser.add_argument('--rebuild-stats', action='store_true', help='recompute daily exercise statistics and exit')
+    parser.add_argument('--trace', action='store_true', help='collect SQL statistics and print them at exit')
+    parser.add_argument('--slow-query-ms', type=float, default=DEFAULT_SLOW_THRESHOLD * 1000, help='slow-query log threshold')
+    parser.add_argument('--import', dest='import_file', metavar='FILE', help='import workouts from a CSV or JSONL file and exit')
+    parser.add_argument('--import-chunk', type=int, default=DEFAULT_CHUNK_SIZE, help='records written per transaction while importing')
+    parser.add_argument('--restart-import', action='store_true', help='import the file from the start, ignoring the checkpoint')
+    parser.add_argument('--user', help='work with the database of this gym member instead of the shared one')
+    parser.add_argument('--users-dir', default='src/database/users', help='directory of the members\' databases')
+    args = parser.parse_args()
+
+    tracer = QueryTracer(args.slow_query_ms / 1000) if args.trace else None
+    if args.user is None:
+        with closing(Database('src/database/gym_tracker.db', args.profile, tracer=tracer)) as db:
+            run(db, args, tracer)
+    else:
+        with ShardedDatabase(args.users_dir, args.profile, max_open=1, tracer=tracer) as shards:
+            with shards.shard(args.user) as db:
+                run(db, args, tracer)
+
+
+def print_import_progress(offset: int, total: int, imported: int, rejected: int) -> None:
+    """
+    Print import progress on one line.
+    """
+    print(f'\rИмпортировано: {imported}, отклонено: {rejected}, {offset / max(total, 1):.1%}', end='', flush=True)
+
+
+def run(db: Database, args: argparse.Namespace, tracer: QueryTracer | None) -> None:
+    """
+    Rebuild the statistics, import a file or run the interactive menu on an open database.
+    """
+    if args.rebuild_stats:
+        db.rebuild_daily_stats()
+        return
+    if args.import_file is not None:
+        imported, rejected, errors = import_file(db, args.import_file, chunk_size=args.import_chunk,
+                                                 restart=args.restart_import, progress=print_import_progress)
+        print(f'\nИмпортировано: {imported}, отклонено: {rejected}')
+        for line, message in errors:
+            print(f'Строка {line}: {message}')
+        return
     ui = Interface(db)
     ui.run_main_menu()
-    db.close()
+    if tracer is not None:
+        print(db.stats())
 
 
 if __name__ == '__main__':
@@ -1,4 +1,7 @@
+import sqlite3
+from collections.abc import Iterable
 from datetime import date, datetime
+from itertools import islice
 from database.database import Database
 from tabulate import tabulate
 from input import parse_input
@@ -42,9 +45,9 @@ class Interface:
             ['Treadmill', 'Дорожка', 'Legs'],
             ['Barbell Curl', 'Бицепс', 'Arms (Biceps)'],
         ]
-        for name, alias, target_muscle_group in test_set:
-            self.db.add_exercise(name, alias, target_muscle_group)
-        self.db.commit()
+        with self.db.transaction():
+            for name, alias, target_muscle_group in test_set:
+                self.db.add_exercise(name, alias, target_muscle_group)
 
     def add_exercise(self) -> None:
         """
@@ -79,6 +82,16 @@ class Interface:
         print(f"\nВводим тренировки на {workout_date}")
         print("Доступные упражнения:", ", ".join([f'{i[1]} ({i[2]})' for i in self.db.get_all_exercises()]))
         
+        with self.db.transaction():
+            self._add_workout_day_exercises(workout_date)
+        print("Тренировочный день завершен.")
+
+    def _add_workout_day_exercises(self, workout_date: date) -> None:
+        """
+        Ask exercises of a workout day one by one until the user enters 'exit'.
+
+        :param workout_date: date of the workout day
+        """
         order_number = 0
         while True:
             print("\n" + "-" * 40)
@@ -139,24 +152,25 @@ class Interface:
                 continue
                 
             # Добавляем тренировку
-            self.db.add_workout(
-                workout_date=workout_date,
-                exercise_name=exercise_name,
-                order_number=order_number,
-                sets=sets,
-                weight=weight,
-                repetitions=repetitions,
-                time=time,
-                speed=speed,
-                units=units,
-                feeling=feeling
-            )
+            try:
+                self.db.add_workout(
+                    workout_date=workout_date,
+                    exercise_name=exercise_name,
+                    order_number=order_number,
+                    sets=sets,
+                    weight=weight,
+                    repetitions=repetitions,
+                    time=time,
+                    speed=speed,
+                    units=units,
+                    feeling=feeling
+                )
+            except (ValueError, sqlite3.IntegrityError) as e:
+                print(f"Ошибка: {e}")
+                continue
             print(f"Тренировка '{exercise_name}' успешно добавлена.")
             
             order_number += 1
-            
-        self.db.commit()
-        print("Тренировочный день завершен.")
 
     def add_single_exercise(self) -> None:
         """
@@ -242,7 +256,6 @@ class Interface:
             units=units,
             feeling=feeling
         )
-        self.db.commit()
         print(f"Тренировка '{exercise_name}' успешно добавлена.")
 
     def delete_exercise_interactive(self) -> None:
@@ -376,9 +389,10 @@ class Interface:
             print("7. Показать все тренировки")
             print("8. Построить график прогресса")
             print("9. Управление удалением данных")
+            print("10. Статистика SQL-запросов")
             print("0. Выход")
 
-            choice = input("\nВыберите действие (0-9): ").strip()
+            choice = input("\nВыберите действие (0-10): ").strip()
 
             if choice == '0':
                 print("До свидания!")
@@ -392,15 +406,17 @@ class Interface:
             elif choice == '4':
                 self.find_workout()
             elif choice == '5':
-                self.show_table_data(self.db.get_all_exercises())
+                self.browse_table('Exercises')
             elif choice == '6':
-                self.show_table_data(self.db.get_all_schedule())
+                self.browse_table('Schedule')
             elif choice == '7':
-                self.show_table_data(self.db.get_all_workouts())
+                self.browse_table('Workouts')
             elif choice == '8':
                 self.plot_progress()
             elif choice == '9':
                 self.run_delete_menu()
+            elif choice == '10':
+                print(self.db.stats())
             else:
                 print("Неверный выбор. Попробуйте снова.")
 
@@ -455,11 +471,63 @@ class Interface:
             return
         self.show_table_data(workouts)
 
-    def show_table_data(self, data) -> None:
+    def show_table_data(self, data: Iterable[tuple], chunk_size: int = 100) -> None:
+        """
+        Print the table. Rows are consumed lazily and printed `chunk_size` rows at a time.
+        """
+        headers = self.db.get_columns()
+        rows = iter(data)
+        chunk = list(islice(rows, chunk_size))
+        print(tabulate(chunk, headers=headers, tablefmt="grid"))
+        while chunk := list(islice(rows, chunk_size)):
+            print(tabulate(chunk, headers=headers, tablefmt="grid"))
+
+    def browse_table(self, table_name: str, page_size: int = 20) -> None:
         """
-        Print the table.
+        Page through a table: next/previous page and jump to a date.
+
+        :param table_name: `Exercises`, `Schedule` or `Workouts`
+        :param page_size: rows per page
         """
-        print(tabulate(data, headers=self.db.get_columns(), tablefmt="grid"))
+        page = self.db.get_page(table_name, limit=page_size)
+        if not page:
+            print("Таблица пуста.")
+            return
+        # После перехода к дате листаем по (дата, id): дозаписанная история идёт не по порядку id
+        get_page = self.db.get_page
+        while True:
+            self.show_table_data(page)
+            choice = input("\nn - следующая страница, p - предыдущая, d - перейти к дате, 0 - назад: ").strip().lower()
+            if choice == '0':
+                break
+            elif choice == 'n':
+                next_page = get_page(table_name, after_id=page[-1][0], limit=page_size)
+                if next_page:
+                    page = next_page
+                else:
+                    print("Это последняя страница.")
+            elif choice == 'p':
+                previous_page = get_page(table_name, before_id=page[0][0], limit=page_size)
+                if previous_page:
+                    page = previous_page
+                else:
+                    print("Это первая страница.")
+            elif choice == 'd':
+                try:
+                    from_date = parse_input('date', 'Enter date')
+                    if from_date is None:
+                        continue
+                    date_page = self.db.get_date_page(table_name, from_date, limit=page_size)
+                except ValueError as e:
+                    print(f"Ошибка: {e}")
+                    continue
+                if not date_page:
+                    print(f"Нет записей начиная с {from_date}.")
+                else:
+                    page = date_page
+                    get_page = self.db.get_date_page
+            else:
+                print("Неверный выбор. Попробуйте снова.")
 
     def plot_progress(self) -> None:
         """
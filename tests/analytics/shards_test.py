@@ -0,0 +1,52 @@
+import os
+import pytest
+import sqlite3
+from datetime import date
+from src.analytics import shards
+from src.database.sharding import ShardedDatabase
+
+
+@pytest.fixture
+def paths(tmp_path):
+    with ShardedDatabase(str(tmp_path)) as db:
+        for user_id in [1, 2, 3]:
+            db.add_exercise(user_id, 'Bench', target_muscle_group='chest')
+            db.add_exercise(user_id, 'Squat', target_muscle_group='legs')
+            db.add_exercise(user_id, 'Run')
+        db.add_workout(1, date(2025, 3, 24), 'Bench', 1, 3, 50, 10, units='kg')
+        db.add_workout(1, date(2025, 3, 24), 'Run', 2, 1, time=600, speed=10, units='kph')
+        db.add_workout(2, date(2025, 3, 24), 'Squat', 1, 2, [100, 80], [5, 8], units='kg')
+        db.add_workout(2, date(2025, 4, 7), 'Bench', 1, 1, 100, 10, units='lbs')
+        db.add_workout(3, date(2025, 1, 6), 'Squat', 1, 1, 60, 5, units='kg')
+        yield db.shard_files()
+
+
+def write_something(connection: sqlite3.Connection) -> None:
+    connection.execute("INSERT INTO Exercises (name) VALUES ('X');")
+
+
+class TestShards:
+    def test_tonnage_by_muscle_group(self, paths):
+        tonnage = shards.tonnage_by_muscle_group(paths, workers=2)
+        assert tonnage.keys() == {'chest', 'legs'}
+        assert tonnage['chest'] == pytest.approx(1500 + 1000 * 0.45359237)
+        assert tonnage['legs'] == pytest.approx(500 + 640 + 300)
+        assert shards.tonnage_by_muscle_group(paths, start=date(2025, 3, 1), end=date(2025, 3, 31)) == {'chest': 1500, 'legs': 1140}
+
+    def test_active_members(self, paths):
+        assert shards.active_members(paths, date(2025, 3, 1)) == (2, 3)
+        assert shards.active_members(paths, date(2025, 4, 1), workers=1) == (1, 3)
+        assert shards.active_members([], date(2025, 4, 1)) == (0, 0)
+
+    def test_busiest_days(self, paths):
+        assert shards.busiest_days(paths) == [(date(2025, 3, 24), 2), (date(2025, 1, 6), 1), (date(2025, 4, 7), 1)]
+        assert shards.busiest_days(paths, limit=1, start=date(2025, 4, 1)) == [(date(2025, 4, 7), 1)]
+
+    def test_read_only(self, paths, tmp_path):
+        modified = [os.path.getmtime(path) for path in paths]
+        with pytest.raises(sqlite3.OperationalError):
+            shards.map_reduce(paths, write_something, list)
+        with pytest.raises(sqlite3.OperationalError):
+            shards.map_reduce([str(tmp_path / 'missing.db')], shards.shard_training_days)
+        assert not os.path.exists(tmp_path / 'missing.db')
+        assert [os.path.getmtime(path) for path in paths] == modified
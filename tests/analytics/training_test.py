@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from datetime import date
+from src.analytics import training
+from src.database.columns import UNIT_CODES, WORKOUT_DTYPE
+from src.database.database import Database
+
+
+@pytest.fixture
+def columns(tmp_path):
+    db = Database(str(tmp_path / 'gym.db'))
+    db.add_exercise('Bench', target_muscle_group='chest')
+    db.add_exercise('Squat', target_muscle_group='legs')
+    db.add_exercise('Run')
+    # Monday, Wednesday of the same week and the Monday of the next month
+    db.add_workout(date(2025, 3, 24), 'Bench', 1, 3, 50, 10, units='kg', feeling=2)
+    db.add_workout(date(2025, 3, 24), 'Squat', 2, 2, [100, 80], [5, 8], units='kg', feeling=4)
+    db.add_workout(date(2025, 3, 26), 'Bench', 1, 2, 60, [8, 6], units='kg', feeling=3)
+    db.add_workout(date(2025, 3, 26), 'Run', 2, 1, time=600, speed=10, units='kph', feeling=5)
+    db.add_workout(date(2025, 4, 7), 'Squat', 1, 1, 120, 3, units='kg')
+    yield db.to_columns()
+    db.close()
+
+
+class TestTraining:
+    def test_period_starts(self):
+        ordinals = [date(2025, 3, day).toordinal() for day in [23, 24, 30, 31]]
+        assert training.period_starts(ordinals, 'week').tolist() == [date(2025, 3, 17), date(2025, 3, 24), date(2025, 3, 24), date(2025, 3, 31)]
+        assert training.period_starts(ordinals, 'month').tolist() == [date(2025, 3, 1)] * 4
+        with pytest.raises(ValueError):
+            training.period_starts(ordinals, 'year')
+
+    def test_tonnage(self, columns):
+        starts, exercise_ids, tonnage = training.tonnage(columns, 'week')
+        assert starts.tolist() == [date(2025, 3, 24)] * 3 + [date(2025, 4, 7)]
+        assert exercise_ids.tolist() == [1, 2, 3, 2]
+        assert tonnage.tolist() == [1500 + 840, 1140, 0, 360]
+
+        starts, groups, tonnage = training.tonnage_by_muscle_group(columns, {1: 'chest', 2: 'legs', 3: None}, 'month')
+        assert starts.tolist() == [date(2025, 3, 1)] * 3 + [date(2025, 4, 1)]
+        assert groups.tolist() == ['', 'chest', 'legs', 'legs']
+        assert tonnage.tolist() == [0, 2340, 1140, 360]
+
+    def test_mixed_units(self, tmp_path):
+        assert training.LBS_CODE == UNIT_CODES['lbs']
+        db = Database(str(tmp_path / 'gym.db'))
+        db.add_exercise('Bench')
+        db.add_workout(date(2025, 3, 24), 'Bench', 1, 2, 50, 10, units='kg')
+        db.add_workout(date(2025, 3, 26), 'Bench', 1, 1, 100, 10, units='lbs')
+        columns = db.to_columns()
+        db.close()
+        assert training.volumes(columns).tolist() == pytest.approx([1000, 1000 * training.LBS_TO_KG])
+        assert training.tonnage(columns)[2].tolist() == pytest.approx([1000 + 1000 * training.LBS_TO_KG])
+
+    def test_frequency_and_distributions(self, columns):
+        starts, counts = training.session_frequency(columns, 'week')
+        assert starts.tolist() == [date(2025, 3, 24), date(2025, 4, 7)]
+        assert counts.tolist() == [2, 1]
+        assert training.set_distribution(columns).tolist() == [0, 2, 2, 1]
+        distribution = training.rep_distribution(columns)
+        assert {n: int(count) for n, count in enumerate(distribution) if count} == {3: 1, 5: 1, 6: 1, 8: 2, 10: 3}
+
+    def test_feeling_load_correlation(self, columns):
+        # Feelings 2, 4, 3, 5 against tonnage 1500, 1140, 840, 0
+        expected = np.corrcoef([2, 4, 3, 5], [1500, 1140, 840, 0])[0, 1]
+        assert training.feeling_load_correlation(columns) == pytest.approx(expected)
+        assert np.isnan(training.feeling_load_correlation(columns[:1]))
+
+    def test_empty(self):
+        columns = np.zeros(0, dtype=WORKOUT_DTYPE)
+        assert [len(result) for result in training.tonnage(columns)] == [0, 0, 0]
+        assert [len(result) for result in training.tonnage_by_muscle_group(columns, {})] == [0, 0, 0]
+        assert len(training.set_distribution(columns)) == 0
+        assert np.isnan(training.feeling_load_correlation(columns))
@@ -0,0 +1,39 @@
+import pytest
+import sqlite3
+from benchmarks.packed_workouts import PackedWorkoutsTable
+from src.database.tables.workouts import Workout
+
+
+@pytest.fixture
+def db_cursor():
+    connection = sqlite3.connect(':memory:')
+    cursor = connection.cursor()
+    PackedWorkoutsTable(cursor).create()
+    yield cursor
+    connection.close()
+
+
+class TestPackedWorkouts:
+    workouts = [
+        Workout(schedule_id=1, sets=3, weight=45, repetitions=10, units='kg', feeling=3),
+        Workout(schedule_id=2, sets=3, weight=[40, 45, 50.5], repetitions=10, units='kg'),
+        Workout(schedule_id=3, sets=2, weight=[60, 70], repetitions=[8, 6], units='lbs', feeling=5),
+        Workout(schedule_id=4, sets=1, weight=[100], repetitions=[1]),
+        Workout(schedule_id=5, sets=1, time=600, speed=8.5, units='kph'),
+        Workout(schedule_id=6, sets=2, time=[600, 300], speed=[8.5, 12], units='mph', feeling=2),
+    ]
+
+    def test_encode_decode(self):
+        for workout in self.workouts:
+            assert PackedWorkoutsTable.decode(PackedWorkoutsTable.encode(workout)).to_rows() == workout.to_rows()
+
+    def test_add_and_read(self, db_cursor):
+        table = PackedWorkoutsTable(db_cursor)
+        table.add_workouts(self.workouts[:-1])
+        table.add_workout(self.workouts[-1])
+
+        assert table.get_workout(3).to_rows() == self.workouts[2].to_rows()
+        assert table.get_workout(7) is None
+        assert list(table.iter_set_rows()) == [row for workout in self.workouts for row in workout.to_rows()]
+        with pytest.raises(sqlite3.IntegrityError):
+            table.add_workout(self.workouts[0])
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+import threading
+from datetime import date
+from src.database.async_database import AsyncDatabase
+from src.database.database import Database
+
+
+class TestAsyncDatabase:
+    ws1 = {
+        'workout_date': '2025-03-27', 'exercise_name': 'A', 'order_number': 1, 'feeling': 3,
+        'sets': 3, 'weight': 45, 'repetitions': 10, 'units': 'kg',
+    }
+
+    @pytest.mark.parametrize('readers', [0, 2])
+    def test_api(self, tmp_path, readers):
+        async def run():
+            async with AsyncDatabase(str(tmp_path / 'gym.db'), readers=readers) as db:
+                await db.add_exercise('A', 'a')
+                await asyncio.gather(*[
+                    db.add_workout(**{**self.ws1, 'workout_date': f'2025-03-{day:02d}'}) for day in range(1, 11)
+                ])
+                dates, workouts, missing = await asyncio.gather(
+                    db.get_all_dates(),
+                    db.find_workout('2025-03-05', 'A'),
+                    db.get_exercise_id('B'),
+                )
+                assert dates == [date(2025, 3, day) for day in range(1, 11)]
+                assert len(workouts) == 1
+                assert missing is None
+                with pytest.raises(ValueError):
+                    await db.find_workout('2025-03-05', 'B')
+
+                await db.delete_workouts_between('2025-03-01', '2025-03-08')
+                await db.delete_workout('2025-03-09', 'a')
+                assert await db.get_all_dates() == [date(2025, 3, 10)]
+
+        asyncio.run(run())
+
+    def test_positional_sets(self, tmp_path):
+        async def run():
+            async with AsyncDatabase(str(tmp_path / 'gym.db')) as db:
+                await db.add_exercise('A')
+                await db.add_workout('2025-03-01', 'A', 1, 2, [40, 45], [10, 8], None, None, 'kg', 3)
+                assert [row[8:10] for row in await db.find_workout('2025-03-01', 'A')] == [(40.0, 10), (45.0, 8)]
+
+        asyncio.run(run())
+
+    def test_failed_open(self, tmp_path):
+        async def run():
+            db = AsyncDatabase(str(tmp_path / 'gym.db'), profile='bogus')
+            with pytest.raises(ValueError):
+                await asyncio.wait_for(asyncio.gather(db.get_all_dates(), db.get_exercise_id('A')), 5)
+            with pytest.raises(ValueError):
+                await asyncio.wait_for(db.add_exercise('A'), 5)
+            await db.close()
+
+        asyncio.run(run())
+
+    def test_thread_affinity(self, tmp_path, monkeypatch):
+        threads = set()
+        find_workout = Database.find_workout
+        add_workout = Database.add_workout
+
+        def record_find_workout(self, *args):
+            threads.add(threading.get_ident())
+            return find_workout(self, *args)
+
+        def record_add_workout(self, *args, **kwargs):
+            threads.add(threading.get_ident())
+            return add_workout(self, *args, **kwargs)
+
+        monkeypatch.setattr(Database, 'find_workout', record_find_workout)
+        monkeypatch.setattr(Database, 'add_workout', record_add_workout)
+
+        async def run():
+            async with AsyncDatabase(str(tmp_path / 'gym.db')) as db:
+                await db.add_exercise('A')
+                await asyncio.gather(*[
+                    db.add_workout(**{**self.ws1, 'workout_date': f'2025-03-{day:02d}'}) for day in range(1, 6)
+                ])
+                await asyncio.gather(*[db.find_workout(f'2025-03-{day:02d}', 'A') for day in range(1, 6)])
+
+        asyncio.run(run())
+        assert len(threads) == 1 and threading.get_ident() not in threads
+
+    def test_batched_reads(self, tmp_path, monkeypatch):
+        batches = []
+        run_reads = AsyncDatabase._run_reads
+
+        def record_run_reads(self, loop, batch):
+            batches.append(len(batch))
+            run_reads(self, loop, batch)
+
+        monkeypatch.setattr(AsyncDatabase, '_run_reads', record_run_reads)
+
+        async def run():
+            async with AsyncDatabase(str(tmp_path / 'gym.db')) as db:
+                await db.add_exercise('A')
+                await asyncio.gather(*[db.get_exercise_id('A') for _ in range(10)])
+
+        asyncio.run(run())
+        assert batches == [10]
+
+    def test_write_backpressure(self, tmp_path):
+        async def run():
+            async with AsyncDatabase(str(tmp_path / 'gym.db'), max_pending_writes=2) as db:
+                await db.add_exercise('A')
+                writes = [
+                    asyncio.create_task(db.add_workout(**{**self.ws1, 'workout_date': f'2025-03-{day:02d}'}))
+                    for day in range(1, 6)
+                ]
+                await asyncio.sleep(0)
+                # Two writes hold the slots, the rest wait without reaching the writer thread
+                assert db._write_slots.locked()
+                await asyncio.gather(*writes)
+                assert len(await db.get_all_dates()) == 5
+
+        asyncio.run(run())
@@ -0,0 +1,73 @@
+import os
+import numpy as np
+from datetime import date
+from src.database.columns import UNIT_CODES, WORKOUT_DTYPE
+from src.database.database import Database
+
+
+class TestColumns:
+    ws1 = {
+        'workout_date': '2025-03-27', 'exercise_name': 'A', 'order_number': 1, 'feeling': 3,
+        'sets': 3, 'weight': 45, 'repetitions': 10, 'units': 'kg',
+    }
+
+    def fill(self, db: Database) -> None:
+        db.add_exercise('A', 'a')
+        db.add_exercise('T')
+        db.add_workout(**self.ws1)
+        db.add_workout(**{**self.ws1, 'workout_date': '2025-03-29', 'sets': 2, 'weight': [40, 50], 'repetitions': [10, 8], 'feeling': None})
+        db.add_workout(workout_date='2025-03-28', exercise_name='T', order_number=1, sets=1, time=600, speed=8.5, units='kph')
+
+    def test_to_columns(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'))
+        self.fill(db)
+
+        columns = db.to_columns()
+        assert columns.dtype == WORKOUT_DTYPE
+        assert columns['date'].tolist() == [date(2025, 3, day).toordinal() for day in [27, 28, 29, 29]]
+        assert columns['exercise_id'].tolist() == [1, 2, 1, 1]
+        assert columns['sets'].tolist() == [3, 1, 1, 1]
+        assert columns['repetitions'].tolist() == [10, 0, 10, 8]
+        assert columns['time'].tolist() == [0, 600, 0, 0]
+        assert columns['units'].tolist() == [UNIT_CODES['kg'], UNIT_CODES['kph'], UNIT_CODES['kg'], UNIT_CODES['kg']]
+        assert columns['feeling'].tolist() == [3, 0, 0, 0]
+        assert np.isnan(columns['weight'][1]) and np.isnan(columns['speed'][0])
+        assert (columns['sets'] * columns['repetitions'] * np.nan_to_num(columns['weight'])).sum() == 3 * 450 + 400 + 400
+
+        assert db.to_columns('a', start=date(2025, 3, 28))['weight'].tolist() == [40.0, 50.0]
+        assert len(db.to_columns('T', end=date(2025, 3, 27))) == 0
+        db.close()
+
+    def test_cache(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'))
+        self.fill(db)
+
+        columns = db.to_columns(cache_dir=str(tmp_path))
+        cached = db.to_columns(cache_dir=str(tmp_path))
+        assert isinstance(cached, np.memmap)
+        for field in WORKOUT_DTYPE.names:
+            assert np.array_equal(cached[field], columns[field], equal_nan=True)
+
+        db.delete_workout('2025-03-28', 'T')
+        assert len(db.to_columns(cache_dir=str(tmp_path))) == 3
+        db.add_workout(workout_date='2025-03-28', exercise_name='T', order_number=1, sets=1, time=600, speed=8.5)
+        assert len(db.to_columns(cache_dir=str(tmp_path))) == 4
+        db.close()
+
+    def test_cache_recreate(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        os.mkdir(cache_dir)
+        db = Database(str(tmp_path / 'gym.db'))
+        for weight in [50, 100]:
+            db.create()
+            db.add_exercise('A')
+            db.add_workout('2025-03-01', 'A', 1, 1, weight, 10, units='kg')
+            assert db.to_columns('A', cache_dir=cache_dir)['weight'].tolist() == [weight]
+        db.close()
+
+        # Another file with the same history does not share the cache
+        other = Database(str(tmp_path / 'other.db'))
+        other.add_exercise('A')
+        other.add_workout('2025-03-01', 'A', 1, 1, 70, 10, units='kg')
+        assert other.to_columns('A', cache_dir=cache_dir)['weight'].tolist() == [70]
+        other.close()
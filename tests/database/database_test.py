@@ -1,5 +1,8 @@
+import os
 import pytest
 import sqlite3
+import threading
+from datetime import date
 from src.database.database import Database
 
 
@@ -176,5 +179,433 @@ class TestDatabase:
         
         db.close()
 
-    
+    def test_add_workouts_bulk(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A', 'a')
+        db.add_exercise('B')
+
+        errors = db.add_workouts_bulk([
+            self.ws1,
+            {**self.ws2, 'exercise_name': 'C'},
+            {**self.ws2, 'exercise_name': 'b', 'feeling': 7},
+            {**self.ws2, 'sets': 2, 'weight': [40, 45], 'repetitions': [12, 10]},
+            {**self.ws1, 'workout_date': '2025-03-28', 'exercise_name': 'a'},
+            {'workout_date': '2025-03-29', 'exercise_name': 'A'},
+        ])
+        assert [index for index, _ in errors] == [1, 2, 5]
+        assert db.get_all_schedule() == [(1, '2025-03-27', 1, 1), (2, '2025-03-27', 2, 2), (3, '2025-03-28', 1, 1)]
+        assert db.get_all_workouts() == [(1, 1, 3, -1, 3, 45.0, 10, None, None, 'kg'),
+                                         (2, 2, 3, 0, 2, 40.0, 12, None, None, 'kg'),
+                                         (3, 2, 3, 1, 2, 45.0, 10, None, None, 'kg'),
+                                         (4, 3, 3, -1, 3, 45.0, 10, None, None, 'kg')]
+
+        errors = db.add_workouts_bulk([
+            {**self.ws1, 'workout_date': '2025-04-01'},
+            self.ws1,
+            {**self.ws2, 'workout_date': '2025-04-01'},
+        ])
+        assert [index for index, _ in errors] == [1]
+        assert db.get_all_schedule()[3:] == [(4, '2025-04-01', 1, 1), (6, '2025-04-01', 2, 2)]
+        assert len(db.get_all_workouts()) == 6
+        db.close()
 
+    def test_add_workouts_bulk_wrong_types(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A', 'a')
+        db.add_exercise('B')
+
+        errors = db.add_workouts_bulk([
+            self.ws1,
+            {**self.ws2, 'feeling': '3'},
+            {**self.ws2, 'exercise_name': ['B']},
+            {**self.ws2, 'order_number': 3},
+        ])
+        assert [index for index, _ in errors] == [1, 2]
+        assert db.get_all_schedule() == [(1, '2025-03-27', 1, 1), (2, '2025-03-27', 2, 3)]
+        db.close()
+
+    def test_add_workouts_bulk_concurrent_insert(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A', 'a')
+        db.add_exercise('B')
+
+        def records():
+            yield self.ws1
+            # Another connection adds a schedule record while the batch is validated
+            other = sqlite3.connect(self.file)
+            other.execute("INSERT INTO Schedule (date, exercise_id, order_number) VALUES ('2025-03-01', 2, 1);")
+            other.commit()
+            other.close()
+            yield self.ws2
+
+        assert db.add_workouts_bulk(records()) == []
+        assert db.get_all_schedule() == [(1, '2025-03-01', 2, 1), (2, '2025-03-27', 1, 1), (3, '2025-03-27', 2, 2)]
+        assert [row[1] for row in db.get_all_workouts()] == [2, 3]
+        db.close()
+
+    def test_transaction(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        with db.transaction():
+            db.add_exercise('A')
+            db.add_exercise('B')
+            with pytest.raises(ValueError):
+                with db.transaction():
+                    db.add_workout(**self.ws1)
+                    raise ValueError
+            db.add_workout(**self.ws2)
+            db.commit()
+
+            other = sqlite3.connect(self.file)
+            assert other.execute('SELECT * FROM Exercises;').fetchall() == []
+            other.close()
+
+        other = sqlite3.connect(self.file)
+        assert other.execute('SELECT id FROM Exercises;').fetchall() == [(1,), (2,)]
+        assert other.execute('SELECT exercise_id FROM Schedule;').fetchall() == [(2,)]
+        other.close()
+
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.batch():
+                db.add_workout(**self.ws1)
+                db.add_exercise('A')
+        assert db.get_all_schedule() == [(1, '2025-03-27', 2, 2)]
+        db.close()
+
+    def test_delete_workouts_between(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        names = ['A', 'B', 'C', 'D', 'E']
+        for name in names:
+            db.add_exercise(name)
+        db.add_workouts_bulk([
+            {**self.ws1, 'workout_date': f'2025-03-{day:02d}', 'exercise_name': name, 'order_number': order_number,
+             'sets': 2, 'weight': [40 + day, 45], 'repetitions': [12, 10]}
+            for day in range(1, 31) for order_number, name in enumerate(names, 1)
+        ])
+
+        statements = []
+        db._connection.set_trace_callback(statements.append)
+        db.delete_workouts_between('2025-03-05', '2025-03-24')
+        db._connection.set_trace_callback(None)
+        # Trigger programs are traced as repeats of the statement that fired them
+        assert len({s for s in statements if 'DELETE FROM Workouts' in s or 'DELETE FROM Schedule' in s}) == 2
+        # Records of all affected exercises are recomputed at once
+        assert len({s for s in statements if 'PersonalRecords' in s}) == 2
+
+        assert db.get_all_dates() == [date(2025, 3, day) for day in [1, 2, 3, 4, 25, 26, 27, 28, 29, 30]]
+        assert len(db.get_all_workouts()) == 20 * len(names)
+        assert ('weight', 12, 70.0, date(2025, 3, 30)) in db.get_personal_records('A')
+
+        statements = []
+        db._connection.set_trace_callback(statements.append)
+        db.delete_exercise('A')
+        db._connection.set_trace_callback(None)
+        assert len({s for s in statements if 'DELETE FROM' in s and 'PersonalRecords' not in s}) == 3
+        assert len({s for s in statements if 'PersonalRecords' in s}) == 2
+        assert len(db.get_all_schedule()) == 10 * (len(names) - 1)
+        assert db.get_personal_records('B')
+        db.close()
+
+    def test_thread_safe(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'), readers=3)
+        db.add_exercise('A')
+        db.add_exercise('B')
+        errors = []
+
+        def write(day):
+            try:
+                for month in range(1, 13):
+                    db.add_workout(**{**self.ws1, 'workout_date': f'2025-{month:02d}-{day:02d}'})
+                    db.add_workout(**{**self.ws2, 'workout_date': f'2025-{month:02d}-{day:02d}'})
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                for _ in range(50):
+                    db.get_all_dates()
+                    db.find_workout('2025-01-01', 'A')
+                    assert db.get_all_exercises() == [(1, 'A', None, None), (2, 'B', None, None)]
+                    assert db.get_columns() == ['id', 'name', 'alias', 'target_muscle_group']
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(day,)) for day in range(1, 5)]
+        threads += [threading.Thread(target=read) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(db.get_all_dates()) == 48
+        assert len(db.get_all_workouts()) == 96
+        db.close()
+
+    def test_thread_safe_transaction(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'), readers=1)
+        db.add_exercise('A')
+        seen = []
+
+        with db.transaction():
+            db.add_exercise('B')
+            assert len(db.get_all_exercises()) == 2
+            thread = threading.Thread(target=lambda: seen.append(db.get_all_exercises()))
+            thread.start()
+            thread.join()
+        assert seen == [[(1, 'A', None, None)]]
+        assert len(db.get_all_exercises()) == 2
+        db.close()
+
+    def test_exercise_id_cache_threads(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'), readers=1)
+        db.add_exercise('A')
+        seen = []
+
+        # A reader thread can't see the uncommitted exercise: its ids must not stay cached
+        with db.transaction():
+            db.add_exercise('B')
+            thread = threading.Thread(target=lambda: seen.append(db.get_exercise_id('A')))
+            thread.start()
+            thread.join()
+        assert seen == [1]
+        assert db.get_exercise_id('B') == 2
+        db.add_workout('2025-03-01', 'B', 1, 1, 50, 10, units='kg')
+        db.close()
+
+    def test_exercise_id_cache(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A', 'a')
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db.add_exercise('B', 'b')
+                assert db.get_exercise_id('b') == 2
+                raise ValueError
+        assert db.get_exercise_id('b') is None
+        assert db.get_exercise_id('b', use_cache=False) is None
+
+        statements = []
+        db._connection.set_trace_callback(statements.append)
+        assert db.add_workouts_bulk([self.ws1, {**self.ws1, 'workout_date': '2025-03-28', 'exercise_name': 'a'}]) == []
+        db._connection.set_trace_callback(None)
+        assert [s for s in statements if 'FROM Exercises' in s] == []
+        db.close()
+
+    def test_iter_all_data(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A')
+        db.add_exercise('B')
+        db.add_workouts_bulk([
+            {**self.ws1, 'workout_date': f'2025-03-{day:02d}', 'sets': 2, 'weight': [40, 45], 'repetitions': [12, 10]}
+            for day in range(1, 31)
+        ])
+
+        rows = db.iter_all_workouts(chunk_size=7)
+        assert db.get_columns() == ['id', 'schedule_id', 'feeling', 'local_order', 'sets', 'weight', 'repetitions', 'time', 'speed', 'units']
+        first = next(rows)
+        # Other queries while iterating don't disturb the iterator
+        assert len(db.find_workout('2025-03-01', 'A')) == 2
+        assert db.get_all_exercises() == [(1, 'A', None, None), (2, 'B', None, None)]
+        assert [first, *rows] == db.get_all_workouts()
+        db.add_workout(**self.ws2)
+
+        assert list(db.iter_all_schedule(chunk_size=1)) == db.get_all_schedule()
+        assert list(db.iter_all_exercises()) == db.get_all_exercises()
+        assert list(db.iter_workouts_by_date('2025-03-27', chunk_size=2)) == db.get_workouts_by_date('2025-03-27')
+        assert len(db.get_workouts_by_date('2025-03-27')) == 3
+        db.close()
+
+    def test_thread_safe_iter_all_data(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'), readers=1)
+        db.add_exercise('A')
+        db.add_exercise('B')
+
+        rows = db.iter_all_exercises()
+        assert db.get_all_exercises() == [(1, 'A', None, None), (2, 'B', None, None)]
+        assert list(rows) == [(1, 'A', None, None), (2, 'B', None, None)]
+
+        with db.transaction():
+            db.add_exercise('C')
+            assert len(list(db.iter_all_exercises())) == 3
+        db.close()
+
+    def test_get_page(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A')
+        db.add_exercise('B')
+        db.add_workouts_bulk([{**self.ws1, 'workout_date': f'2025-03-{day:02d}'} for day in range(30, 0, -1)])
+        db.add_workout(**self.ws2)
+
+        first = db.get_page('Schedule', limit=10)
+        assert [row[0] for row in first] == list(range(1, 11))
+        second = db.get_page('Schedule', after_id=first[-1][0], limit=10)
+        assert [row[0] for row in second] == list(range(11, 21))
+        assert db.get_page('Schedule', before_id=second[0][0], limit=10) == first
+        assert db.get_page('Schedule', before_id=3, limit=10) == first[:2]
+        assert db.get_page('Schedule', after_id=31) == []
+        assert db.get_columns() == ['id', 'date', 'exercise_id', 'order_number']
+
+        assert db.get_first_id_from_date('Schedule', '2025-03-27') == 4
+        assert db.get_first_id_from_date('Workouts', '2025-03-28') == 3
+        assert db.get_first_id_from_date('Schedule', '2025-04-01') is None
+        with pytest.raises(ValueError):
+            db.get_first_id_from_date('Exercises', '2025-03-27')
+        with pytest.raises(ValueError):
+            db.get_page('Unknown')
+        db.close()
+
+    def test_get_date_page(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A')
+        db.add_exercise('B')
+        db.add_workouts_bulk([{**self.ws1, 'workout_date': f'2025-03-{day:02d}'} for day in range(11, 21)])
+        # Backfilled history: later ids, earlier dates
+        db.add_workouts_bulk([{**self.ws2, 'workout_date': f'2025-03-{day:02d}'} for day in range(1, 16)])
+
+        dates = [f'2025-03-{day:02d}' for day in range(1, 16) for _ in range(2 if day >= 11 else 1)] + \
+                [f'2025-03-{day:02d}' for day in range(16, 21)]
+        page = db.get_date_page('Schedule', '2025-03-05', limit=4)
+        seen = page
+        while page := db.get_date_page('Schedule', after_id=page[-1][0], limit=4):
+            seen += page
+        assert [row[1] for row in seen] == dates[4:]
+        assert [(row[1], row[0]) for row in seen] == sorted((row[1], row[0]) for row in seen)
+        assert db.get_date_page('Schedule', before_id=seen[4][0], limit=4) == seen[:4]
+        assert [row[1] for row in db.get_date_page('Schedule', before_id=seen[2][0], limit=4)] == dates[2:6]
+        assert [row[1] for row in db.get_date_page('Schedule', limit=3)] == dates[:3]
+
+        # Workouts follow the dates of their schedule records
+        workouts = db.get_date_page('Workouts', '2025-03-11', limit=2)
+        assert [row[1] for row in workouts] == [1, 21]
+        assert [row[1] for row in db.get_date_page('Workouts', after_id=workouts[-1][0], limit=2)] == [2, 22]
+        assert db.get_date_page('Workouts', before_id=workouts[0][0], limit=1)[0][1] == 20
+        with pytest.raises(ValueError):
+            db.get_date_page('Exercises')
+        db.close()
+
+    def test_get_weight_progress(self):
+        db = Database(self.file)
+        db.create()
+        db.clear()
+
+        db.add_exercise('A', 'a')
+        db.add_exercise('T')
+        db.add_workout(**{**self.ws1, 'workout_date': '2025-03-29', 'sets': 2, 'weight': [40, 50], 'repetitions': [10, 8]})
+        db.add_workout(**self.ws1)
+        db.add_workout(workout_date='2025-03-27', exercise_name='T', order_number=2, sets=1, time=600, speed=8.5)
+
+        assert db.get_weight_progress('a') == (
+            [date(2025, 3, 27), date(2025, 3, 29)],
+            [45.0, 45.0],
+            [45.0, 50.0],
+            [1350.0, 800.0],
+        )
+        assert db.get_weight_progress('T') == ([], [], [], [])
+        with pytest.raises(ValueError):
+            db.get_weight_progress('C')
+        db.close()
+
+    def test_daily_stats(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'))
+        db.add_exercise('A', 'a')
+        db.add_workouts_bulk([
+            {**self.ws1, 'workout_date': f'2025-03-{day:02d}', 'sets': 2, 'weight': [40, 50], 'repetitions': [10, 8]}
+            for day in range(1, 11)
+        ])
+        db.delete_workout('2025-03-02', 'A')
+
+        stats = db.get_daily_stats('a', date(2025, 3, 1), date(2025, 3, 3))
+        assert stats == [(date(2025, 3, 1), 2, 18, 800.0, 50.0, 45.0, 0), (date(2025, 3, 3), 2, 18, 800.0, 50.0, 45.0, 0)]
+        assert db.check_daily_stats() == []
+
+        db._connection.execute('DELETE FROM DailyExerciseStats;')
+        assert len(db.check_daily_stats()) == 9
+        db.rebuild_daily_stats()
+        assert db.check_daily_stats() == []
+        assert len(db.get_daily_stats('A')) == 9
+        db.close()
+
+    def test_personal_records(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'))
+        db.add_exercise('A', 'a')
+        db.add_exercise('B')
+        db.add_exercise('T')
+        db.add_workout(**{**self.ws1, 'workout_date': '2025-03-01', 'sets': 2, 'weight': [100, 90], 'repetitions': [5, 8]})
+        db.add_workouts_bulk([
+            {**self.ws1, 'workout_date': '2025-03-02', 'sets': 2, 'weight': [105, 80], 'repetitions': [5, 8]},
+            {**self.ws1, 'workout_date': '2025-03-02', 'exercise_name': 'B', 'order_number': 2, 'sets': 1, 'weight': 50, 'repetitions': 10},
+            {'workout_date': '2025-03-02', 'exercise_name': 'T', 'order_number': 3, 'sets': 1, 'time': 600, 'speed': 6, 'units': 'mph'},
+        ])
+
+        assert db.get_personal_records('a') == [
+            ('brzycki', 0, pytest.approx(105 * 36 / 32), date(2025, 3, 2)),
+            ('epley', 0, pytest.approx(105 * (1 + 5 / 30)), date(2025, 3, 2)),
+            ('weight', 5, 105.0, date(2025, 3, 2)),
+            ('weight', 8, 90.0, date(2025, 3, 1)),
+        ]
+        assert db.get_personal_records('T') == [('speed', 0, pytest.approx(6 * 1.609344), date(2025, 3, 2))]
+
+        statements = []
+        db._connection.set_trace_callback(statements.append)
+        db.delete_workout_by_date('2025-03-02')
+        db._connection.set_trace_callback(None)
+        assert [row[1:3] for row in db.get_personal_records('A') if row[0] == 'weight'] == [(5, 100.0), (8, 90.0)]
+        assert db.get_personal_records('B') == db.get_personal_records('T') == []
+        # Only the exercises trained on the date are recomputed, in one statement
+        assert [s for s in statements if 'DELETE FROM PersonalRecords' in s] == [
+            "--sql\n            DELETE FROM PersonalRecords\n            WHERE exercise_id IN (SELECT value FROM json_each('[1, 2, 3]'));"
+        ]
+
+        db.delete_exercise('A')
+        assert db.get_personal_records('B') == []
+        assert db._connection.execute('SELECT COUNT(*) FROM PersonalRecords;').fetchone() == (0,)
+        db.close()
+
+    @pytest.mark.parametrize('in_memory', [True, False])
+    def test_snapshot(self, tmp_path, in_memory):
+        db = Database(str(tmp_path / 'gym.db'), readers=1)
+        db.add_exercise('A', 'a')
+        db.add_workouts_bulk([{**self.ws1, 'workout_date': f'2025-03-{day:02d}'} for day in range(1, 11)])
+
+        steps = []
+        snapshot = db.snapshot(in_memory, pages=1, progress=lambda status, remaining, total: steps.append(remaining))
+        assert len(steps) > 1 and steps[-1] == 0
+        db.add_workout(**{**self.ws1, 'workout_date': '2025-03-11'})
+
+        assert snapshot.get_all_dates() == [date(2025, 3, day) for day in range(1, 11)]
+        assert snapshot.get_weight_progress('a')[0] == snapshot.get_all_dates()
+        with pytest.raises(sqlite3.OperationalError):
+            snapshot.add_exercise('B')
+        assert len(db.get_all_dates()) == 11
+
+        path = snapshot._temporary_file
+        snapshot.close()
+        if not in_memory:
+            assert not os.path.exists(path)
+        db.close()
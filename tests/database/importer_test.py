@@ -0,0 +1,98 @@
+import json
+import pytest
+from datetime import date
+from src.database.database import Database
+from src.database.importer import FIELDS, import_file, parse_record
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'gym.db'))
+    db.add_exercise('Bench', 'b')
+    db.add_exercise('Run')
+    yield db
+    db.close()
+
+
+def write_csv(path, rows: list[str]) -> str:
+    path.write_text(','.join(FIELDS) + '\n' + ''.join(row + '\n' for row in rows))
+    return str(path)
+
+
+class TestImporter:
+    def test_parse_record(self):
+        assert parse_record({
+            'workout_date': '2025-03-01', 'exercise_name': 'b', 'order_number': '1', 'sets': '3',
+            'weight': '40;45;50', 'repetitions': '10', 'time': '', 'units': 'kg',
+        }) == {
+            'workout_date': date(2025, 3, 1), 'exercise_name': 'b', 'order_number': 1, 'sets': 3,
+            'weight': [40.0, 45.0, 50.0], 'repetitions': 10, 'time': None, 'speed': None, 'units': 'kg', 'feeling': None,
+        }
+        with pytest.raises(ValueError):
+            parse_record({'workout_date': '2025-03-01', 'exercise_name': 'b', 'sets': '3'})
+        with pytest.raises(ValueError):
+            parse_record({'workout_date': '2025-03-01', 'exercise_name': 'b', 'order_number': 1, 'sets': 'x'})
+
+    @pytest.mark.parametrize('workers', [0, 2])
+    def test_import_csv(self, db, tmp_path, workers):
+        path = write_csv(tmp_path / 'workouts.csv', [
+            *[f'2025-02-{day:02d},b,1,3,40;45;50,10,,,kg,3' for day in range(1, 21)],
+            '2025-03-01,Run,1,2,,,300;600,12;10,kph,',
+            'bad,line',
+            '',
+            '2025-03-02,Squat,1,1,100,5,,,kg,',
+            '2025-03-03,Bench,1,2,40,10,,,kg,9',
+        ])
+        progress = []
+        imported, rejected, errors = import_file(db, path, chunk_size=4, batch_lines=3, workers=workers,
+                                                 progress=lambda *args: progress.append(args))
+        assert (imported, rejected) == (21, 3)
+        assert sorted(errors) == [(23, 'Expected 10 values, got 2'), (25, 'There is no "Squat" exercise'),
+                                  (26, 'Feeling rating must be from 1 to 5')]
+        assert len(db.get_all_dates()) == 21
+        assert db.find_workout(date(2025, 3, 1), 'Run')[0][10:12] == (300, 12.0)
+        assert progress[-1][0] == progress[-1][1]
+        assert [row[2] for row in progress] == sorted(row[2] for row in progress)
+
+        # A finished file is not imported again
+        assert import_file(db, path, workers=workers) == (21, 3, [])
+        assert len(db.get_all_workouts()) == 20 * 3 + 2
+
+    def test_import_jsonl(self, db, tmp_path):
+        path = tmp_path / 'workouts.jsonl'
+        path.write_text('\n'.join([
+            json.dumps({'workout_date': '2025-03-01', 'exercise_name': 'Bench', 'order_number': 1, 'sets': 2,
+                        'weight': [40, 45], 'repetitions': [10, 8], 'units': 'kg', 'feeling': 4}),
+            json.dumps({'workout_date': '2025-03-01', 'exercise_name': 'Run', 'order_number': 2, 'sets': 1,
+                        'time': 600, 'speed': 10.5, 'units': 'kph'}),
+            json.dumps([1, 2]),
+            '{broken',
+        ]))
+        imported, rejected, errors = import_file(db, str(path), workers=0)
+        assert (imported, rejected) == (2, 2)
+        assert [number for number, _ in errors] == [3, 4]
+        assert db.get_personal_records('Bench')
+
+    def test_resume(self, db, tmp_path):
+        path = write_csv(tmp_path / 'workouts.csv', [f'2025-02-{day:02d},b,1,1,{40 + day},10,,,kg,' for day in range(1, 29)])
+
+        def interrupt(offset, total, imported, rejected):
+            if imported >= 10:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            import_file(db, path, chunk_size=5, batch_lines=5, workers=0, progress=interrupt)
+        offset, line, imported, rejected, finished = db.get_import_checkpoint(str(tmp_path / 'workouts.csv'))
+        assert (line, imported, rejected, finished) == (11, 10, 0, 0)
+        assert len(db.get_all_dates()) == 10
+
+        assert import_file(db, path, chunk_size=5, batch_lines=5, workers=0) == (28, 0, [])
+        assert [row[1] for row in db.get_all_schedule()] == [f'2025-02-{day:02d}' for day in range(1, 29)]
+
+        # With restart the file is imported again and every record conflicts
+        imported, rejected, errors = import_file(db, path, workers=0, restart=True)
+        assert (imported, rejected, len(errors)) == (0, 28, 28)
+
+    def test_unknown_format(self, db, tmp_path):
+        with pytest.raises(ValueError):
+            import_file(db, str(tmp_path / 'workouts.txt'))
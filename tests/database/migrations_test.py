@@ -0,0 +1,54 @@
+import pytest
+import sqlite3
+from src.database.database import Database
+from src.database.migrations import MIGRATIONS, get_schema_version, set_schema_version
+from src.database.tables.exercises import ExercisesTable
+from src.database.tables.workouts import WorkoutsTable
+from src.database.tables.schedule import ScheduleTable
+
+
+def get_indexes(connection: sqlite3.Connection) -> list[str]:
+    return [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL;")]
+
+
+class TestMigrations:
+    def test_fresh_database(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'))
+        assert get_schema_version(db._cursor) == len(MIGRATIONS)
+        assert db.migrate() == 0
+        assert 'Schedule_exercise_id_date' in get_indexes(db._connection)
+        db.close()
+
+    def test_existing_database(self, tmp_path):
+        file = str(tmp_path / 'gym.db')
+        connection = sqlite3.connect(file)
+        cursor = connection.cursor()
+        for table in [ExercisesTable(cursor), WorkoutsTable(cursor), ScheduleTable(cursor)]:
+            table.create()
+        cursor.execute("INSERT INTO Exercises (name) VALUES ('A');")
+        connection.commit()
+        connection.close()
+
+        db = Database(file)
+        assert get_schema_version(db._cursor) == len(MIGRATIONS)
+        assert 'Schedule_exercise_id_date' in get_indexes(db._connection)
+        assert db.get_all_exercises() == [(1, 'A', None, None)]
+        db.close()
+
+    def test_newer_database(self, tmp_path):
+        file = str(tmp_path / 'gym.db')
+        db = Database(file)
+        set_schema_version(db._cursor, len(MIGRATIONS) + 1)
+        db.close()
+
+        with pytest.raises(ValueError):
+            Database(file)
+
+    def test_create_resets_schema(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'))
+        db.add_exercise('A')
+        db.create()
+        assert db.get_all_exercises() == []
+        assert get_schema_version(db._cursor) == len(MIGRATIONS)
+        assert 'Schedule_exercise_id_date' in get_indexes(db._connection)
+        db.close()
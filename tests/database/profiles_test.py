@@ -0,0 +1,28 @@
+import pytest
+from src.database.database import Database
+from src.database.profiles import PROFILES
+
+
+class TestProfiles:
+    @pytest.mark.parametrize('profile', list(PROFILES))
+    def test_apply_profile(self, tmp_path, profile):
+        db = Database(str(tmp_path / 'gym.db'), profile)
+        settings = PROFILES[profile]
+        connection = db._connection
+        assert connection.execute('PRAGMA journal_mode;').fetchone()[0] == settings['journal_mode'].lower()
+        assert connection.execute('PRAGMA cache_size;').fetchone()[0] == settings['cache_size']
+        assert connection.execute('PRAGMA busy_timeout;').fetchone()[0] == settings['busy_timeout']
+
+        db.add_exercise('A')
+        assert db.get_all_exercises() == [(1, 'A', None, None)]
+        db.close()
+
+    def test_in_memory(self):
+        db = Database(':memory:', 'in-memory')
+        db.add_exercise('A')
+        assert db.get_all_exercises() == [(1, 'A', None, None)]
+        db.close()
+
+    def test_unknown_profile(self, tmp_path):
+        with pytest.raises(ValueError):
+            Database(str(tmp_path / 'gym.db'), 'unknown')
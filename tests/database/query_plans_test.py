@@ -0,0 +1,174 @@
+import json
+import os
+import pytest
+import re
+import sqlite3
+from datetime import date
+from src.database.database import Database
+from src.database.tracing import fingerprint
+
+
+# Reviewed query plans of every statement the database layer issues.
+# Regenerate with UPDATE_QUERY_PLANS=1 and review the diff.
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'query_plans.json')
+
+_PLANNED = re.compile(r'^\s*(SELECT|WITH|DELETE|UPDATE|INSERT\b.*\bSELECT\b)', re.IGNORECASE | re.DOTALL)
+# Reading a constant row or the values of a table-valued function such as json_each is no table scan
+_SCAN = re.compile(r'^SCAN (?:TABLE )?(?!CONSTANT ROW)(\w+)\b(?! VIRTUAL TABLE)')
+
+# Statements that must never scan a table, whatever the baseline says: lookups
+# filtered by date, exercise or id. Every statement pattern must match an executed statement;
+# if a plan pattern is given, the plan must contain it, e.g. to search a date range in the index.
+_RANGE = r'\(exercise_id=\? AND date>\? AND date<\?\)'
+MUST_BE_INDEXED = [
+    (r'^SELECT CAST\(julianday\(S\.date\).* FROM Schedule S JOIN Workouts W ON W\.schedule_id = S\.id WHERE .*S\.exercise_id = ', _RANGE),
+    (r'FROM Schedule S JOIN Workouts W ON S\.id = W\.schedule_id WHERE S\.date = \? AND S\.exercise_id = \?', None),
+    (r'FROM Schedule S JOIN Exercises E ON S\.exercise_id = E\.id LEFT JOIN Workouts W ON S\.id = W\.schedule_id WHERE S\.date = \?', None),
+    (r'FROM Schedule S JOIN Workouts W ON W\.schedule_id = S\.id WHERE S\.date >= \?', None),
+    (r'FROM Schedule S JOIN Workouts W ON W\.schedule_id = S\.id WHERE \(S\.date, W\.id\) [<>]', None),
+    (r'FROM Schedule WHERE date = \? AND exercise_id = \?', None),
+    (r'FROM Schedule WHERE date BETWEEN \? AND \?', r'\(date>\? AND date<\?\)'),
+    (r'FROM Schedule WHERE date >= \?', None),
+    (r'FROM Schedule WHERE \(date, id\) [<>]', None),
+    (r'^DELETE FROM (Schedule|Workouts) WHERE', None),
+    (r'FROM DailyExerciseStats WHERE exercise_id = \?', None),
+    (r'FROM DailyExerciseStats WHERE exercise_id = \? AND date >= \? AND date <= \?', _RANGE),
+    (r'FROM PersonalRecords WHERE exercise_id (= \?|IN)', None),
+]
+
+
+def run_workload(db: Database) -> None:
+    """
+    Call every query of the database layer on a small history.
+    """
+    db.add_exercise('A', 'a', 'Chest')
+    db.add_exercise('B', 'b', 'Legs')
+    db.add_exercise('T')
+    for day in range(1, 21):
+        db.add_workout(date(2025, 3, day), 'A', 1, 3, [40, 45, 50], [10, 8, 6], units='kg', feeling=3)
+    db.add_workouts_bulk([
+        {'workout_date': date(2025, 3, day), 'exercise_name': 'B', 'order_number': 2, 'sets': 2, 'weight': 100, 'repetitions': 5}
+        for day in range(1, 21)
+    ] + [{'workout_date': date(2025, 3, 1), 'exercise_name': 'T', 'order_number': 3, 'sets': 1, 'time': 600, 'speed': 9}])
+
+    db.find_workout(date(2025, 3, 5), 'A')
+    db.get_workouts_by_date(date(2025, 3, 5))
+    list(db.iter_workouts_by_date(date(2025, 3, 5)))
+    db.get_all_dates()
+    db.get_exercise_id('a', use_cache=False)
+    db.get_exercise_id('A', may_be_alias=False, use_cache=False)
+    for table_name in ('Exercises', 'Schedule', 'Workouts'):
+        db.get_page(table_name)
+        db.get_page(table_name, after_id=2)
+        db.get_page(table_name, before_id=5)
+    for table_name in ('Schedule', 'Workouts'):
+        db.get_first_id_from_date(table_name, date(2025, 3, 10))
+        db.get_date_page(table_name, date(2025, 3, 10))
+        db.get_date_page(table_name, after_id=2)
+        db.get_date_page(table_name, before_id=5)
+    db.get_all_exercises(), db.get_all_schedule(), db.get_all_workouts()
+    db.get_weight_progress('A')
+    db.get_daily_stats('A', date(2025, 3, 2), date(2025, 3, 9))
+    db.get_personal_records('A')
+    db.to_columns('A', date(2025, 3, 2), date(2025, 3, 9))
+    db.check_daily_stats()
+    db.rebuild_daily_stats()
+    db.save_import_checkpoint('/workouts.csv', 100, 5, 4, 0)
+    db.get_import_checkpoint('/workouts.csv')
+    db.delete_import_checkpoint('/workouts.csv')
+
+    db.delete_workout(date(2025, 3, 1), 'A')
+    db.delete_workout_by_date(date(2025, 3, 2))
+    db.delete_workouts_between(date(2025, 3, 3), date(2025, 3, 5))
+    db.delete_exercise('T')
+
+
+def collect_statements(db: Database) -> dict[str, str]:
+    """
+    Return one executed statement per fingerprint, for the statements that have a query plan.
+    """
+    statements = {}
+
+    def collect(sql: str) -> None:
+        key = fingerprint(sql)
+        if _PLANNED.match(key):
+            statements.setdefault(key, sql)
+
+    db._connection.set_trace_callback(collect)
+    run_workload(db)
+    db._connection.set_trace_callback(None)
+    return statements
+
+
+def explain(connection: sqlite3.Connection, sql: str) -> list[str]:
+    """
+    Return the details of the query plan of a statement.
+    """
+    return [row[3] for row in connection.execute(f'EXPLAIN QUERY PLAN {sql}')]
+
+
+def scanned_tables(plan: list[str]) -> set[str]:
+    """
+    Return tables read by a full scan in a query plan.
+    """
+    return {match[1] for line in plan if (match := _SCAN.match(line))}
+
+
+@pytest.fixture(scope='module')
+def plans(tmp_path_factory) -> dict[str, list[str]]:
+    """
+    Query plans of the statements of the workload by fingerprint.
+    """
+    db = Database(str(tmp_path_factory.mktemp('plans') / 'gym.db'))
+    statements = collect_statements(db)
+    plans = {key: explain(db._connection, sql) for key, sql in sorted(statements.items())}
+    db.close()
+    return plans
+
+
+class TestQueryPlans:
+    def test_query_plans(self, plans):
+        if os.environ.get('UPDATE_QUERY_PLANS'):
+            with open(BASELINE_FILE, 'w', encoding='utf-8') as file:
+                json.dump(plans, file, indent=2, ensure_ascii=False)
+                file.write('\n')
+        with open(BASELINE_FILE, encoding='utf-8') as file:
+            baseline = json.load(file)
+
+        missing = sorted(set(plans) - set(baseline))
+        assert not missing, f'Statements without a reviewed plan, regenerate {BASELINE_FILE}: {missing}'
+        regressions = {
+            key: sorted(scanned_tables(plan) - scanned_tables(baseline[key]))
+            for key, plan in plans.items()
+            if scanned_tables(plan) - scanned_tables(baseline[key])
+        }
+        assert not regressions, f'Statements fell back to full scans: {regressions}'
+
+    def test_must_be_indexed(self, plans):
+        unmatched = [pattern for pattern, _ in MUST_BE_INDEXED if not any(re.search(pattern, key) for key in plans)]
+        assert not unmatched, f'Patterns match no executed statement: {unmatched}'
+        failures = {}
+        for key, plan in plans.items():
+            for pattern, plan_pattern in MUST_BE_INDEXED:
+                if not re.search(pattern, key):
+                    continue
+                if scanned_tables(plan):
+                    failures[key] = plan
+                if plan_pattern is not None and not any(re.search(plan_pattern, line) for line in plan):
+                    failures[key] = plan
+        assert not failures, f'Statements that must be indexed scan tables or miss the index range: {failures}'
+
+    def test_scanned_tables(self):
+        assert scanned_tables(['SCAN S', 'SEARCH W USING INDEX sqlite_autoindex_Workouts_1 (schedule_id=?)']) == {'S'}
+        assert scanned_tables(['SCAN TABLE Schedule USING COVERING INDEX Schedule_date']) == {'Schedule'}
+        assert scanned_tables(['SCAN CONSTANT ROW', 'SEARCH Exercises USING INTEGER PRIMARY KEY (rowid=?)']) == set()
+        assert scanned_tables(['LIST SUBQUERY 1', 'SCAN json_each VIRTUAL TABLE INDEX 1:']) == set()
+
+    def test_detects_scan(self):
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE TABLE Schedule (id INTEGER PRIMARY KEY, date DATE, exercise_id INTEGER);')
+        sql = "SELECT id FROM Schedule WHERE date = '2025-03-01' AND exercise_id = 1"
+        assert scanned_tables(explain(connection, sql)) == {'Schedule'}
+        connection.execute('CREATE UNIQUE INDEX Schedule_date ON Schedule (date, exercise_id);')
+        assert scanned_tables(explain(connection, sql)) == set()
+        connection.close()
@@ -0,0 +1,74 @@
+import os
+import pytest
+from datetime import date
+from src.database.sharding import ShardedDatabase, shard_file
+
+
+class TestShardedDatabase:
+    ws1 = {
+        'workout_date': '2025-03-27', 'exercise_name': 'A', 'order_number': 1, 'feeling': 3,
+        'sets': 3, 'weight': 45, 'repetitions': 10, 'units': 'kg',
+    }
+
+    def test_shard_file(self, tmp_path):
+        assert shard_file(str(tmp_path), 42) == os.path.join(str(tmp_path), 'user_42.db')
+        for user_id in ['', '../42', 'a b', 'a.db']:
+            with pytest.raises(ValueError):
+                shard_file(str(tmp_path), user_id)
+
+    def test_users_are_isolated(self, tmp_path):
+        with ShardedDatabase(str(tmp_path)) as db:
+            for user_id in [1, 2]:
+                db.add_exercise(user_id, 'A', 'a')
+            db.add_workout(1, **self.ws1)
+            db.add_workout(2, **{**self.ws1, 'workout_date': '2025-03-28'})
+            db.add_workouts_bulk(2, [{**self.ws1, 'workout_date': '2025-03-29'}])
+
+            assert db.users() == ['1', '2']
+            assert db.get_all_dates(1) == [date(2025, 3, 27)]
+            assert db.get_all_dates('2') == [date(2025, 3, 28), date(2025, 3, 29)]
+            assert len(db.find_workout(1, '2025-03-27', 'A')) == 1
+            assert db.find_workout(2, '2025-03-27', 'A') == []
+            assert db.get_personal_records(2, 'a')
+
+            db.delete_workout(2, '2025-03-28', 'a')
+            assert db.get_all_dates(2) == [date(2025, 3, 29)]
+            assert db.get_all_dates(1) == [date(2025, 3, 27)]
+
+            with pytest.raises(ValueError):
+                db.get_all_dates(3)
+            assert db.users() == ['1', '2']
+
+    def test_lru(self, tmp_path):
+        with ShardedDatabase(str(tmp_path), max_open=2) as db:
+            for user_id in [1, 2, 3]:
+                db.add_exercise(user_id, 'A')
+            assert db.open_shards() == ['2', '3']
+
+            db.get_all_exercises(2)
+            db.get_all_exercises(1)
+            assert db.open_shards() == ['2', '1']
+
+            # A shard of an unfinished iterator stays open
+            rows = db.iter_all_exercises(2, chunk_size=1)
+            assert next(rows)[1] == 'A'
+            db.get_all_exercises(3)
+            db.get_all_exercises(1)
+            assert db.open_shards() == ['2', '1']
+            with pytest.raises(ValueError):
+                db.close_shard(2)
+            assert list(rows) == []
+
+            db.close_shard(2)
+            assert db.open_shards() == ['1']
+        assert db.open_shards() == []
+
+    def test_to_columns_cache(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        with ShardedDatabase(str(tmp_path / 'users')) as db:
+            for user_id, weight in [(1, 45), (2, 60)]:
+                db.add_exercise(user_id, 'A')
+                db.add_workout(user_id, **{**self.ws1, 'weight': weight})
+            for _ in range(2):
+                assert db.to_columns(1, 'A', cache_dir=cache_dir)['weight'].tolist() == [45]
+                assert db.to_columns(2, 'A', cache_dir=cache_dir)['weight'].tolist() == [60]
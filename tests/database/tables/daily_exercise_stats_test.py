@@ -0,0 +1,63 @@
+import pytest
+import sqlite3
+from src.database.tables.daily_exercise_stats import DailyExerciseStatsTable
+from src.database.tables.exercises import ExercisesTable
+from src.database.tables.schedule import ScheduleTable
+from src.database.tables.workouts import Workout, WorkoutsTable
+
+
+@pytest.fixture
+def db_cursor():
+    connection = sqlite3.connect(':memory:')
+    cursor = connection.cursor()
+    for table in [ExercisesTable(cursor), WorkoutsTable(cursor), ScheduleTable(cursor), DailyExerciseStatsTable(cursor)]:
+        table.create()
+    yield cursor
+    connection.close()
+
+
+class TestDailyExerciseStats:
+    def test_triggers(self, db_cursor):
+        table = DailyExerciseStatsTable(db_cursor)
+        schedule = ScheduleTable(db_cursor)
+        workouts = WorkoutsTable(db_cursor)
+        ExercisesTable(db_cursor).add_exercise('A')
+
+        first = schedule.add_schedule_record('2025-03-01', 1, 0)
+        workouts.add_workout(Workout(first, 3, [50, 60, 70], [10, 8, 6], units='kg'))
+        second = schedule.add_schedule_record('2025-03-02', 1, 0)
+        workouts.add_workout(Workout(second, 3, 40, 10, units='kg'))
+        # date, sets, repetitions, volume, top weight, average weight, time
+        assert table.get_stats(1) == [
+            ('2025-03-01', 3, 24, 1400.0, 70.0, 60.0, 0),
+            ('2025-03-02', 3, 30, 1200.0, 40.0, 40.0, 0),
+        ]
+        assert table.get_stats(1, start='2025-03-02') == [('2025-03-02', 3, 30, 1200.0, 40.0, 40.0, 0)]
+
+        db_cursor.execute('DELETE FROM Workouts WHERE schedule_id = ? AND local_order = 2;', (first,))
+        assert table.get_stats(1, end='2025-03-01') == [('2025-03-01', 2, 18, 980.0, 60.0, 55.0, 0)]
+        schedule.delete_by_id(second)
+        assert [row[0] for row in table.get_stats(1)] == ['2025-03-01']
+        assert table.check() == []
+
+    def test_cardio(self, db_cursor):
+        table = DailyExerciseStatsTable(db_cursor)
+        ExercisesTable(db_cursor).add_exercise('Run')
+        schedule_id = ScheduleTable(db_cursor).add_schedule_record('2025-03-01', 1, 0)
+        WorkoutsTable(db_cursor).add_workout(Workout(schedule_id, 2, time=[600, 300], speed=[10, 12], units='kph'))
+        assert table.get_stats(1) == [('2025-03-01', 2, 0, 0, None, None, 900)]
+        assert table.check() == []
+
+    def test_check_and_rebuild(self, db_cursor):
+        table = DailyExerciseStatsTable(db_cursor)
+        ExercisesTable(db_cursor).add_exercise('A')
+        schedule_id = ScheduleTable(db_cursor).add_schedule_record('2025-03-01', 1, 0)
+        WorkoutsTable(db_cursor).add_workout(Workout(schedule_id, 2, 50, 10, units='kg'))
+
+        db_cursor.execute('UPDATE DailyExerciseStats SET volume = 0;')
+        db_cursor.execute("INSERT INTO DailyExerciseStats VALUES (1, '2025-03-05', 1, 1, 1, 1, 1, 1, 0);")
+        assert table.check() == [(1, '2025-03-01'), (1, '2025-03-05')]
+
+        table.rebuild()
+        assert table.check() == []
+        assert table.get_stats(1) == [('2025-03-01', 2, 20, 1000.0, 50.0, 50.0, 0)]
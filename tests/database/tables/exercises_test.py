@@ -71,3 +71,70 @@ class TestExercises:
 
         table.delete_by_id(1)
         assert table.get_all_data() == [(2, 'B', 'b', '')]
+
+    def test_exercise_id_cache(self, db_connection, db_cursor):
+        table = ExercisesTable(db_cursor)
+        table.drop()
+        table.create()
+
+        table.add_exercise(**self.exercise1)
+        assert table.get_exercise_id('a', may_be_alias=True) == 1
+
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        assert table.get_exercise_id('A') == 1
+        assert table.get_exercise_id('a') is None
+        assert table.get_exercise_ids() == {'A': 1, 'a': 1}
+        db_connection.set_trace_callback(None)
+        assert statements == []
+
+        table.add_exercise(**self.exercise2)
+        assert table.get_exercise_id('b', may_be_alias=True) == 2
+        table.delete_by_id(1)
+        assert table.get_exercise_id('A') is None
+        assert table.get_exercise_id('a', may_be_alias=True) is None
+        assert table.get_exercise_ids() == {'B': 2, 'b': 2}
+
+        db_cursor.execute("INSERT INTO Exercises (name) VALUES ('C');")
+        assert table.get_exercise_id('C') is None
+        assert table.get_exercise_id('C', use_cache=False) == 3
+        table.invalidate_cache()
+        assert table.get_exercise_id('C') == 3
+
+        table.clear()
+        assert table.get_exercise_id('B') is None
+
+    def test_exercise_id_cache_race(self, tmp_path):
+        writer = sqlite3.connect(str(tmp_path / 'gym.db'))
+        reader = sqlite3.connect(str(tmp_path / 'gym.db'))
+        cursors = [writer.cursor()]
+        table = ExercisesTable(lambda: cursors[-1])
+        table.create()
+        table.add_exercise('A')
+        writer.commit()
+
+        class AddDuringLoad:
+            """
+            Reader cursor that lets a writer add an exercise after the ids are read.
+            """
+            def __init__(self, cursor):
+                self.cursor = cursor
+                self.connection = cursor.connection
+
+            def execute(self, *args):
+                return self.cursor.execute(*args)
+
+            def fetchall(self):
+                rows = self.cursor.fetchall()
+                cursors.append(writer.cursor())
+                table.add_exercise('B')
+                writer.commit()
+                cursors.pop()
+                return rows
+
+        cursors.append(AddDuringLoad(reader.cursor()))
+        assert table.get_exercise_id('B') is None
+        cursors[-1] = reader.cursor()
+        assert table.get_exercise_id('B') == 2
+        writer.close()
+        reader.close()
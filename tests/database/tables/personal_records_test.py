@@ -0,0 +1,40 @@
+import pytest
+import sqlite3
+from src.database.tables.exercises import ExercisesTable
+from src.database.tables.personal_records import PersonalRecordsTable
+from src.database.tables.schedule import ScheduleTable
+from src.database.tables.workouts import Workout, WorkoutsTable
+
+
+@pytest.fixture
+def db_cursor():
+    connection = sqlite3.connect(':memory:')
+    cursor = connection.cursor()
+    for table in [ExercisesTable(cursor), WorkoutsTable(cursor), ScheduleTable(cursor), PersonalRecordsTable(cursor)]:
+        table.create()
+    yield cursor
+    connection.close()
+
+
+class TestPersonalRecords:
+    def test_update_and_rebuild(self, db_cursor):
+        table = PersonalRecordsTable(db_cursor)
+        schedule = ScheduleTable(db_cursor)
+        workouts = WorkoutsTable(db_cursor)
+        ExercisesTable(db_cursor).add_exercise('A')
+
+        for day, weight in [(1, [100, 50]), (2, [90, 60]), (3, [220, 110])]:
+            schedule_id = schedule.add_schedule_record(f'2025-03-0{day}', 1, 0)
+            workouts.add_workout(Workout(schedule_id, 2, weight, [1, 40], units='lbs' if day == 3 else 'kg'))
+            table.update_from_schedule(schedule_id, schedule_id)
+
+        records = table.get_records(1)
+        # 40 repetitions are too many for Brzycki formula
+        assert [row[:2] for row in records] == [('brzycki', 0), ('epley', 0), ('weight', 1), ('weight', 40)]
+        assert records[2] == ('weight', 1, 100.0, '2025-03-01')
+        assert records[3] == ('weight', 40, 60.0, '2025-03-02')
+        assert records[1] == ('epley', 0, pytest.approx(60 * (1 + 40 / 30)), '2025-03-02')
+        assert records[0] == ('brzycki', 0, pytest.approx(100.0), '2025-03-01')
+
+        table.rebuild()
+        assert table.get_records(1) == records
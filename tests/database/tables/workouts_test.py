@@ -75,6 +75,23 @@ class TestWorkout:
         assert Workout(schedule_id=9999, sets=1, time=1,      speed=1,      weight=1,      repetitions=1)
         assert Workout(schedule_id=9999, sets=2, time=[1, 1], speed=[1, 1], weight=[1, 1], repetitions=[1, 1])
 
+    def test_convert2list(self):
+        workout = Workout(schedule_id=9999, sets=3, weight=[40, 45, 50], repetitions=10, units='kg', feeling=3)
+        sets = workout.convert2list()
+        assert not hasattr(workout, '__dict__')
+        assert [(w.local_order, w.weight, w.repetitions, w.time, w.speed) for w in sets] == [
+            (0, 40, 10, None, None), (1, 45, 10, None, None), (2, 50, 10, None, None),
+        ]
+        assert all(w.convert2list() == [w] for w in sets)
+        assert workout.to_rows() == [
+            (w.schedule_id, w.feeling, w.local_order, w.sets, w.weight, w.repetitions, w.time, w.speed, w.units)
+            for w in sets
+        ]
+
+        cardio = Workout(schedule_id=9999, sets=2, time=[600, 300], speed=[8.5, 10], units='kph')
+        assert cardio.to_rows() == [(9999, None, 0, 2, None, None, 600, 8.5, 'kph'), (9999, None, 1, 2, None, None, 300, 10, 'kph')]
+        assert Workout(schedule_id=9999, sets=3, weight=45, repetitions=10, units='kg').to_rows() == [(9999, None, -1, 3, 45, 10, None, None, 'kg')]
+
 
 @pytest.fixture
 def db_connection():
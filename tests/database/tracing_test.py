@@ -0,0 +1,56 @@
+import sqlite3
+import time
+from src.database.database import Database
+from src.database.tracing import QueryTracer, TracingConnection, fingerprint, parameters_shape
+
+
+class TestTracing:
+    ws1 = {
+        'workout_date': '2025-03-27', 'exercise_name': 'A', 'order_number': 1, 'feeling': 3,
+        'sets': 3, 'weight': 45, 'repetitions': 10, 'units': 'kg',
+    }
+
+    def test_fingerprint(self):
+        assert fingerprint("""--sql
+            SELECT id FROM Schedule
+            WHERE date = '2025-03-27' AND exercise_id = 12;
+        """) == 'SELECT id FROM Schedule WHERE date = ? AND exercise_id = ?'
+        assert fingerprint('DELETE FROM T WHERE id IN (?, ?, ?)') == fingerprint('DELETE FROM T WHERE id IN (1, 2)')
+        assert parameters_shape(('a', 1, None)) == '(str, int, NoneType)'
+        assert parameters_shape({'first': 1}) == '{first: int}'
+
+    def test_database_stats(self, tmp_path):
+        tracer = QueryTracer()
+        db = Database(str(tmp_path / 'gym.db'), tracer=tracer)
+        db.add_exercise('A')
+        for day in range(1, 11):
+            db.add_workout(**{**self.ws1, 'workout_date': f'2025-03-{day:02d}'})
+        for day in range(1, 11):
+            db.find_workout(f'2025-03-{day:02d}', 'A')
+        assert list(db.iter_all_workouts(chunk_size=3)) == db.get_all_workouts()
+
+        statements = {row['statement']: row for row in tracer.summary()}
+        find = next(row for key, row in statements.items() if key.startswith('SELECT S.id, S.date'))
+        assert find['calls'] == 10 and find['rows'] == 10
+        assert find['p50'] <= find['p99'] <= find['total']
+        assert statements['SELECT * FROM Workouts']['rows'] == 20
+        assert 'calls' in db.stats()
+        db.close()
+
+    def test_slow_log(self):
+        tracer = QueryTracer(slow_threshold=0.01)
+        connection = sqlite3.connect(':memory:', factory=TracingConnection)
+        connection.tracer = tracer
+        connection.create_function('sleep', 1, time.sleep)
+        connection.execute('SELECT 1;').fetchall()
+        connection.execute('SELECT sleep(?), ?;', (0.02, 'x')).fetchall()
+        connection.close()
+
+        assert [(key, shape) for _, key, _, shape in tracer.slow_log] == [('SELECT sleep(?), ?', '(float, str)')]
+        assert 'Slow queries' in tracer.report()
+
+    def test_disabled(self, tmp_path):
+        db = Database(str(tmp_path / 'gym.db'))
+        assert type(db._connection) is sqlite3.Connection
+        assert db.stats() == 'Query tracing is disabled'
+        db.close()
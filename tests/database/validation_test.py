@@ -0,0 +1,53 @@
+import numpy as np
+import random
+from src.database.tables.workouts import Workout, KIND_ERROR, FEELING_ERROR
+from src.database.validation import BATCH_COLUMNS, validate_batch
+
+
+def random_value(rng: random.Random, sets: int):
+    return rng.choice([None, 1, 10.5, [1] * sets, [2] * (sets + 1), []])
+
+
+def random_record(rng: random.Random) -> dict:
+    sets = rng.randint(1, 4)
+    return {
+        'sets': sets,
+        'weight': random_value(rng, sets),
+        'repetitions': random_value(rng, sets),
+        'time': random_value(rng, sets),
+        'speed': random_value(rng, sets),
+        'units': rng.choice([None, 'kg', 'lbs', 'kph', 'mph', '', 'ggg']),
+        'feeling': rng.choice([None, 0, 1, 3, 5, 6]),
+        'local_order': rng.choice([-1, -1, 0]),
+    }
+
+
+def workout_error(record: dict) -> str | None:
+    try:
+        Workout(schedule_id=1, **record)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+class TestValidateBatch:
+    def test_same_rules_as_workout(self):
+        rng = random.Random(0)
+        records = [random_record(rng) for _ in range(5000)]
+        invalid, errors = validate_batch({column: [record[column] for record in records] for column in BATCH_COLUMNS})
+
+        expected = [workout_error(record) for record in records]
+        assert errors == expected
+        assert invalid.tolist() == [error is not None for error in expected]
+        # Every rule is exercised
+        assert len(set(expected)) == 11
+
+    def test_arrays(self):
+        invalid, errors = validate_batch({
+            'sets': np.array([3, 3, 1]),
+            'weight': np.array([45.0, 50.0, np.nan]),
+            'repetitions': np.array([10, 10, 10]),
+            'feeling': [3, 7, None],
+        })
+        assert invalid.tolist() == [False, True, True]
+        assert errors == [None, FEELING_ERROR, KIND_ERROR]